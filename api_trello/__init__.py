@@ -1,6 +1,70 @@
 # do not remove
-from .trello_json_client import TrelloJson
-from .client import Client, TrelloException
-from .pydantic_model import TrelloWebHook, TrelloCard, TrelloList, Display, Member
+# Names are imported from their submodules on first access (PEP 562): `import api_trello` stays cheap
+# and loads neither aiohttp nor pydantic until a class that needs them is used.
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["TrelloJson", "TrelloWebHook", "TrelloCard", "TrelloList", "Display", "Member", "Client", "TrelloException"]
+_EXPORTS = {
+    "trello_json_client": ["TrelloJson"],
+    "client": ["Client", "TrelloException"],
+    "rate_limit": ["RateLimiter"],
+    "retry": ["RetryPolicy"],
+    "bulk": ["BulkResult"],
+    "cache": ["ResponseCache"],
+    "disk_cache": ["SqliteHttpCache"],
+    "pydantic_model": ["TrelloWebHook", "TrelloCard", "TrelloList", "Display", "Member", "TrelloUpdate", "Action"],
+    "mirror": ["BoardMirror"],
+    "webhook_server": ["WebhookReceiver", "LazyUpdate"],
+    "codec": ["JsonCodec", "default_codec"],
+    "metrics": ["MetricsSink", "InMemoryMetrics", "PrometheusMetrics", "StatsdMetrics"],
+    "tracing": ["Tracer", "InMemorySpanExporter", "SpanExporter"],
+    "fast_model": ["FastTrelloCard", "FastTrelloList", "FastMember", "FastTrelloWebHook"],
+    "pool": ["ClientPool", "FairScheduler"],
+    "sync_client": ["SyncClient"],
+    "delta_sync": ["DeltaSync", "CheckpointStore", "MemoryCheckpointStore", "JsonCheckpointStore"],
+    "priority": ["request_priority", "INTERACTIVE", "NORMAL", "BACKGROUND"],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = ["TrelloJson", "TrelloWebHook", "TrelloCard", "TrelloList", "Display", "Member", "Client", "TrelloException",
+           "RateLimiter", "RetryPolicy", "BulkResult", "ResponseCache", "SqliteHttpCache", "TrelloUpdate", "Action", "BoardMirror",
+           "WebhookReceiver", "LazyUpdate", "JsonCodec", "default_codec",
+           "FastTrelloCard", "FastTrelloList", "FastMember", "FastTrelloWebHook",
+           "MetricsSink", "InMemoryMetrics", "PrometheusMetrics", "StatsdMetrics",
+           "Tracer", "SpanExporter", "InMemorySpanExporter", "ClientPool", "FairScheduler",
+           "request_priority", "INTERACTIVE", "NORMAL", "BACKGROUND", "SyncClient",
+           "DeltaSync", "CheckpointStore", "MemoryCheckpointStore", "JsonCheckpointStore"]
+
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .trello_json_client import TrelloJson
+    from .client import Client, TrelloException
+    from .rate_limit import RateLimiter
+    from .retry import RetryPolicy
+    from .bulk import BulkResult
+    from .cache import ResponseCache
+    from .disk_cache import SqliteHttpCache
+    from .pydantic_model import TrelloWebHook, TrelloCard, TrelloList, Display, Member, TrelloUpdate, Action
+    from .mirror import BoardMirror
+    from .webhook_server import WebhookReceiver, LazyUpdate
+    from .codec import JsonCodec, default_codec
+    from .metrics import MetricsSink, InMemoryMetrics, PrometheusMetrics, StatsdMetrics
+    from .tracing import Tracer, InMemorySpanExporter, SpanExporter
+    from .fast_model import FastTrelloCard, FastTrelloList, FastMember, FastTrelloWebHook
+    from .pool import ClientPool, FairScheduler
+    from .priority import request_priority, INTERACTIVE, NORMAL, BACKGROUND
+    from .sync_client import SyncClient
+    from .delta_sync import DeltaSync, CheckpointStore, MemoryCheckpointStore, JsonCheckpointStore
@@ -0,0 +1,86 @@
+import asyncio
+import inspect
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, NamedTuple, Optional, Union
+
+
+class BulkResult(NamedTuple):
+    index: int
+    spec: Any
+    result: Any = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+ProgressCallback = Callable[[int, int], Any]
+
+
+async def _aiter(specs: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(specs, "__aiter__"):
+        async for spec in specs:
+            yield spec
+    else:
+        for spec in specs:
+            yield spec
+
+
+async def run_bounded(func: Callable[[Any], Awaitable], specs: Union[Iterable, AsyncIterable],
+                      concurrency: int = 10, on_progress: Optional[ProgressCallback] = None) -> AsyncIterator[BulkResult]:
+    """
+    Call func for every spec with at most `concurrency` calls in flight.
+    Results are yielded as soon as each call completes, a failed call does not stop the others.
+    At most `concurrency` results wait for a slow consumer: the calls pause until they are taken.
+    :param func: Coroutine function of one spec
+    :param specs: Iterable or async iterable, read lazily
+    :param on_progress: Called with (done, failed) after every call, may be a coroutine function
+    """
+    assert concurrency > 0
+    source = _aiter(specs)
+    source_lock = asyncio.Lock()
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    counter = iter(range(2 ** 63))
+    done = failed = 0
+
+    async def worker():
+        while True:
+            async with source_lock:
+                try:
+                    spec = await source.__anext__()
+                except StopAsyncIteration:
+                    return
+                index = next(counter)
+            try:
+                result = BulkResult(index, spec, await func(spec))
+            except Exception as e:
+                result = BulkResult(index, spec, error=e)
+            await results.put(result)
+
+    async def drain() -> list:
+        outcomes = await asyncio.gather(*workers, return_exceptions=True)
+        await results.put(None)  # behind the results still queued
+        return outcomes
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    finished = asyncio.ensure_future(drain())
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            done += 1
+            failed += not result.ok
+            if on_progress is not None:
+                progress = on_progress(done, failed)
+                if inspect.isawaitable(progress):
+                    await progress
+            yield result
+        # the source itself may have failed
+        for e in await finished:
+            if e is not None:
+                raise e
+    finally:
+        for w in workers:
+            w.cancel()
+        finished.cancel()
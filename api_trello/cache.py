@@ -0,0 +1,143 @@
+import sys
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from .single_flight import SingleFlight
+
+DEFAULT_TTL = {
+    "card": 30.0,
+    "lists": 300.0,
+    "webhooks": 60.0,
+}
+
+
+class ResponseCache:
+    """
+    Read-through cache of json responses with a TTL per resource kind and LRU eviction.
+    Concurrent misses of one key share a single request. A load that was in flight when its key
+    was invalidated is returned to its callers but not stored.
+    """
+
+    def __init__(self, ttl: Dict[str, float] = None, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param ttl: Seconds per resource kind ("card", "lists", "webhooks"), merged with DEFAULT_TTL
+        :param max_entries: LRU limit of entries
+        :param max_bytes: LRU limit of the approximate size of cached json
+        """
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, int, Any]]" = OrderedDict()
+        self._loads = SingleFlight()
+        # bumped by invalidate() while a load of the key (or of any key of the resource) is in flight
+        self._generations: Dict[Hashable, int] = Counter()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, resource: str, ident: Hashable, default=None):
+        key = (resource, ident)
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires, size, value = entry
+        if expires <= time.monotonic():
+            self._remove(key)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, resource: str, ident: Hashable, value: Any):
+        key = (resource, ident)
+        if key in self._entries:
+            self._remove(key)
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl.get(resource, 0.0), size, value)
+        self.size += size
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, resource: str, ident: Hashable = None):
+        """
+        :param ident: Drop one entry, or all entries of the resource kind when None
+        """
+        if ident is not None:
+            key = (resource, ident)
+            self._remove(key)
+            if self._loads.running(key):
+                self._generations[key] += 1
+                self._loads.forget(key)
+            return
+        for key in [k for k in self._entries if k[0] == resource]:
+            self._remove(key)
+        self._generations[resource] += 1
+        for key in self._loads.keys():
+            if key[0] == resource:
+                self._loads.forget(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    async def get_or_load(self, resource: str, ident: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        """
+        Cached value, or the result of loader(). Error responses ({"error": ...}) are not stored
+        """
+        value = self.get(resource, ident, _MISSING)
+        if value is not _MISSING:
+            self.hits[resource] += 1
+            return value
+
+        key = (resource, ident)
+        if self._loads.running(key):
+            self.hits[resource] += 1
+        else:
+            self.misses[resource] += 1
+        return await self._loads.do(key, lambda: self._load(resource, ident, loader, self._generation(key)))
+
+    def _generation(self, key: Tuple[str, Hashable]) -> Tuple[int, int]:
+        return self._generations[key], self._generations[key[0]]
+
+    async def _load(self, resource: str, ident: Hashable, loader: Callable[[], Awaitable], generation: Tuple[int, int]):
+        key = (resource, ident)
+        value = await loader()
+        stale = generation != self._generation(key)
+        if not stale and not (isinstance(value, dict) and "error" in value):
+            self.put(resource, ident, value)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+
+_MISSING = object()
+
+
+def _approx_size(value) -> int:
+    """
+    Rough deep size of decoded json
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(_approx_size(v) for v in value)
+    return sys.getsizeof(value)
@@ -1,26 +1,121 @@
 import asyncio
-from typing import List
+import functools
+import inspect
+import time
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Tuple, Union
 from aiohttp import ClientSession, ClientResponse
-from .trello_json_client import TrelloJson
+from .trello_json_client import ID_RE, TrelloJson
 from typing import List
-from .pydantic_model import TrelloWebHook, TrelloCard, TrelloList, Member
+from .pydantic_model import TrelloWebHook, TrelloCard, TrelloList, Member, Action
+from .bulk import BulkResult, ProgressCallback, run_bounded
+from .cache import ResponseCache
+from .write_behind import UpdateCoalescer
+from .projection import api_fields
+from .fast_model import FastTrelloWebHook, FastTrelloCard, FastTrelloList, FastMember
 from datetime import datetime
+from urllib.parse import quote
 from loguru import logger as log
-import re
+from types import SimpleNamespace
+
+MODELS = SimpleNamespace(webhook=TrelloWebHook, card=TrelloCard, list=TrelloList, member=Member)
+FAST_MODELS = SimpleNamespace(webhook=FastTrelloWebHook, card=FastTrelloCard, list=FastTrelloList, member=FastMember)
+# arguments of Client methods copied to span attributes
+SPAN_ARGUMENTS = ("card_id", "board_id", "id_list", "wh_id")
+# Trello returns at most this many cards or actions per request
+MAX_PAGE_SIZE = 1000
+
 
 class TrelloException(Exception):
     pass
 
 
-class Client:
-    def __init__(self, api_key: str = None, token: str = None, board_id: str = None):
-        assert re.match(r'^[0-9a-fA-F]{32}$', api_key)
-        assert re.match(r'^[0-9a-fA-F]{64}$', token)
-        assert re.match(r'^[0-9a-fA-F]+$', board_id)
+def _param(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _traced(endpoint: str):
+    """
+    Span per call of a Client method when the json client has a tracer
+    :param endpoint: Trello route template, e.g. "GET /cards/{id}"
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = f"Client.{func.__name__}"
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            tracer = self._json_client.tracer
+            if tracer is None:
+                return await func(self, *args, **kwargs)
+            arguments = signature.bind_partial(self, *args, **kwargs).arguments
+            attributes = {key: arguments[key] for key in SPAN_ARGUMENTS if arguments.get(key) is not None}
+            with tracer.span(name, endpoint=endpoint, **attributes):
+                return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
+
+class Client:
+    def __init__(self, api_key: str = None, token: str = None, board_id: str = None, cache: ResponseCache = None,
+                 fast_models: bool = False, write_behind_window: float = None, **kwargs):
+        """
+        :param cache: Read-through cache of get_card, get_lists and get_webhooks. Writes invalidate it
+        :param fast_models: Return unvalidated __slots__ models (FastTrelloCard, ...) instead of pydantic ones
+        :param write_behind_window: Seconds to merge update_card() calls of one card into one PUT. Off when None
+        :param kwargs: Connection settings passed to TrelloJson (base_url, session, limit_per_host, ...)
+        """
+        # TrelloJson validates api_key, token and board_id
         self.token = token
         self.board_id = board_id
-        self._json_client = TrelloJson(api_key=api_key, token=token, board_id=board_id)
+        self.cache = cache
+        self.models = FAST_MODELS if fast_models else MODELS
+        self._json_client = TrelloJson(api_key=api_key, token=token, board_id=board_id, **kwargs)
+        self.write_behind = None
+        if write_behind_window is not None:
+            self.write_behind = UpdateCoalescer(
+                lambda card_id, fields: self._json_client.update_card(card_id, **fields), write_behind_window)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Write pending write-behind updates and close the session
+        """
+        if self.write_behind is not None:
+            await self.write_behind.flush()
+        await self._json_client.aclose()
+
+    def _parse(self, endpoint: str, model, response: Union[dict, list]):
+        """
+        Model or list of models of a response, timed as "parse" when metrics or tracing are on
+        """
+        metrics = self._json_client.metrics
+        started = time.perf_counter() if metrics is not None else None
+        with self._json_client._span("parse", endpoint=endpoint, model=model.__name__):
+            if isinstance(response, list):
+                result = [model.parse_obj(obj) for obj in response]
+            else:
+                result = model.parse_obj(response)
+        if metrics is not None:
+            metrics.timing("parse", time.perf_counter() - started, {"endpoint": endpoint})
+        return result
+
+    async def _cached(self, resource: str, ident, loader):
+        if self.cache is None:
+            return await loader()
+        return await self.cache.get_or_load(resource, ident, loader)
+
+    def _invalidate(self, resource: str, ident=None):
+        if self.cache is not None:
+            self.cache.invalidate(resource, ident)
 
 
     # # TODO: get_card_in_list
@@ -30,23 +125,31 @@ class Client:
     #                                                '/boards/' + self.board_id + '/cards/' + str(card_id))
     #     return await self.loop.run_in_executor(None, Card.from_json, card_list, json_obj)
 
+    @_traced("GET /tokens/{token}/webhooks")
     async def get_webhooks(self) -> List[TrelloWebHook]:
         """
         Get Webhooks for Token
         """
-        response = await self._json_client.get_webhooks()
-        return [TrelloWebHook.parse_obj(wh) for wh in response]
+        response = await self._cached("webhooks", self.token, self._json_client.get_webhooks)
 
+        if "error" in response:
+            raise TrelloException(response["message"])
+
+        return self._parse("get_webhooks", self.models.webhook, response)
+
+    @_traced("DELETE /tokens/{token}/webhooks/{id}")
     async def del_webhook(self, wh_id: str) -> bool:
         """
         :param wh_id: ID of the webhook to retrieve. Pattern: ^[0-9a-fA-F]{32}$
         """
-        assert re.match(r'^[0-9a-fA-F]+$', wh_id)
+        assert ID_RE.match(wh_id)
         response = await self._json_client.del_webhook(wh_id)
+        self._invalidate("webhooks")
         if "error" in response:
             return False
         return True
 
+    @_traced("POST /tokens/{token}/webhooks")
     async def set_webhook(self, callback_url: str, description: str = "", id_model: str = None) -> TrelloWebHook:
         """
         :param callback_url: A valid URL that is reachable with a HEAD and POST request.
@@ -54,13 +157,15 @@ class Client:
         :param id_model: ID of the model to be monitored. Pattern: ^[0-9a-fA-F]{32}$
         """
         response = await self._json_client.set_webhook(callback_url, description, id_model)
+        self._invalidate("webhooks")
 
         if "error" in response:
             raise TrelloException(response["message"])
 
-        return TrelloWebHook.parse_obj(response)
+        return self._parse("set_webhook", self.models.webhook, response)
 
 
+    @_traced("POST /cards")
     async def create_card(self, id_list, name: str = "", desc: str = "", due: str = None, pos = "top", **kwargs) -> TrelloCard:
         """
         :param id_list: The ID of the list the card should be created in. Pattern: ^[0-9a-fA-F]{32}$
@@ -80,33 +185,70 @@ class Client:
         if "error" in response:
             raise TrelloException(response["message"])
 
-        return TrelloCard.parse_obj(response)
+        return self._parse("create_card", self.models.card, response)
 
 
-    async def get_card(self, card_id: str) -> TrelloCard:
+    @_traced("GET /cards/{id}")
+    async def get_card(self, card_id: str, fields: str = None, checklists: str = "none",
+                       custom_field_items: bool = False) -> TrelloCard:
         """
         :param card_id: The ID of the Card. Pattern: ^[0-9a-fA-F]{32}$
+        :param fields: Fields to fetch, only the ones TrelloCard reads by default. "all" for everything
+        :param checklists: Opt-in expansion: all or none
+        :param custom_field_items: Opt-in expansion of custom field values
         """
         # assert re.match(r'^[0-9a-fA-F]+$', card_id)
+        projection = {"fields": fields or api_fields(TrelloCard), "checklists": checklists,
+                      "custom_field_items": custom_field_items}
 
-        response = await self._json_client.get_card(card_id)
+        if fields is None and checklists == "none" and not custom_field_items:
+            response = await self._cached("card", card_id, lambda: self._json_client.get_card(card_id, **projection))
+        else:
+            response = await self._json_client.get_card(card_id, **projection)
 
         if "error" in response:
             raise TrelloException(response["message"])
 
-        return TrelloCard.parse_obj(response)
+        return self._parse("get_card", self.models.card, response)
 
+    @_traced("GET /batch")
+    async def get_cards(self, card_ids: List[str], return_exceptions: bool = False,
+                        fields: str = None) -> List[Union[TrelloCard, TrelloException]]:
+        """
+        Read many cards with batch requests (10 cards per round trip)
+        :param card_ids: IDs of the Cards
+        :param return_exceptions: Put TrelloException of a failed card into the result instead of raising it
+        :param fields: Fields to fetch, only the ones TrelloCard reads by default
+        :return: Cards in the order of card_ids
+        """
+        # batch routes are comma-separated: commas inside a route must be escaped
+        query = "?fields=" + quote(fields or api_fields(TrelloCard), safe="")
+        responses = await self._json_client.batch_get([f"/cards/{card_id}{query}" for card_id in card_ids])
+
+        errors = [r for r in responses if "error" in r]
+        if errors and not return_exceptions:
+            raise TrelloException(errors[0]["message"])
+        parsed = iter(self._parse("get_cards", self.models.card, [r for r in responses if "error" not in r]))
+        return [TrelloException(r["message"]) if "error" in r else next(parsed) for r in responses]
+
+    @_traced("PUT /cards/{id}")
     async def update_card(self, card_id, **kwagrs) -> TrelloCard:
         """
+        With write_behind_window, updates of the card within the window are sent as one PUT
+        and every caller gets the card after it
         :param card_id: The ID of the Card. Pattern: ^[0-9a-fA-F]{32}$
         """
         # assert re.match(r'^[0-9a-fA-F]+$', card_id)
-        response = await self._json_client.update_card(card_id)
+        if self.write_behind is not None:
+            response = await self.write_behind.submit(card_id, kwagrs)
+        else:
+            response = await self._json_client.update_card(card_id, **kwagrs)
+        self._invalidate("card", card_id)
 
         if "error" in response:
             raise TrelloException(response["message"])
 
-        return TrelloCard.parse_obj(response)
+        return self._parse("update_card", self.models.card, response)
 
         # new_title = "🔄 " + str(card_short_id) + " " + title
         # card = await self.get_card(card_id)
@@ -123,15 +265,126 @@ class Client:
         #
         # return card, lab
 
-    async def get_lists(self, **kwargs) -> List[TrelloList]:
+    @_traced("GET /boards/{id}/lists")
+    async def get_lists(self, board_id: str = None, **kwargs) -> List[TrelloList]:
 
-        response = await self._json_client.get_lists(**kwargs)
+        response = await self._cached("lists", (board_id or self.board_id, tuple(sorted(kwargs.items()))),
+                                      lambda: self._json_client.get_lists(board_id, **kwargs))
 
         if "error" in response:
             raise TrelloException(response["message"])
 
-        return [TrelloList.parse_obj(lst) for lst in response]
+        return self._parse("get_lists", self.models.list, response)
+
+    @_traced("GET /boards/{id}/cards")
+    async def get_board_cards(self, board_id: str = None, fields: str = None, **kwargs) -> List[TrelloCard]:
+        """
+        :param fields: Fields to fetch, only the ones TrelloCard reads by default. "all" for everything
+        :param kwargs: Query params, e.g. filter="all"
+        """
+        response = await self._json_client.get_board_cards(board_id, fields=fields or api_fields(TrelloCard), **kwargs)
 
+        if "error" in response:
+            raise TrelloException(response["message"])
+
+        return self._parse("get_board_cards", self.models.card, response)
+
+    async def _pages(self, fetch, page_size: int, prefetch: bool = True, **params) -> AsyncIterator[dict]:
+        """
+        Walk Trello's before/limit cursor from the newest items to the oldest.
+        At most two pages are held: the one being consumed and the prefetched next one.
+        :param fetch: TrelloJson method accepting limit and before
+        :param page_size: Clamped to MAX_PAGE_SIZE: a larger limit would be answered with one short page
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        params = {k: _param(v) for k, v in params.items() if v is not None}
+
+        async def page(before):
+            response = await fetch(limit=page_size, **{**params, **({"before": before} if before else {})})
+            if "error" in response:
+                raise TrelloException(response["message"])
+            return response
+
+        task = asyncio.ensure_future(page(params.pop("before", None)))
+        try:
+            while task is not None:
+                items = await task
+                task = None
+                next_before = min(item["id"] for item in items) if len(items) >= page_size else None
+                if next_before and prefetch:
+                    task = asyncio.ensure_future(page(next_before))
+                for item in items:
+                    yield item
+                if next_before and not prefetch:
+                    task = asyncio.ensure_future(page(next_before))
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def iter_cards(self, board_id: str = None, filter: str = "all", page_size: int = 1000,
+                         prefetch: bool = True, fields: str = None, **kwargs) -> AsyncIterator[TrelloCard]:
+        """
+        All cards of the board, archived included by default, page by page
+        :param filter: all, closed, open, visible
+        :param fields: Fields to fetch, only the ones TrelloCard reads by default
+        :param kwargs: Other query params
+        """
+        fetch = functools.partial(self._json_client.get_board_cards, board_id)
+        async for card in self._pages(fetch, page_size, prefetch, filter=filter,
+                                      fields=fields or api_fields(TrelloCard), **kwargs):
+            yield self.models.card.parse_obj(card)
+
+    async def iter_actions(self, board_id: str = None, since: Union[str, datetime] = None,
+                           before: Union[str, datetime] = None, filter: str = None, page_size: int = 1000,
+                           prefetch: bool = True, **kwargs) -> AsyncIterator[Action]:
+        """
+        Board actions from the newest to the oldest
+        :param since: Action ID or date, only newer actions
+        :param before: Action ID or date, only older actions
+        :param filter: Comma separated action types, e.g. "updateCard,createCard"
+        """
+        fetch = functools.partial(self._json_client.get_board_actions, board_id)
+        async for action in self._pages(fetch, page_size, prefetch, since=since, before=before, filter=filter,
+                                        display="true", **kwargs):
+            yield Action.parse_obj(action)
+
+    async def iter_lists(self, board_id: str = None, **kwargs) -> AsyncIterator[TrelloList]:
+        """
+        Trello does not page lists: one request
+        """
+        for lst in await self.get_lists(board_id, **kwargs):
+            yield lst
+
+    async def iter_members(self, board_id: str = None, **kwargs) -> AsyncIterator[Member]:
+        response = await self._json_client.get_board_members(board_id, **kwargs)
+
+        if "error" in response:
+            raise TrelloException(response["message"])
+
+        for member in response:
+            yield self.models.member.parse_obj(member)
+
+    async def _parse_stream(self, items: AsyncIterator[dict], model):
+        async for item in items:
+            if "error" in item:
+                raise TrelloException(item["message"])
+            yield model.parse_obj(item)
+
+    def stream_cards(self, board_id: str = None, filter: str = "all", fields: str = None,
+                     **kwargs) -> AsyncIterator[TrelloCard]:
+        """
+        Cards of one response parsed as they arrive: peak memory is one card, not the whole board.
+        Use iter_cards() to split the board into several requests instead
+        :param fields: Fields to fetch, only the ones TrelloCard reads by default
+        """
+        items = self._json_client.stream_board_cards(board_id, filter=filter, fields=fields or api_fields(TrelloCard),
+                                                     **kwargs)
+        return self._parse_stream(items, self.models.card)
+
+    def stream_lists(self, board_id: str = None, **kwargs) -> AsyncIterator[TrelloList]:
+        return self._parse_stream(self._json_client.stream_lists(board_id, **kwargs), self.models.list)
+
+    @_traced("POST /cards/{id}/idMembers")
     async def add_member(self, card_id, value) -> List[Member]:
         """
         :param card_id: The ID of the Card. Pattern: ^[0-9a-fA-F]{32}$
@@ -139,11 +392,39 @@ class Client:
         :return:
         """
         response = await self._json_client.add_member(card_id, value)
+        self._invalidate("card", card_id)
 
         if "error" in response:
             raise TrelloException(response["message"])
 
-        return [Member.parse_obj(m) for m in response]
+        return self._parse("add_member", self.models.member, response)
+
+    def create_cards(self, specs: Union[Iterable[dict], AsyncIterable[dict]], concurrency: int = 10,
+                     on_progress: ProgressCallback = None) -> AsyncIterator[BulkResult]:
+        """
+        Create many cards, at most `concurrency` requests at a time. Results stream back as calls complete:
+
+            async for r in client.create_cards(({"id_list": list_id, "name": n} for n in names)):
+                if not r.ok: log.error(f"{r.spec}: {r.error}")
+
+        :param specs: kwargs of create_card()
+        :param on_progress: Called with (done, failed) counters
+        """
+        return run_bounded(lambda spec: self.create_card(**spec), specs, concurrency, on_progress)
+
+    def update_cards(self, specs: Union[Iterable[dict], AsyncIterable[dict]], concurrency: int = 10,
+                     on_progress: ProgressCallback = None) -> AsyncIterator[BulkResult]:
+        """
+        :param specs: kwargs of update_card() including card_id, e.g. {"card_id": ..., "name": ...}
+        """
+        return run_bounded(lambda spec: self.update_card(**spec), specs, concurrency, on_progress)
+
+    def add_members(self, specs: Union[Iterable[Tuple[str, str]], AsyncIterable[Tuple[str, str]]], concurrency: int = 10,
+                    on_progress: ProgressCallback = None) -> AsyncIterator[BulkResult]:
+        """
+        :param specs: Pairs (card_id, member_id)
+        """
+        return run_bounded(lambda spec: self.add_member(*spec), specs, concurrency, on_progress)
 
 
 
@@ -0,0 +1,55 @@
+import json
+from typing import Any, Union
+
+
+class JsonCodec:
+    """
+    stdlib json. dumps() returns str as aiohttp's json_serialize expects
+    """
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> str:
+        return self._orjson.dumps(obj).decode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj: Any) -> str:
+        return self._ujson.dumps(obj, ensure_ascii=False)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._ujson.loads(data)
+
+
+def default_codec() -> JsonCodec:
+    """
+    The fastest installed one: orjson, ujson, then stdlib json
+    """
+    for codec in (OrjsonCodec, UjsonCodec):
+        try:
+            return codec()
+        except ImportError:
+            pass
+    return JsonCodec()
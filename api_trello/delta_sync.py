@@ -0,0 +1,200 @@
+"""
+Incremental board sync: instead of downloading every list and card, fetch the actions since a
+checkpoint and apply them to a BoardMirror. A full resync happens only on the first run, after
+too many changes, or on actions the mirror cannot replay.
+
+    sync = DeltaSync(trello, JsonCheckpointStore("checkpoints/"))
+    result = await sync.sync()  # SyncResult(full=False, applied=12, ...)
+    sync.mirror.cards_in_list(list_id)
+"""
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
+
+from loguru import logger as log
+from pydantic.json import pydantic_encoder
+
+from .client import Client, TrelloException
+from .mirror import BoardMirror
+from .pydantic_model import Action
+
+# actions that move a whole list with its cards, without an action per card
+RESYNC_ACTIONS = frozenset({"moveListToBoard", "moveListFromBoard"})
+
+
+class SyncResult(NamedTuple):
+    board_id: str
+    full: bool
+    applied: int
+    ignored: int
+    action_id: Optional[str]
+    reason: Optional[str] = None  # of the full resync
+
+
+class CheckpointStore(ABC):
+    """
+    Per-board state: the last applied action and the mirror it was applied to.
+    Subclass to keep it elsewhere
+    """
+
+    @abstractmethod
+    def load(self, board_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def save(self, board_id: str, state: dict):
+        pass
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    def __init__(self):
+        self.states: Dict[str, dict] = {}
+
+    def load(self, board_id: str) -> Optional[dict]:
+        return self.states.get(board_id)
+
+    def save(self, board_id: str, state: dict):
+        self.states[board_id] = state
+
+
+class JsonCheckpointStore(CheckpointStore):
+    """
+    One <board_id>.json per board, replaced atomically
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, board_id: str) -> str:
+        return os.path.join(self.directory, f"{board_id}.json")
+
+    def load(self, board_id: str) -> Optional[dict]:
+        try:
+            with open(self._path(board_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            log.warning(f"Board {board_id} checkpoint is unreadable, resyncing: {e}")
+            return None
+
+    def save(self, board_id: str, state: dict):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, default=pydantic_encoder)
+            os.replace(tmp, self._path(board_id))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class DeltaSync:
+    """
+    Keeps `mirror` current with the board actions newer than the stored checkpoint
+    """
+
+    def __init__(self, client: Client, store: CheckpointStore = None, mirror: BoardMirror = None,
+                 max_actions: int = 5000, page_size: int = 1000):
+        """
+        :param store: Checkpoints and mirror snapshots, in memory by default
+        :param mirror: Mirror to keep current, a new one of the client's board by default
+        :param max_actions: More actions than this since the checkpoint and a full resync is cheaper
+        """
+        self.client = client
+        self.store = store or MemoryCheckpointStore()
+        self.mirror = mirror or BoardMirror(client)
+        self.board_id = self.mirror.board_id
+        self.max_actions = max_actions
+        self.page_size = page_size
+        self.action_id: Optional[str] = None
+        self._loaded = False
+
+    def _restore(self):
+        state = self.store.load(self.board_id)
+        if state is not None and state.get("action_id"):
+            models = self.client.models  # the same types as a seeded mirror
+            self.mirror._load([models.list.parse_obj(lst) for lst in state["lists"]],
+                              [models.card.parse_obj(card) for card in state["cards"]])
+            self.action_id = state["action_id"]
+
+    def _save(self):
+        self.store.save(self.board_id, {
+            "action_id": self.action_id,
+            "synced_at": time.time(),
+            "lists": [lst.dict(by_alias=True, exclude_none=True) for lst in self.mirror.lists.values()],
+            "cards": [card.dict(by_alias=True, exclude_none=True) for card in self.mirror.cards.values()],
+        })
+
+    async def _actions_since(self, action_id: str) -> List[Action]:
+        """
+        :return: Actions newer than action_id, the newest first. Stops after max_actions + 1
+        """
+        types = ",".join(sorted({*self.mirror._handlers, *RESYNC_ACTIONS}))
+        actions = []
+        items = self.client.iter_actions(self.board_id, since=action_id, filter=types, page_size=self.page_size)
+        try:
+            async for action in items:
+                if action.id != action_id:
+                    actions.append(action)
+                if len(actions) > self.max_actions:
+                    break
+        finally:
+            await items.aclose()
+        return actions
+
+    async def _latest_action_id(self) -> Optional[str]:
+        response = await self.client._json_client.get_board_actions(self.board_id, limit=1, fields="id")
+        if "error" in response:
+            raise TrelloException(response["message"])
+        return response[0]["id"] if response else None
+
+    async def resync(self, reason: str = "requested") -> SyncResult:
+        """
+        Reload the whole board. The checkpoint is taken first: actions during the reload are replayed next time
+        """
+        action_id = await self._latest_action_id()
+        if self.mirror.lists or self.mirror.cards:
+            await self.mirror.reconcile()  # logs the drift
+        else:
+            await self.mirror.seed()
+        self.action_id = action_id
+        self._loaded = True
+        self._save()
+        log.info(f"Board {self.board_id} full resync: {reason}")
+        return SyncResult(self.board_id, True, 0, 0, action_id, reason)
+
+    async def sync(self) -> SyncResult:
+        """
+        Apply the actions since the checkpoint, oldest first, or resync the board when needed
+        """
+        if not self._loaded:
+            self._restore()
+            self._loaded = True
+        if self.action_id is None:
+            return await self.resync("no checkpoint")
+
+        try:
+            actions = await self._actions_since(self.action_id)
+        except TrelloException as e:
+            return await self.resync(f"actions since {self.action_id} failed: {e}")
+        if len(actions) > self.max_actions:
+            return await self.resync(f"more than {self.max_actions} actions")
+        replay = next((a.type for a in actions if a.type in RESYNC_ACTIONS), None)
+        if replay is not None:
+            return await self.resync(f"{replay} cannot be replayed")
+
+        applied = ignored = 0
+        for action in reversed(actions):
+            if self.mirror.apply_action(action):
+                applied += 1
+            else:
+                ignored += 1
+        if actions:
+            self.action_id = actions[0].id
+            self._save()
+        return SyncResult(self.board_id, False, applied, ignored, self.action_id)
@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+    stored_at: float
+
+
+class SqliteHttpCache:
+    """
+    Persistent cache of GET responses with their ETag/Last-Modified, revalidated with conditional requests.
+    One SQLite file (WAL mode) may be shared by all processes of a host.
+    """
+
+    def __init__(self, path: str, fresh_for: float = 5, max_age: float = 7 * 24 * 3600):
+        """
+        :param path: SQLite file
+        :param fresh_for: Seconds a stored response is served without revalidation. With 0 every read is
+            a conditional request: a burst of reads of one resource is a burst of requests
+        :param max_age: Seconds after which a stored response is ignored and dropped
+        """
+        self.path = path
+        self.fresh_for = fresh_for
+        self.max_age = max_age
+        self.stats = Counter()
+        self._db: sqlite3.Connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                       "body BLOB NOT NULL, stored_at REAL NOT NULL)")
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def key(method: str, url: str, params: dict) -> str:
+        """
+        Hash of the request: tokens are not stored in clear text
+        """
+        raw = json.dumps([method, url, params], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT etag, last_modified, body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = CachedResponse(*row)
+        if time.time() - entry.stored_at > self.max_age:
+            self.delete(key)
+            return None
+        return entry
+
+    def put(self, key: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        with self._lock:
+            self._connect().execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                                    (key, etag, last_modified, body, time.time()))
+
+    def touch(self, key: str):
+        with self._lock:
+            self._connect().execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.fresh_for
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # SQLite calls are blocking: run them in the default executor
+    async def aget(self, key: str) -> Optional[CachedResponse]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+
+    async def aput(self, key: str, etag: Optional[str], last_modified: Optional[str], body: bytes):
+        await asyncio.get_running_loop().run_in_executor(None, self.put, key, etag, last_modified, body)
+
+    async def atouch(self, key: str):
+        await asyncio.get_running_loop().run_in_executor(None, self.touch, key)
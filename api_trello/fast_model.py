@@ -0,0 +1,112 @@
+"""
+Compact __slots__ twins of the pydantic models for bulk reads of trusted Trello responses.
+Same attribute names and json aliases, but no validation or type coercion; datetimes are parsed on first access.
+"""
+from datetime import datetime
+from typing import Dict, Tuple, Type
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _lazy_datetime(name: str) -> property:
+    slot = "_" + name
+
+    def get(self):
+        value = getattr(self, slot)
+        if isinstance(value, str):
+            value = _parse_datetime(value)
+            setattr(self, slot, value)
+        return value
+
+    def set(self, value):
+        setattr(self, slot, value)
+
+    return property(get, set)
+
+
+class FastModel:
+    __slots__ = ()
+    # (slot, json key); a datetime field is stored raw in "_<name>" behind a property
+    _fields: Tuple[Tuple[str, str], ...] = ()
+    _nested: Dict[str, Type["FastModel"]] = {}
+
+    def __init__(self, **kwargs):
+        for slot, _ in self._fields:
+            setattr(self, slot, None)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def parse_obj(cls, obj: dict) -> "FastModel":
+        self = cls.__new__(cls)
+        get = obj.get
+        for slot, key in cls._fields:
+            setattr(self, slot, get(key))
+        for slot, model in cls._nested.items():
+            value = getattr(self, slot)
+            if value is not None:
+                setattr(self, slot, model.parse_obj(value))
+        return self
+
+    def dict(self, by_alias: bool = False, exclude_none: bool = False) -> dict:
+        """
+        Same keyword arguments as pydantic's BaseModel.dict()
+        """
+        result = {}
+        for slot, key in self._fields:
+            name = slot.lstrip("_")
+            value = getattr(self, name)
+            if value is None and exclude_none:
+                continue
+            if isinstance(value, FastModel):
+                value = value.dict(by_alias=by_alias, exclude_none=exclude_none)
+            result[key if by_alias else name] = value
+        return result
+
+    def copy(self) -> "FastModel":
+        other = self.__class__.__new__(self.__class__)
+        for slot, _ in self._fields:
+            setattr(other, slot, getattr(self, slot))
+        return other
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.dict() == other.dict()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({', '.join(f'{k}={v!r}' for k, v in self.dict().items())})"
+
+
+class FastBadgeObject(FastModel):
+    __slots__ = ("due_complete",)
+    _fields = (("due_complete", "dueComplete"),)
+
+
+class FastTrelloCard(FastModel):
+    __slots__ = ("id", "short_id", "id_list", "_due", "pos", "type", "name", "short_link", "desc", "closed",
+                 "id_members", "badges")
+    _fields = (("id", "id"), ("short_id", "idShort"), ("id_list", "idList"), ("_due", "due"), ("pos", "pos"),
+               ("type", "type"), ("name", "name"), ("short_link", "shortLink"), ("desc", "desc"),
+               ("closed", "closed"), ("id_members", "idMembers"), ("badges", "badges"))
+    _nested = {"badges": FastBadgeObject}
+    due = _lazy_datetime("due")
+
+
+class FastTrelloWebHook(FastModel):
+    __slots__ = ("id", "description", "id_model", "callback_url", "active", "cnt_fails", "_date_fail_first")
+    _fields = (("id", "id"), ("description", "description"), ("id_model", "idModel"),
+               ("callback_url", "callBackURL"), ("active", "active"), ("cnt_fails", "consecutiveFailures"),
+               ("_date_fail_first", "firstConsecutiveFailDate"))
+    date_fail_first = _lazy_datetime("date_fail_first")
+
+
+class FastTrelloList(FastModel):
+    __slots__ = ("id", "name", "type", "text")
+    _fields = (("id", "id"), ("name", "name"), ("type", "type"), ("text", "text"))
+
+
+class FastMember(FastModel):
+    __slots__ = ("id", "type", "username", "text", "full_name")
+    _fields = (("id", "id"), ("type", "type"), ("username", "username"), ("text", "text"),
+               ("full_name", "fullName"))
@@ -0,0 +1,97 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Callable, Optional
+
+_WHITESPACE = " \t\n\r"
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_BRACKET = re.compile(r'["\[\]{}]')
+_SCALAR = re.compile(r'[^,\]\s]*')
+
+
+def _element_end(buf: str, pos: int) -> Optional[int]:
+    """
+    End of the json element at buf[pos] or None if the buffer ends first. The element itself is not validated
+    """
+    if buf[pos] == '"':
+        match = _STRING.match(buf, pos)
+        return match.end() if match else None
+    if buf[pos] not in "[{":
+        end = _SCALAR.match(buf, pos).end()
+        return end if end < len(buf) else None  # a number may go on in the next chunk
+    depth = 0
+    while True:
+        match = _BRACKET.search(buf, pos)
+        if match is None:
+            return None
+        if match.group() == '"':
+            match = _STRING.match(buf, match.start())
+            if match is None:
+                return None
+        else:
+            depth += 1 if match.group() in "[{" else -1
+        pos = match.end()
+        if depth == 0:
+            return pos
+
+
+async def iter_json_array(content, chunk_size: int = 64 * 1024,
+                          loads: Callable[[str], Any] = json.loads) -> AsyncIterator[Any]:
+    """
+    Decode a json array from a byte stream element by element.
+    Only the current element and one chunk are buffered, whatever the size of the array.
+    :param content: aiohttp StreamReader or anything with `async read(n) -> bytes`
+    :param loads: Decodes one element, e.g. the client codec's
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+
+    async def more() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = await content.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos == len(buf):
+            if not await more():
+                raise ValueError("Unexpected end of json array")
+            continue
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError(f"Expected json array, got {buf[pos:pos + 20]!r}")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+        if buf[pos] == ",":
+            pos += 1
+            continue
+
+        end = _element_end(buf, pos)
+        if end is None:
+            if await more():
+                continue
+            raise ValueError("Unexpected end of json array")
+        # an element must be followed by "," or "]": otherwise it is cut by the chunk end or invalid
+        after = end
+        while after < len(buf) and buf[after] in _WHITESPACE:
+            after += 1
+        if after == len(buf) or buf[after] not in ",]":
+            if await more():
+                continue
+            raise ValueError(f"Unexpected {buf[after:after + 20]!r} after json array element")
+        item = loads(buf[pos:end])
+        pos = end
+        yield item
@@ -0,0 +1,231 @@
+"""
+Metrics of TrelloJson calls, sent to a pluggable sink.
+
+Timings (seconds), tagged with the endpoint (method name):
+    request   whole call including retries
+    dns       host resolution of a new connection
+    connect   new connection: DNS, TCP and TLS
+    ttfb      request sent until response headers
+    download  response body
+    decode    json decoding
+    parse     model parsing in Client
+Counters: responses (endpoint, status), retries, giveups (endpoint), connections_reused.
+Gauges: in_flight (endpoint), rate_limit_remaining (kind: api-key or api-token).
+"""
+import bisect
+import socket
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from aiohttp import TraceConfig
+
+Tags = Dict[str, str]
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _key(name: str, tags: Tags) -> Tuple[str, tuple]:
+    return name, tuple(sorted(tags.items())) if tags else ()
+
+
+class MetricsSink:
+    """
+    Base sink: ignores everything
+    """
+
+    def timing(self, name: str, seconds: float, tags: Tags = None):
+        pass
+
+    def increment(self, name: str, tags: Tags = None, value: int = 1):
+        pass
+
+    def gauge(self, name: str, value: float, tags: Tags = None):
+        pass
+
+
+class InMemoryMetrics(MetricsSink):
+    """
+    Keeps every sample, for tests and ad-hoc profiling
+    """
+
+    def __init__(self):
+        self.timings: Dict[tuple, List[float]] = defaultdict(list)
+        self.counters = Counter()
+        self.gauges: Dict[tuple, float] = {}
+
+    def timing(self, name: str, seconds: float, tags: Tags = None):
+        self.timings[_key(name, tags)].append(seconds)
+
+    def increment(self, name: str, tags: Tags = None, value: int = 1):
+        self.counters[_key(name, tags)] += value
+
+    def gauge(self, name: str, value: float, tags: Tags = None):
+        self.gauges[_key(name, tags)] = value
+
+    @staticmethod
+    def _matches(key: tuple, name: str, tags: Tags) -> bool:
+        return key[0] == name and set(tags.items()) <= set(key[1])
+
+    def samples(self, name: str, **tags) -> List[float]:
+        """
+        Timings of name over all series having these tags
+        """
+        return [v for key, values in self.timings.items() if self._matches(key, name, tags) for v in values]
+
+    def count(self, name: str, **tags) -> int:
+        return sum(v for key, v in self.counters.items() if self._matches(key, name, tags))
+
+    def summary(self, name: str, **tags) -> dict:
+        values = sorted(self.samples(name, **tags))
+        if not values:
+            return {"count": 0}
+
+        def percentile(p):
+            return values[min(len(values) - 1, int(p * len(values)))]
+
+        return {"count": len(values), "mean": sum(values) / len(values), "p50": percentile(0.5),
+                "p90": percentile(0.9), "p99": percentile(0.99), "max": values[-1]}
+
+
+class PrometheusMetrics(MetricsSink):
+    """
+    Cumulative histograms, counters and gauges in the Prometheus text exposition format
+
+        metrics = PrometheusMetrics()
+        app.router.add_get("/metrics", lambda request: web.Response(text=metrics.exposition()))
+    """
+
+    def __init__(self, namespace: str = "trello", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[tuple, list] = {}  # key: [bucket counts..., sum, count]
+        self._counters = Counter()
+        self._gauges: Dict[tuple, float] = {}
+
+    def timing(self, name: str, seconds: float, tags: Tags = None):
+        key = _key(name, tags)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = [0] * (len(self.buckets) + 2)
+        histogram[bisect.bisect_left(self.buckets, seconds)] += 1  # index len(buckets) is +Inf
+        histogram[-2] += seconds
+        histogram[-1] += 1
+
+    def increment(self, name: str, tags: Tags = None, value: int = 1):
+        self._counters[_key(name, tags)] += value
+
+    def gauge(self, name: str, value: float, tags: Tags = None):
+        self._gauges[_key(name, tags)] = value
+
+    @staticmethod
+    def _labels(labels: tuple) -> str:
+        if not labels:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+    def exposition(self) -> str:
+        lines = []
+        typed = set()
+
+        def header(metric, kind):
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} {kind}")
+
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            metric = f"{self.namespace}_{name}_seconds"
+            header(metric, "histogram")
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), histogram):
+                cumulative += count
+                lines.append(f"{metric}_bucket{self._labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{metric}_sum{self._labels(labels)} {histogram[-2]}")
+            lines.append(f"{metric}_count{self._labels(labels)} {histogram[-1]}")
+        for (name, labels), value in sorted(self._counters.items()):
+            metric = f"{self.namespace}_{name}_total"
+            header(metric, "counter")
+            lines.append(f"{metric}{self._labels(labels)} {value}")
+        for (name, labels), value in sorted(self._gauges.items()):
+            metric = f"{self.namespace}_{name}"
+            header(metric, "gauge")
+            lines.append(f"{metric}{self._labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class StatsdMetrics(MetricsSink):
+    """
+    Fire-and-forget UDP datagrams with DogStatsD tags: trello.ttfb:12.5|ms|#endpoint:get_card
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8125, prefix: str = "trello", tags: bool = True):
+        """
+        :param tags: Send tags in the DogStatsD format. Plain StatsD servers need tags=False
+        """
+        self.address = (host, port)
+        self.prefix = prefix
+        self.tags = tags
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def _send(self, name: str, value, kind: str, tags: Tags):
+        line = f"{self.prefix}.{name}:{value}|{kind}"
+        if self.tags and tags:
+            line += "|#" + ",".join(f"{k}:{v}" for k, v in tags.items())
+        try:
+            self._socket.sendto(line.encode(), self.address)
+        except OSError:
+            pass  # metrics never fail a call
+
+    def timing(self, name: str, seconds: float, tags: Tags = None):
+        self._send(name, round(seconds * 1000, 3), "ms", tags)
+
+    def increment(self, name: str, tags: Tags = None, value: int = 1):
+        self._send(name, value, "c", tags)
+
+    def gauge(self, name: str, value: float, tags: Tags = None):
+        self._send(name, value, "g", tags)
+
+    def close(self):
+        self._socket.close()
+
+
+def trace_config(sink: MetricsSink) -> TraceConfig:
+    """
+    aiohttp hooks timing DNS, connect and TTFB.
+    Requests are labelled by trace_request_ctx={"endpoint": ...}
+    """
+    config = TraceConfig()
+
+    def tags(ctx) -> Tags:
+        return {"endpoint": (ctx.trace_request_ctx or {}).get("endpoint", "")}
+
+    async def on_request_start(session, ctx, params):
+        ctx.request_start = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        sink.timing("ttfb", time.perf_counter() - ctx.request_start, tags(ctx))
+
+    async def on_connection_create_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, ctx, params):
+        sink.timing("connect", time.perf_counter() - ctx.connect_start, tags(ctx))
+
+    async def on_connection_reuseconn(session, ctx, params):
+        sink.increment("connections_reused", tags(ctx))
+
+    async def on_dns_resolvehost_start(session, ctx, params):
+        ctx.dns_start = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, ctx, params):
+        sink.timing("dns", time.perf_counter() - ctx.dns_start, tags(ctx))
+
+    config.on_request_start.append(on_request_start)
+    config.on_request_end.append(on_request_end)
+    config.on_connection_create_start.append(on_connection_create_start)
+    config.on_connection_create_end.append(on_connection_create_end)
+    config.on_connection_reuseconn.append(on_connection_reuseconn)
+    config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    return config
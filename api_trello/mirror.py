@@ -0,0 +1,176 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from loguru import logger as log
+
+from .client import Client
+from .pydantic_model import Action, TrelloCard, TrelloList, TrelloUpdate
+
+
+class BoardMirror:
+    """
+    In-memory copy of the lists and cards of a board. Seeded once from the REST API,
+    then kept current by webhook actions. reconcile() repairs drift from missed events.
+    """
+
+    def __init__(self, client: Client, board_id: str = None):
+        self.client = client
+        self.board_id = board_id or client.board_id
+        self.lists: Dict[str, TrelloList] = {}
+        self.cards: Dict[str, TrelloCard] = {}
+        self.applied = 0
+        self.ignored = 0
+        self._by_list: Dict[str, Set[str]] = defaultdict(set)
+        self._reconcile_task: asyncio.Task = None
+        self._handlers = {
+            "createCard": self._create_card,
+            "copyCard": self._create_card,
+            "convertToCardFromCheckItem": self._create_card,
+            "moveCardToBoard": self._create_card,
+            "updateCard": self._update_card,
+            "deleteCard": self._delete_card,
+            "moveCardFromBoard": self._delete_card,
+            "addMemberToCard": self._add_member,
+            "removeMemberFromCard": self._remove_member,
+            "createList": self._update_list,
+            "updateList": self._update_list,
+        }
+
+    async def seed(self):
+        lists, cards = await asyncio.gather(self.client.get_lists(), self.client.get_board_cards())
+        self._load(lists, cards)
+
+    async def reconcile(self) -> int:
+        """
+        Reload the board and replace the mirror
+        :return: Number of cards and lists that had drifted
+        """
+        lists, cards = await asyncio.gather(self.client.get_lists(), self.client.get_board_cards())
+        fresh_lists = {lst.id: lst for lst in lists}
+        fresh_cards = {card.id: card for card in cards}
+        drift = _diff(self.lists, fresh_lists) + _diff(self.cards, fresh_cards)
+        if drift:
+            log.warning(f"Board {self.board_id} mirror drifted by {drift} objects")
+        self._load(lists, cards)
+        return drift
+
+    def start_reconcile(self, interval: float = 300) -> asyncio.Task:
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.reconcile()
+                except Exception as e:
+                    log.error(f"Board {self.board_id} reconcile failed: {e}")
+
+        self.stop_reconcile()
+        self._reconcile_task = asyncio.ensure_future(run())
+        return self._reconcile_task
+
+    def stop_reconcile(self):
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+
+    def cards_in_list(self, list_id: str, closed: bool = False) -> List[TrelloCard]:
+        cards = (self.cards[card_id] for card_id in self._by_list.get(list_id, ()))
+        return sorted((c for c in cards if closed or not c.closed), key=lambda c: c.pos or 0)
+
+    def apply(self, update: TrelloUpdate) -> bool:
+        return self.apply_action(update.action)
+
+    def apply_action(self, action: Action) -> bool:
+        """
+        :return: False if the action is of another board or does not change cards or lists
+        """
+        board = action.data.board
+        handler = self._handlers.get(action.type)
+        if handler is None or (board is not None and board.id != self.board_id):
+            self.ignored += 1
+            return False
+        handler(action)
+        self.applied += 1
+        return True
+
+    def _load(self, lists: List[TrelloList], cards: List[TrelloCard]):
+        self.lists = {lst.id: lst for lst in lists}
+        self.cards = {}
+        self._by_list = defaultdict(set)
+        for card in cards:
+            self._put_card(card)
+
+    def _put_card(self, card: TrelloCard):
+        old = self.cards.get(card.id)
+        if old is not None:
+            self._by_list[old.id_list].discard(card.id)
+        self.cards[card.id] = card
+        self._by_list[card.id_list].add(card.id)
+
+    def _card_of(self, action: Action) -> TrelloCard:
+        """
+        Mirror card of the action, or a partial one from the action data when the card was missed
+        """
+        card = self.cards.get(action.data.card.id)
+        if card is None:
+            card = self._new(self.client.models.card, action.data.card)
+            if action.data.list is not None:
+                card.id_list = action.data.list.id
+            self._put_card(card)
+        return card
+
+    @staticmethod
+    def _new(model, obj):
+        """
+        Mirror object of a pydantic one from an action, of the client's model type (pydantic or fast)
+        """
+        return model.parse_obj(obj.dict(by_alias=True, exclude_none=True))
+
+    def _create_card(self, action: Action):
+        card = self._new(self.client.models.card, action.data.card)
+        if action.data.list is not None:
+            card.id_list = action.data.list.id
+        self._put_card(card)
+
+    def _update_card(self, action: Action):
+        data = action.data
+        card = self._card_of(action)
+        id_list = card.id_list
+        changed = data.old.__fields_set__ if data.old is not None else set()
+        for field in changed:
+            setattr(card, field, getattr(data.card, field))
+        if data.list_after is not None:
+            card.id_list = data.list_after.id
+        if card.id_list != id_list:
+            self._by_list[id_list].discard(card.id)
+            self._by_list[card.id_list].add(card.id)
+
+    def _delete_card(self, action: Action):
+        card = self.cards.pop(action.data.card.id, None)
+        if card is not None:
+            self._by_list[card.id_list].discard(card.id)
+
+    def _add_member(self, action: Action):
+        card = self._card_of(action)
+        member_id = action.data.id_member or action.data.member.id
+        if member_id not in (card.id_members or []):
+            card.id_members = [*(card.id_members or []), member_id]
+
+    def _remove_member(self, action: Action):
+        card = self._card_of(action)
+        member_id = action.data.id_member or action.data.member.id
+        if card.id_members and member_id in card.id_members:
+            card.id_members = [m for m in card.id_members if m != member_id]
+
+    def _update_list(self, action: Action):
+        lst = action.data.list
+        known = self.lists.get(lst.id)
+        if known is None:
+            self.lists[lst.id] = self._new(self.client.models.list, lst)
+        else:
+            for field in lst.__fields_set__ - {"id"}:
+                setattr(known, field, getattr(lst, field))
+
+
+def _diff(old: dict, fresh: dict) -> int:
+    return sum(1 for k in old.keys() | fresh.keys() if old.get(k) != fresh.get(k))
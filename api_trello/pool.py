@@ -0,0 +1,181 @@
+import asyncio
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Hashable, Tuple
+
+from aiohttp import ClientSession
+
+from .client import Client
+from .codec import default_codec
+from .metrics import trace_config
+from .priority import NORMAL
+from .rate_limit import RateLimiter
+from .trello_json_client import make_session
+
+
+class _Lane:
+    __slots__ = ("active", "urgent", "queues")
+
+    def __init__(self):
+        self.active = 0
+        # waiters above NORMAL priority, admitted before any board
+        self.urgent: Deque[asyncio.Future] = deque()
+        # board: waiters, in round-robin order
+        self.queues: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+
+class FairScheduler:
+    """
+    At most `concurrency` requests in flight per key (token). Waiting requests are admitted
+    one board at a time in turn, so a board with a long backlog cannot starve the others.
+    Requests above NORMAL priority (e.g. INTERACTIVE) skip the turns and are admitted first.
+    """
+
+    def __init__(self, concurrency: int = 10):
+        self.concurrency = concurrency
+        self._lanes: Dict[Hashable, _Lane] = {}
+
+    def _lane(self, key: Hashable) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane()
+        return lane
+
+    async def acquire(self, key: Hashable, board: Hashable, priority: int = NORMAL):
+        lane = self._lane(key)
+        if lane.active < self.concurrency and not lane.queues and not lane.urgent:
+            lane.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        if priority < NORMAL:
+            queue = lane.urgent
+        else:
+            queue = lane.queues.get(board)
+            if queue is None:
+                queue = lane.queues[board] = deque()
+        queue.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(key)  # admitted just before the cancellation: pass the slot on
+            elif waiter in queue:
+                queue.remove(waiter)
+                if not queue and lane.queues.get(board) is queue:
+                    del lane.queues[board]
+            raise
+
+    def release(self, key: Hashable):
+        lane = self._lanes[key]
+        lane.active -= 1
+        while lane.urgent and lane.active < self.concurrency:
+            waiter = lane.urgent.popleft()
+            if not waiter.done():
+                lane.active += 1
+                waiter.set_result(None)
+        while lane.queues and lane.active < self.concurrency:
+            board, queue = lane.queues.popitem(last=False)
+            waiter = queue.popleft()
+            if queue:
+                lane.queues[board] = queue  # back of the line
+            if not waiter.done():
+                lane.active += 1
+                waiter.set_result(None)
+
+    def queued(self, key: Hashable) -> int:
+        lane = self._lanes.get(key)
+        return len(lane.urgent) + sum(len(q) for q in lane.queues.values()) if lane else 0
+
+    def active(self, key: Hashable) -> int:
+        lane = self._lanes.get(key)
+        return lane.active if lane else 0
+
+
+class ClientPool:
+    """
+    Clients of many boards and tokens over one connection pool, one rate limiter and one fair scheduler.
+
+        pool = ClientPool(api_key)
+        card = await pool.client(board_id, token).get_card(card_id)
+        pool.stats()  # per token
+        await pool.aclose()
+    """
+
+    def __init__(self, api_key: str, concurrency_per_token: int = 10, rate_limiter: RateLimiter = None,
+                 limit: int = 100, limit_per_host: int = 30, ttl_dns_cache: int = 300, keepalive_timeout: float = 30,
+                 **kwargs):
+        """
+        :param concurrency_per_token: Requests in flight per token, admitted in turn between its boards
+        :param limit, limit_per_host, ttl_dns_cache, keepalive_timeout: Settings of the shared connection pool
+        :param kwargs: Passed to every Client (retry_policy, codec, metrics, fast_models, ...)
+        """
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.scheduler = FairScheduler(concurrency_per_token)
+        self.clients: Dict[Tuple[str, str], Client] = {}
+        self._client_kwargs = kwargs
+        self._connector_settings = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "ttl_dns_cache": ttl_dns_cache,
+            "keepalive_timeout": keepalive_timeout,
+        }
+        self._session: ClientSession = None
+        self._session_loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def client(self, board_id: str, token: str) -> Client:
+        """
+        Client of a board with the token that has access to it. Created once per (board, token)
+        """
+        client = self.clients.get((board_id, token))
+        if client is None:
+            client = self.clients[(board_id, token)] = Client(
+                api_key=self.api_key, token=token, board_id=board_id, session=self._get_session,
+                rate_limiter=self.rate_limiter, scheduler=self.scheduler, **self._client_kwargs)
+        return client
+
+    def _get_session(self) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            metrics = self._client_kwargs.get("metrics")
+            self._session = make_session(**self._connector_settings,
+                                         codec=self._client_kwargs.get("codec") or default_codec(),
+                                         trace_configs=[trace_config(metrics)] if metrics is not None else None)
+            self._session_loop = loop
+        return self._session
+
+    async def aclose(self):
+        """
+        Flush write-behind updates of all clients and close the shared session
+        """
+        for client in self.clients.values():
+            await client.aclose()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Totals per token, labelled by its last 6 characters
+        """
+        result: Dict[str, dict] = {}
+        for (board_id, token), client in self.clients.items():
+            label = "..." + token[-6:]
+            totals = result.get(label)
+            if totals is None:
+                totals = result[label] = {"boards": 0, "calls": 0, "attempts": 0, "retries": 0, "giveups": 0,
+                                          "throttled": 0, "in_flight": self.scheduler.active(token),
+                                          "queued": self.scheduler.queued(token)}
+            stats = client._json_client.retry_stats
+            totals["boards"] += 1
+            totals["calls"] += sum(stats.calls.values())
+            totals["attempts"] += sum(stats.attempts.values())
+            totals["retries"] += sum(stats.retries.values())
+            totals["giveups"] += sum(stats.giveups.values())
+            totals["throttled"] += sum(statuses[429] for statuses in stats.statuses.values())
+        return result
@@ -0,0 +1,30 @@
+"""
+Priority of Trello requests: lower is served first by RateLimiter and FairScheduler.
+Set per client (TrelloJson(priority=...)) or for a block of code, including the tasks it starts:
+
+    with request_priority(INTERACTIVE):
+        await trello.create_card(list_id, name=text)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+INTERACTIVE = 0
+NORMAL = 5
+BACKGROUND = 10
+
+_priority: ContextVar[Optional[int]] = ContextVar("trello_priority", default=None)
+
+
+@contextmanager
+def request_priority(level: int):
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority(default: int = NORMAL) -> int:
+    level = _priority.get()
+    return default if level is None else level
@@ -0,0 +1,15 @@
+import functools
+from typing import Type
+
+from pydantic import BaseModel
+
+# model fields filled from webhook display entities, not returned by the REST resource
+_DISPLAY_FIELDS = frozenset(["type", "text"])
+
+
+@functools.lru_cache(maxsize=None)
+def api_fields(model: Type[BaseModel]) -> str:
+    """
+    Value of the "fields" query param with only the json names the model reads, e.g. "id,idShort,idList,..."
+    """
+    return ",".join(field.alias for name, field in model.__fields__.items() if name not in _DISPLAY_FIELDS)
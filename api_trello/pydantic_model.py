@@ -7,6 +7,9 @@ class OldState(BaseModel):
     id_list: str = Field(None, alias="idList")
     closed: bool = None
     pos: int = None
+    name: str = None
+    desc: str = None
+    due: datetime = None
 
 
 class BadgeObject(BaseModel):
@@ -77,6 +80,9 @@ class DataState(BaseModel):
     board: TrelloBoard = None
     list_before: TrelloList = Field(None, alias="listBefore")
     list_after: TrelloList = Field(None, alias="listAfter")
+    list: TrelloList = None
+    id_member: str = Field(None, alias="idMember")
+    member: Member = None
 
 
 class Model(BaseModel):
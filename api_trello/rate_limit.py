@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Mapping, Tuple
+
+from .priority import NORMAL
+
+# https://developer.atlassian.com/cloud/trello/guides/rest-api/rate-limits/
+API_KEY_LIMIT = (300, 10.0)
+API_TOKEN_LIMIT = (100, 10.0)
+
+
+class TokenBucket:
+    def __init__(self, capacity: int, interval: float):
+        """
+        :param capacity: Requests allowed per interval
+        :param interval: Interval in seconds
+        """
+        self.capacity = capacity
+        self.interval = interval
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.interval
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(float(self.capacity), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, tokens: float = 1) -> float:
+        """
+        Seconds until `tokens` are available
+        """
+        self._refill()
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+    def sync(self, capacity: int = None, interval: float = None, remaining: int = None):
+        """
+        Adjust the bucket to the quota reported by Trello
+        """
+        self._refill()
+        if capacity:
+            self.capacity = capacity
+        if interval:
+            self.interval = interval
+        if remaining is not None:
+            # other processes may share the key: the server knows better how much is left
+            self.tokens = min(self.tokens, float(remaining))
+        self.tokens = min(self.tokens, float(self.capacity))
+
+    def drain(self):
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _PriorityGate:
+    """
+    Lock handed over to the waiter with the lowest key. The holder is told when a better waiter arrives
+    """
+
+    def __init__(self):
+        self.locked = False
+        self._holder_key: float = None
+        self._preempt: asyncio.Event = None
+        self._waiters: List[tuple] = []  # heap of (key, seq, future)
+        self._seq = itertools.count()
+
+    def _hold(self, key: float):
+        self.locked = True
+        self._holder_key = key
+        self._preempt = asyncio.Event()
+
+    async def enter(self, key: float):
+        if not self.locked and not self._waiters:
+            self._hold(key)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (key, next(self._seq), waiter))
+        if self.locked and key < self._holder_key:
+            self._preempt.set()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.leave()  # handed over just before the cancellation
+            raise
+
+    def leave(self):
+        while self._waiters:
+            key, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._hold(key)
+                waiter.set_result(None)
+                return
+        self.locked = False
+        self._holder_key = None
+
+    async def sleep(self, delay: float) -> bool:
+        """
+        :return: True when woken early by a better waiter
+        """
+        try:
+            await asyncio.wait_for(self._preempt.wait(), delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class RateLimiter:
+    """
+    Token buckets per api key and per token. A request waits until both of them have capacity.
+    Waiting requests are served by priority (see priority.py); a request gains one priority level
+    per `aging` seconds of waiting. One limiter may be shared by several TrelloJson clients.
+    """
+    HEADER_PREFIXES = (("x-rate-limit-api-key-", "api-key"), ("x-rate-limit-api-token-", "api-token"))
+
+    def __init__(self, key_limit: Tuple[int, float] = API_KEY_LIMIT, token_limit: Tuple[int, float] = API_TOKEN_LIMIT,
+                 reserved: float = 0.0, aging: float = 1.0):
+        """
+        :param key_limit: (requests, seconds) per api key
+        :param token_limit: (requests, seconds) per token
+        :param reserved: Share of every bucket kept for requests of NORMAL priority and above, e.g. 0.2
+        :param aging: Seconds of waiting that raise a request by one priority level
+        """
+        self.limits = {"api-key": key_limit, "api-token": token_limit}
+        self.reserved = reserved
+        self.aging = aging
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._gates: Dict[Tuple[str, str], _PriorityGate] = {}
+
+    def bucket(self, kind: str, ident: str) -> TokenBucket:
+        bucket = self._buckets.get((kind, ident))
+        if bucket is None:
+            bucket = self._buckets[(kind, ident)] = TokenBucket(*self.limits[kind])
+        return bucket
+
+    def _buckets_for(self, api_key: str, token: str) -> Tuple[TokenBucket, TokenBucket]:
+        return self.bucket("api-key", api_key), self.bucket("api-token", token)
+
+    def _needed(self, bucket: TokenBucket, level: float) -> float:
+        if level <= NORMAL or not self.reserved:
+            return 1
+        return max(1.0, min(float(bucket.capacity), 1 + self.reserved * bucket.capacity))
+
+    async def acquire(self, api_key: str, token: str, priority: int = NORMAL):
+        """
+        Wait (without polling) until both the key and the token have capacity, then take it.
+        Requests of a lower priority value go first; those below NORMAL (e.g. BACKGROUND) leave the reserved
+        share alone until aging lifts them to NORMAL
+        """
+        gate = self._gates.get((api_key, token))
+        if gate is None:
+            gate = self._gates[(api_key, token)] = _PriorityGate()
+        buckets = self._buckets_for(api_key, token)
+        enqueued = time.monotonic()
+        # priority - waited / aging orders waiters the same way at any moment
+        key = priority + enqueued / self.aging
+        await gate.enter(key)
+        holding = True
+        try:
+            while True:
+                level = priority - (time.monotonic() - enqueued) / self.aging
+                delay = max(b.delay(self._needed(b, level)) for b in buckets)
+                if delay <= 0:
+                    break
+                if level > NORMAL:
+                    # aging may lift the request to NORMAL before the buckets fill up
+                    delay = min(delay, (level - NORMAL) * self.aging + 0.001)
+                if await gate.sleep(delay):
+                    holding = False
+                    gate.leave()
+                    await gate.enter(key)  # leaves by itself when cancelled after the handover
+                    holding = True
+            for b in buckets:
+                b.consume()
+        finally:
+            if holding:
+                gate.leave()
+
+    def update(self, api_key: str, token: str, headers: Mapping[str, str], status: int = 200):
+        """
+        Sync buckets with x-rate-limit-* response headers
+        """
+        idents = {"api-key": api_key, "api-token": token}
+        for prefix, kind in self.HEADER_PREFIXES:
+            capacity = _int_header(headers, prefix + "max")
+            interval_ms = _int_header(headers, prefix + "interval-ms")
+            remaining = _int_header(headers, prefix + "remaining")
+            if capacity is None and remaining is None:
+                continue
+            self.bucket(kind, idents[kind]).sync(
+                capacity=capacity, interval=interval_ms / 1000 if interval_ms else None, remaining=remaining)
+        if status == 429:
+            self.bucket("api-token", token).drain()
+
+
+def _int_header(headers: Mapping[str, str], name: str):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
@@ -0,0 +1,104 @@
+import random
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Iterable, Mapping, Optional
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 deadline: float = 60.0, statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 retry_unsafe: bool = False):
+        """
+        :param max_retries: Retries after the first attempt
+        :param backoff_base: Backoff of the first retry, doubled on every next one
+        :param backoff_max: Upper bound of one backoff
+        :param deadline: Seconds budget for all attempts and waits of one call
+        :param statuses: Response statuses worth another attempt
+        :param retry_unsafe: Retry non-idempotent calls (create_card, add_member, ...) too
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.retry_unsafe = retry_unsafe
+
+    def allows(self, method: str) -> bool:
+        return self.max_retries > 0 and (self.retry_unsafe or method in IDEMPOTENT_METHODS)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Full jitter exponential backoff. Retry-After of the server wins if it is given
+        """
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+class RetryStats:
+    """
+    Counters per endpoint (TrelloJson method name) to tune the policy
+    """
+
+    def __init__(self, latency_window: int = 1000):
+        self.calls = Counter()
+        self.attempts = Counter()
+        self.retries = Counter()
+        self.giveups = Counter()
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.wait_time = Counter()
+        self.latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=latency_window))
+
+    def record_attempt(self, endpoint: str, status: Optional[int]):
+        self.attempts[endpoint] += 1
+        self.statuses[endpoint][status] += 1
+
+    def record_retry(self, endpoint: str, wait: float):
+        self.retries[endpoint] += 1
+        self.wait_time[endpoint] += wait
+
+    def record_call(self, endpoint: str, latency: float, gave_up: bool = False):
+        self.calls[endpoint] += 1
+        self.latencies[endpoint].append(latency)
+        if gave_up:
+            self.giveups[endpoint] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            endpoint: {
+                "calls": self.calls[endpoint],
+                "attempts": self.attempts[endpoint],
+                "retries": self.retries[endpoint],
+                "giveups": self.giveups[endpoint],
+                "wait_time": self.wait_time[endpoint],
+                "statuses": dict(self.statuses[endpoint]),
+                "max_latency": max(self.latencies[endpoint], default=0.0),
+            }
+            for endpoint in self.calls
+        }
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Retry-After is either seconds or an HTTP date
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+
+class SingleFlight:
+    """
+    Concurrent calls with one key share one run of the coroutine. The run is a task of its own,
+    so a caller that is cancelled leaves it running for the others; it is cancelled only when
+    no caller is left.
+    """
+
+    def __init__(self):
+        # key: [task, callers waiting for it]
+        self._flights: Dict[Hashable, List] = {}
+
+    def __len__(self):
+        return len(self._flights)
+
+    def running(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def forget(self, key: Hashable):
+        """
+        Let the next call start a new run. Callers of the current one still get its result
+        """
+        self._flights.pop(key, None)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._flights)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(factory())
+            flight = self._flights[key] = [task, 0]
+            task.add_done_callback(lambda t: self._done(key, flight))
+        task = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and flight[1] == 1:
+                task.cancel()  # the last caller is gone
+            raise
+        finally:
+            flight[1] -= 1
+
+    def _done(self, key: Hashable, flight: List):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        task = flight[0]
+        if not task.cancelled():
+            task.exception()  # every caller may be gone: do not log "exception was never retrieved"
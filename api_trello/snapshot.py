@@ -0,0 +1,252 @@
+"""
+Columnar export of a board for analytics: cards, card members, lists and actions as typed column batches
+with dictionary-encoded IDs, written to Parquet or Feather. Needs pyarrow and numpy.
+"""
+import functools
+import os
+from array import array
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+
+from .client import Client, TrelloException
+
+TYPECODES = {"dict": "i", "bool": "b", "int": "q", "float": "d", "timestamp": "q"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Snapshot export needs pyarrow: pip3 install pyarrow") from None
+    return pyarrow
+
+
+def _epoch_ms(value: str) -> int:
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+
+
+class Dictionary:
+    """
+    Codes of repeated strings (list, member IDs), shared by all batches of a table
+    """
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class Column:
+    def __init__(self, kind: str, dictionary: Dictionary = None):
+        """
+        :param kind: str, dict, bool, int, float or timestamp (milliseconds since epoch, UTC)
+        """
+        self.kind = kind
+        self.dictionary = dictionary
+        self.values = [] if kind == "str" else array(TYPECODES[kind])
+        self.valid = bytearray()
+
+    def append(self, value):
+        if value is None:
+            self.values.append(None if self.kind == "str" else 0)
+            self.valid.append(0)
+            return
+        if self.kind == "dict":
+            value = self.dictionary.encode(value)
+        elif self.kind == "timestamp":
+            value = _epoch_ms(value)
+        self.values.append(value)
+        self.valid.append(1)
+
+    def to_arrow(self):
+        pa = _pyarrow()
+        import numpy as np
+        if self.kind == "str":
+            return pa.array(self.values, pa.string())
+        mask = np.frombuffer(bytes(self.valid), dtype=np.uint8) == 0
+        values = np.frombuffer(self.values, dtype=np.dtype(self.values.typecode))
+        if self.kind == "dict":
+            indices = pa.array(values, pa.int32(), mask=mask)
+            return pa.DictionaryArray.from_arrays(indices, pa.array(self.dictionary.values, pa.string()))
+        types = {"bool": pa.bool_(), "int": pa.int64(), "float": pa.float64(), "timestamp": pa.timestamp("ms", tz="UTC")}
+        if self.kind == "bool":
+            values = values.astype(bool)
+        return pa.array(values, types[self.kind], mask=mask)
+
+    def to_numpy(self):
+        """
+        Codes for dict columns (-1 is null, see Dictionary.values), NaN/NaT for missing numbers and timestamps
+        """
+        import numpy as np
+        if self.kind == "str":
+            return np.array(self.values, dtype=object)
+        valid = np.frombuffer(bytes(self.valid), dtype=np.uint8).astype(bool)
+        values = np.frombuffer(self.values, dtype=np.dtype(self.values.typecode)).copy()
+        if self.kind == "dict":
+            values[~valid] = -1
+            return values
+        if self.kind == "bool":
+            return values.astype(bool)
+        if self.kind == "timestamp":
+            values = values.astype("datetime64[ms]")
+            values[~valid] = np.datetime64("NaT")
+            return values
+        values = values.astype(np.float64)
+        values[~valid] = np.nan
+        return values
+
+
+class ColumnBatch:
+    def __init__(self, schema: Dict[str, str], dictionaries: Dict[str, Dictionary]):
+        self.columns = {name: Column(kind, dictionaries.get(name)) for name, kind in schema.items()}
+        self.rows = 0
+
+    def __len__(self):
+        return self.rows
+
+    def append(self, row: tuple):
+        for column, value in zip(self.columns.values(), row):
+            column.append(value)
+        self.rows += 1
+
+    def to_arrow(self):
+        pa = _pyarrow()
+        return pa.RecordBatch.from_arrays([c.to_arrow() for c in self.columns.values()], names=list(self.columns))
+
+    def to_numpy(self) -> dict:
+        return {name: column.to_numpy() for name, column in self.columns.items()}
+
+
+def _id(obj: dict, key: str):
+    value = obj.get(key)
+    return value.get("id") if value else None
+
+
+# table: (schema, row of a json object)
+TABLES: Dict[str, Tuple[Dict[str, str], Callable[[dict], tuple]]] = {
+    "lists": (
+        {"id": "str", "name": "str", "closed": "bool", "pos": "float"},
+        lambda lst: (lst["id"], lst.get("name"), lst.get("closed"), lst.get("pos")),
+    ),
+    "cards": (
+        {"id": "str", "id_list": "dict", "name": "str", "closed": "bool", "pos": "float", "due": "timestamp",
+         "due_complete": "bool", "date_last_activity": "timestamp"},
+        lambda card: (card["id"], card.get("idList"), card.get("name"), card.get("closed"), card.get("pos"),
+                      card.get("due"), (card.get("badges") or {}).get("dueComplete"), card.get("dateLastActivity")),
+    ),
+    "card_members": (
+        {"id_card": "dict", "id_member": "dict"},
+        lambda pair: pair,
+    ),
+    "actions": (
+        {"id": "str", "type": "dict", "date": "timestamp", "id_member_creator": "dict", "id_card": "dict",
+         "id_list": "dict", "id_list_before": "dict", "id_list_after": "dict"},
+        lambda action: (action["id"], action.get("type"), action.get("date"), action.get("idMemberCreator"),
+                        _id(action["data"], "card"), _id(action["data"], "list"),
+                        _id(action["data"], "listBefore"), _id(action["data"], "listAfter")),
+    ),
+}
+
+CARD_FIELDS = "id,idList,name,closed,pos,due,badges,dateLastActivity,idMembers"
+
+
+class SnapshotExporter:
+    """
+        exporter = SnapshotExporter(client)
+        await exporter.write_parquet("snapshots/2020-11-27")  # lists, cards, card_members, actions .parquet
+    """
+
+    def __init__(self, client: Client, board_id: str = None, batch_size: int = 10000, actions_since=None,
+                 action_filter: str = "createCard,updateCard,deleteCard,moveCardToBoard,moveCardFromBoard"):
+        """
+        :param actions_since: Only actions after this date or action ID. All of them when None
+        :param action_filter: Action types to export, "all" for everything
+        """
+        self.client = client
+        self.board_id = board_id or client.board_id
+        self.batch_size = batch_size
+        self.actions_since = actions_since
+        self.action_filter = action_filter
+        self.dictionaries = {name: {column: Dictionary() for column, kind in schema.items() if kind == "dict"}
+                             for name, (schema, _) in TABLES.items()}
+
+    def _batch(self, table: str) -> ColumnBatch:
+        return ColumnBatch(TABLES[table][0], self.dictionaries[table])
+
+    async def batches(self) -> AsyncIterator[Tuple[str, ColumnBatch]]:
+        """
+        (table name, batch) of lists, cards, card_members and actions, at most batch_size rows each
+        """
+        json_client = self.client._json_client
+        lists = await json_client.get_lists(self.board_id, filter="all")
+        if "error" in lists:
+            raise TrelloException(lists["message"])
+        batch = self._batch("lists")
+        for lst in lists:
+            batch.append(TABLES["lists"][1](lst))
+        yield "lists", batch
+
+        cards, members = self._batch("cards"), self._batch("card_members")
+        fetch = functools.partial(json_client.get_board_cards, self.board_id)
+        async for card in self.client._pages(fetch, 1000, filter="all", fields=CARD_FIELDS):
+            cards.append(TABLES["cards"][1](card))
+            for member_id in card.get("idMembers") or ():
+                members.append((card["id"], member_id))
+            if len(cards) >= self.batch_size:
+                yield "cards", cards
+                cards = self._batch("cards")
+            if len(members) >= self.batch_size:
+                yield "card_members", members
+                members = self._batch("card_members")
+        yield "cards", cards
+        yield "card_members", members
+
+        actions = self._batch("actions")
+        fetch = functools.partial(json_client.get_board_actions, self.board_id)
+        async for action in self.client._pages(fetch, 1000, since=self.actions_since, filter=self.action_filter):
+            actions.append(TABLES["actions"][1](action))
+            if len(actions) >= self.batch_size:
+                yield "actions", actions
+                actions = self._batch("actions")
+        yield "actions", actions
+
+    async def write_parquet(self, directory: str) -> Dict[str, int]:
+        """
+        One file per table, written batch by batch
+        :return: Rows per table
+        """
+        import pyarrow.parquet as pq
+        os.makedirs(directory, exist_ok=True)
+        writers, rows = {}, {}
+        try:
+            async for table, batch in self.batches():
+                record_batch = batch.to_arrow()
+                if table not in writers:
+                    writers[table] = pq.ParquetWriter(os.path.join(directory, f"{table}.parquet"), record_batch.schema)
+                writers[table].write_batch(record_batch)
+                rows[table] = rows.get(table, 0) + len(batch)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return rows
+
+    async def write_feather(self, directory: str) -> Dict[str, int]:
+        """
+        One Feather (Arrow IPC) file per table. Dictionaries are unified, so every table is held in memory once
+        """
+        pa = _pyarrow()
+        import pyarrow.feather as feather
+        os.makedirs(directory, exist_ok=True)
+        tables: Dict[str, list] = {}
+        async for table, batch in self.batches():
+            tables.setdefault(table, []).append(batch.to_arrow())
+        for table, record_batches in tables.items():
+            feather.write_feather(pa.Table.from_batches(record_batches).unify_dictionaries(),
+                                  os.path.join(directory, f"{table}.feather"))
+        return {table: sum(len(b) for b in record_batches) for table, record_batches in tables.items()}
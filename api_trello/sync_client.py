@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+
+from .client import Client
+
+# Client methods mirrored by SyncClient: coroutines become blocking calls, async iterators become iterators
+CALLS = ("get_webhooks", "del_webhook", "set_webhook", "create_card", "get_card", "get_cards", "update_card",
+         "get_lists", "get_board_cards", "add_member")
+ITERATORS = ("iter_cards", "iter_actions", "iter_lists", "iter_members", "stream_cards", "stream_lists",
+             "create_cards", "update_cards", "add_members")
+
+
+def _blocking(name: str) -> Callable:
+    @functools.wraps(getattr(Client, name))
+    def method(self, *args, **kwargs):
+        return self._run(getattr(self.client, name)(*args, **kwargs))
+    return method
+
+
+def _iterating(name: str) -> Callable:
+    @functools.wraps(getattr(Client, name))
+    def method(self, *args, **kwargs) -> Iterator:
+        async def start() -> AsyncIterator:
+            return getattr(self.client, name)(*args, **kwargs).__aiter__()
+        return self._iterate(self._run(start()))
+    method.__annotations__ = {**method.__annotations__, "return": Iterator}
+    return method
+
+
+class SyncClient:
+    """
+    Blocking Client for code that cannot await (Django views, Celery tasks). One event loop runs in a
+    background thread with one connection pool; calls are submitted to it, so any number of threads
+    may share the client and fan out concurrently:
+
+        trello = SyncClient(api_key=trello_api_key, token=trello_token, board_id=trello_board_id)
+        card = trello.get_card(card_id)
+        for card in trello.iter_cards():
+            ...
+        trello.close()
+    """
+
+    def __init__(self, timeout: float = None, **kwargs):
+        """
+        :param timeout: Seconds to wait for one call (or one item of an iterator). No limit when None
+        :param kwargs: Passed to Client (api_key, token, board_id, cache, retry_policy, ...)
+        """
+        self.timeout = timeout
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="trello-sync-client", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+        async def create() -> Client:
+            return Client(**kwargs)  # on the loop that will use it
+
+        try:
+            self.client: Client = self._run(create())
+        except BaseException:
+            self._stop()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _run(self, coro: Awaitable) -> Any:
+        if self._closed:
+            coro.close()
+            raise RuntimeError("SyncClient is closed")
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("SyncClient called from its own event loop, await the Client instead")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(self.timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def _iterate(self, items: AsyncIterator) -> Iterator:
+        try:
+            while True:
+                try:
+                    yield self._run(items.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            aclose = getattr(items, "aclose", None)
+            if aclose is not None and not self._closed:
+                self._run(aclose())  # stops the iterator's pending requests when the caller breaks early
+
+    def _stop(self):
+        self._closed = True
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Flush write-behind updates, close the session and stop the loop thread
+        """
+        if self._closed:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), self.loop).result(timeout)
+        finally:
+            self._stop()
+
+
+for _name in CALLS:
+    setattr(SyncClient, _name, _blocking(_name))
+for _name in ITERATORS:
+    setattr(SyncClient, _name, _iterating(_name))
+del _name
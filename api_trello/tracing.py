@@ -0,0 +1,97 @@
+"""
+Minimal OpenTelemetry-style tracing: spans nest through a context variable, so asyncio tasks
+started inside a span become its children without passing anything around.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("trello_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "start", "end", "status", "error")
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes or {}
+        self.start = time.time()
+        self.end: float = None
+        self.status = "OK"
+        self.error: str = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end - self.start if self.end is not None else None
+
+    def __repr__(self):
+        return f"Span({self.name!r}, {self.attributes}, status={self.status})"
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class SpanExporter:
+    """
+    Receives every finished span. Subclass to ship spans to a collector
+    """
+
+    def export(self, span: Span):
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """
+    Keeps finished spans, for tests
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+    def by_name(self, name: str) -> List[Span]:
+        return [s for s in self.spans if s.name == name]
+
+    def children(self, span: Span) -> List[Span]:
+        return [s for s in self.spans if s.parent_id == span.span_id]
+
+    def clear(self):
+        self.spans.clear()
+
+
+class Tracer:
+    """
+        exporter = InMemorySpanExporter()
+        trello = Client(api_key, token, board_id, tracer=Tracer(exporter))
+        with trello._json_client.tracer.span("handle webhook", action_id=...):
+            await trello.get_card(card_id)  # Client.get_card > http GET > parse
+    """
+
+    def __init__(self, exporter: SpanExporter = None):
+        self.exporter = exporter or SpanExporter()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "ERROR"
+            span.error = repr(e)
+            raise
+        finally:
+            span.end = time.time()
+            _current_span.reset(token)
+            self.exporter.export(span)
@@ -1,29 +1,405 @@
 import asyncio
-from typing import List, Union
-from aiohttp import ClientSession, ClientResponse
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Union
+from collections import Counter
+from aiohttp import ClientSession, ClientResponse, TCPConnector, ClientConnectionError, TraceConfig
 
 from datetime import datetime
 from loguru import logger as log
 import re
 
+from .rate_limit import RateLimiter
+from .retry import IDEMPOTENT_METHODS, RetryPolicy, RetryStats, parse_retry_after
+from .json_stream import iter_json_array
+from .codec import JsonCodec, default_codec
+from .metrics import MetricsSink, trace_config
+from .priority import NORMAL, current_priority
+from .single_flight import SingleFlight
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from .disk_cache import SqliteHttpCache
+    from .pool import FairScheduler
+
+TRELLO_BASE_URL = "https://trello.com/1"
+BATCH_SIZE = 10
+_NO_SPAN = nullcontext()
+API_KEY_RE = re.compile(r'^[0-9a-fA-F]{32}$')
+TOKEN_RE = re.compile(r'^[0-9a-fA-F]{64}$')
+ID_RE = re.compile(r'^[0-9a-fA-F]+$')
+
+
+def make_session(limit: int = 100, limit_per_host: int = 30, ttl_dns_cache: int = 300,
+                 keepalive_timeout: float = 30, codec: JsonCodec = None,
+                 trace_configs: List[TraceConfig] = None) -> ClientSession:
+    """
+    Long-lived session with a keep-alive connection pool.
+    :param limit: Total number of simultaneous connections
+    :param limit_per_host: Simultaneous connections to one host (trello.com)
+    :param ttl_dns_cache: Seconds to keep resolved DNS records
+    :param keepalive_timeout: Seconds to keep an idle connection open for reuse
+    :param codec: Encoder of request bodies, default_codec() by default
+    :param trace_configs: aiohttp tracing hooks, e.g. metrics.trace_config()
+    """
+    connector = TCPConnector(limit=limit, limit_per_host=limit_per_host, ttl_dns_cache=ttl_dns_cache,
+                             keepalive_timeout=keepalive_timeout)
+    codec = codec or default_codec()
+    return ClientSession(connector=connector, headers={"Accept": "application/json"}, json_serialize=codec.dumps,
+                         trace_configs=trace_configs)
+
+
+def _freeze(value):
+    """
+    Hashable form of request params
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
 class TrelloJson:
-    def __init__(self, api_key: str = None, token: str = None, board_id: str = None):
-        assert re.match(r'^[0-9a-fA-F]{32}$', api_key)
-        assert re.match(r'^[0-9a-fA-F]{64}$', token)
-        assert re.match(r'^[0-9a-fA-F]+$', board_id)
+    def __init__(self, api_key: str = None, token: str = None, board_id: str = None,
+                 base_url: str = TRELLO_BASE_URL, session: ClientSession = None,
+                 limit: int = 100, limit_per_host: int = 30, ttl_dns_cache: int = 300,
+                 keepalive_timeout: float = 30, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, retry_policies: Dict[str, RetryPolicy] = None,
+                 codec: JsonCodec = None, http_cache: "SqliteHttpCache" = None, coalesce: bool = True,
+                 metrics: MetricsSink = None, tracer: Tracer = None,
+                 scheduler: "FairScheduler" = None, priority: int = NORMAL):
+        """
+        :param session: Externally owned session to share between clients, or a callable returning it.
+            It is not closed by aclose()
+        :param limit, limit_per_host, ttl_dns_cache, keepalive_timeout: Settings of the own connection pool,
+            see make_session()
+        :param rate_limiter: Limiter shared with other clients of the same key/token. Own one by default
+        :param retry_policy: Retries of 429/5xx and connection errors. Only idempotent calls are retried by default
+        :param retry_policies: Policies per method name, e.g. {"create_card": RetryPolicy(retry_unsafe=True)}
+        :param codec: Json encoder/decoder, orjson or ujson when installed. An external session keeps its own encoder
+        :param http_cache: Persistent cache of GET responses, revalidated with ETag/Last-Modified
+        :param coalesce: Share one request between concurrent identical GETs. Nothing is kept after it completes
+        :param metrics: Sink of timings, counters and gauges, see metrics.py. DNS, connect and TTFB are timed
+            only on the own session
+        :param tracer: Opens a span per HTTP attempt and retry wait, children of the current span
+        :param scheduler: Limits concurrent requests per token, taking turns between boards. See ClientPool
+        :param priority: Default priority of the requests, see priority.py. `with request_priority(...)` overrides it
+        """
+        assert API_KEY_RE.match(api_key)
+        assert TOKEN_RE.match(token)
+        assert ID_RE.match(board_id)
         self.api_key = api_key
         self.token = token
         self.board_id = board_id
-        self.loop = asyncio.get_event_loop()
+        self.base_url = base_url.rstrip("/")
         self.base_json_params = {
             "key": self.api_key,
             "token": self.token,
         }
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_policies = retry_policies or {}
+        self.retry_stats = RetryStats()
+        self.codec = codec or default_codec()
+        self.http_cache = http_cache
+        self.coalesce = coalesce
+        self.coalesced_requests = 0
+        self._inflight = SingleFlight()
+        self.metrics = metrics
+        self._in_flight = Counter()
+        self.tracer = tracer
+        self.scheduler = scheduler
+        self.priority = priority
+        self._session = session
+        self._own_session = session is None
+        self._session_loop = None
+        self._connector_settings = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "ttl_dns_cache": ttl_dns_cache,
+            "keepalive_timeout": keepalive_timeout,
+        }
 
         # self.todo_list = self.board.get_list(Const_Trello_Lists.TODO)
 
         # self.MEMBER_SHRAINER = Member(client, "5d6eb04694e700834171741e")
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close the own session with all pooled connections. The session is reopened on the next call
+        """
+        if self._own_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        if self._own_session:
+            self._session = None
+
+    def _get_session(self) -> ClientSession:
+        if not self._own_session:
+            # a callable is a provider shared by many clients, e.g. ClientPool's
+            return self._session() if callable(self._session) else self._session
+        loop = asyncio.get_running_loop()
+        # a session is bound to its loop: asyncio.run() per call must not reuse a dead one
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._drop_session()
+            trace_configs = [trace_config(self.metrics)] if self.metrics is not None else None
+            self._session = make_session(**self._connector_settings, codec=self.codec, trace_configs=trace_configs)
+            self._session_loop = loop
+        return self._session
+
+    def _drop_session(self):
+        """
+        Close the own session of another loop without awaiting it here: on its loop while that one runs,
+        otherwise the connector is detached and closed, which only marks its connections closed on a dead loop
+        """
+        session, self._session = self._session, None
+        if session is None or session.closed:
+            return
+        loop = self._session_loop
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        connector = session.connector
+        session.detach()
+        connector._close()
+
+    @asynccontextmanager
+    async def _admitted(self):
+        """
+        A slot of the scheduler (fair between boards of the token), then the rate limit, both by priority
+        """
+        level = current_priority(self.priority)
+        scheduler = self.scheduler
+        if scheduler is not None:
+            await scheduler.acquire(self.token, self.board_id, level)
+        try:
+            await self.rate_limiter.acquire(self.api_key, self.token, level)
+            yield
+        finally:
+            if scheduler is not None:
+                scheduler.release(self.token)
+
+    async def _request(self, method: str, url: str, json: dict, endpoint: str = None) -> Union[dict, list]:
+        """
+        Concurrent identical GETs share one request and receive the same result object
+        :param endpoint: Name of the calling method, selects the retry policy and labels the stats
+        """
+        if not self.coalesce or method not in IDEMPOTENT_METHODS:
+            return await self._retrying(method, url, json, endpoint)
+        key = (method, url, _freeze(json))
+        if self._inflight.running(key):
+            self.coalesced_requests += 1
+        return await self._inflight.do(key, lambda: self._retrying(method, url, json, endpoint))
+
+    async def _retrying(self, method: str, url: str, json: dict, endpoint: str = None) -> Union[dict, list]:
+        endpoint = endpoint or method
+        policy = self.retry_policies.get(endpoint, self.retry_policy)
+        retryable = policy.allows(method)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            error = None
+            with self._span(f"http {method}", endpoint=endpoint, attempt=attempt) as span:
+                try:
+                    status, headers, result = await self._send(method, url, json, endpoint)
+                except (ClientConnectionError, asyncio.TimeoutError) as e:
+                    status, headers, result, error = None, {}, None, e
+                if span is not None:
+                    span.set_attribute("http.status", status)
+                    if error is not None or status >= 400:
+                        span.status, span.error = "ERROR", repr(error) if error is not None else None
+            self.retry_stats.record_attempt(endpoint, status)
+            if self.metrics is not None:
+                self.metrics.increment("responses", {"endpoint": endpoint, "status": str(status or "error")})
+
+            if not retryable or (error is None and status not in policy.statuses):
+                self._record_call(endpoint, started)
+                if error is not None:
+                    raise error
+                return result
+
+            wait = policy.backoff(attempt, parse_retry_after(headers))
+            if attempt >= policy.max_retries or time.monotonic() - started + wait > policy.deadline:
+                self._record_call(endpoint, started, gave_up=True)
+                if error is not None:
+                    raise error
+                return result
+
+            log.warning(f"Trello {endpoint}: {error or status}, retry {attempt + 1} in {wait:.2f}s")
+            self.retry_stats.record_retry(endpoint, wait)
+            if self.metrics is not None:
+                self.metrics.increment("retries", {"endpoint": endpoint})
+            with self._span("retry wait", endpoint=endpoint, wait=wait):
+                await asyncio.sleep(wait)
+            attempt += 1
+
+    def _span(self, name: str, **attributes):
+        if self.tracer is None:
+            return _NO_SPAN
+        return self.tracer.span(name, **attributes)
+
+    def _record_call(self, endpoint: str, started: float, gave_up: bool = False):
+        elapsed = time.monotonic() - started
+        self.retry_stats.record_call(endpoint, elapsed, gave_up=gave_up)
+        if self.metrics is not None:
+            self.metrics.timing("request", elapsed, {"endpoint": endpoint})
+            if gave_up:
+                self.metrics.increment("giveups", {"endpoint": endpoint})
+
+    async def _send(self, method: str, url: str, json: dict, endpoint: str = None):
+        if self.metrics is None:
+            return await self._send_once(method, url, json, endpoint)
+        tags = {"endpoint": endpoint}
+        self._in_flight[endpoint] += 1
+        self.metrics.gauge("in_flight", self._in_flight[endpoint], tags)
+        try:
+            status, headers, result = await self._send_once(method, url, json, endpoint)
+        finally:
+            self._in_flight[endpoint] -= 1
+            self.metrics.gauge("in_flight", self._in_flight[endpoint], tags)
+        for kind in ("api-key", "api-token"):
+            remaining = headers.get(f"x-rate-limit-{kind}-remaining")
+            if remaining is not None and remaining.isdigit():
+                self.metrics.gauge("rate_limit_remaining", int(remaining), {"kind": kind})
+        return status, headers, result
+
+    async def _send_once(self, method: str, url: str, json: dict, endpoint: str = None):
+        if self.http_cache is not None and method == "GET":
+            return await self._send_cached(url, json, endpoint)
+        session = self._get_session()
+        async with self._admitted(), \
+                session.request(method, url, json=json, trace_request_ctx={"endpoint": endpoint}) as response:
+            self.rate_limiter.update(self.api_key, self.token, response.headers, response.status)
+            return response.status, response.headers, await self._read(response, endpoint)
+
+    async def _read(self, response: ClientResponse, endpoint: str = None) -> Union[dict, list]:
+        if response.content_type == "text/plain":
+            return {"status": response.status, "message": await response.text(), "error": "ERROR"}
+        if self.metrics is None:
+            return await response.json(loads=self.codec.loads)
+        body = await self._download(response, endpoint)
+        return self._decode(body, endpoint) if body.strip() else None
+
+    async def _download(self, response: ClientResponse, endpoint: str = None) -> bytes:
+        if self.metrics is None:
+            return await response.read()
+        started = time.perf_counter()
+        body = await response.read()
+        self.metrics.timing("download", time.perf_counter() - started, {"endpoint": endpoint})
+        return body
+
+    def _decode(self, body: bytes, endpoint: str = None) -> Union[dict, list]:
+        if self.metrics is None:
+            return self.codec.loads(body)
+        started = time.perf_counter()
+        result = self.codec.loads(body)
+        self.metrics.timing("decode", time.perf_counter() - started, {"endpoint": endpoint})
+        return result
+
+    async def _iter_elements(self, response: ClientResponse, endpoint: str = None) -> AsyncIterator[dict]:
+        """
+        iter_json_array() of the response. With metrics, one download and one decode timing per response:
+        the time spent in the iterator minus the time in the codec, the caller's time between elements excluded
+        """
+        if self.metrics is None:
+            async for item in iter_json_array(response.content, loads=self.codec.loads):
+                yield item
+            return
+        busy = decoding = 0.0
+
+        def loads(data: str):
+            nonlocal decoding
+            started = time.perf_counter()
+            try:
+                return self.codec.loads(data)
+            finally:
+                decoding += time.perf_counter() - started
+
+        resumed = time.perf_counter()
+        try:
+            async for item in iter_json_array(response.content, loads=loads):
+                busy += time.perf_counter() - resumed
+                yield item
+                resumed = time.perf_counter()
+            busy += time.perf_counter() - resumed
+        finally:
+            tags = {"endpoint": endpoint}
+            self.metrics.timing("download", busy - decoding, tags)
+            self.metrics.timing("decode", decoding, tags)
+
+    async def _send_cached(self, url: str, json: dict, endpoint: str = None):
+        """
+        GET through the on-disk cache: a fresh copy is served without a request,
+        a stale one is revalidated with If-None-Match/If-Modified-Since and kept on 304
+        """
+        cache = self.http_cache
+        key = cache.key("GET", url, json)
+        entry = await cache.aget(key)
+        if entry is not None and cache.is_fresh(entry):
+            cache.stats["fresh"] += 1
+            return 200, {}, self._decode(entry.body, endpoint)
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        session = self._get_session()
+        async with self._admitted(), session.request("GET", url, json=json, headers=headers,
+                                                     trace_request_ctx={"endpoint": endpoint}) as response:
+            self.rate_limiter.update(self.api_key, self.token, response.headers, response.status)
+            if response.status == 304 and entry is not None:
+                cache.stats["revalidated"] += 1
+                await cache.atouch(key)
+                return 200, response.headers, self._decode(entry.body, endpoint)
+            if response.content_type == "text/plain":
+                result = {"status": response.status, "message": await response.text(), "error": "ERROR"}
+                return response.status, response.headers, result
+            body = await self._download(response, endpoint)
+            etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+            if response.status == 200 and (etag or last_modified or cache.fresh_for):
+                cache.stats["stored"] += 1
+                await cache.aput(key, etag, last_modified, body)
+            else:
+                cache.stats["uncacheable"] += 1
+            return response.status, response.headers, self._decode(body, endpoint)
+
+    async def _stream(self, method: str, url: str, json: dict, endpoint: str = None) -> AsyncIterator[dict]:
+        """
+        Elements of a json array response as they arrive. Not retried: elements may already be consumed.
+        A failed request yields one error dict: {"status": ..., "message": ..., "error": "ERROR"}
+        A caller that stops early must `aclose()` the iterator to release the connection and the rate limit slot
+        """
+        endpoint = endpoint or method
+        started = time.monotonic()
+        session = self._get_session()
+        try:
+            async with self._admitted(), \
+                    session.request(method, url, json=json, trace_request_ctx={"endpoint": endpoint}) as response:
+                self.rate_limiter.update(self.api_key, self.token, response.headers, response.status)
+                self.retry_stats.record_attempt(endpoint, response.status)
+                if self.metrics is not None:
+                    self.metrics.increment("responses", {"endpoint": endpoint, "status": str(response.status)})
+                if response.content_type == "text/plain":
+                    yield {"status": response.status, "message": await response.text(), "error": "ERROR"}
+                elif response.status >= 400:
+                    yield await response.json(loads=self.codec.loads)
+                else:
+                    elements = self._iter_elements(response, endpoint)
+                    try:
+                        async for item in elements:
+                            yield item
+                    finally:
+                        await elements.aclose()
+        finally:
+            self._record_call(endpoint, started)
+
     # # TODO: get_card_in_list
     # async def get_card(self, card_id, card_list_id):
     #     card_list = await self.loop.run_in_executor(None, self.board.get_list, card_list_id)
@@ -35,27 +411,21 @@ class TrelloJson:
         """
         Get Webhooks for Token
         """
-        url = f"https://trello.com/1/tokens/{self.token}/webhooks"
+        url = f"{self.base_url}/tokens/{self.token}/webhooks"
         json = self.base_json_params.copy()
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.get(url, json=json)
-            return await response.json()
+        return await self._request("GET", url, json, "get_webhooks")
         # return [TrelloWebHook.parse_obj(wh) for wh in response]
 
     async def del_webhook(self, wh_id: str) -> dict:  # wh: TrelloWebHook
         """
         :param wh_id: ID of the webhook to retrieve. Pattern: ^[0-9a-fA-F]{32}$
         """
-        assert re.match(r'^[0-9a-fA-F]+$', wh_id)
+        assert ID_RE.match(wh_id)
 
-        url = f"https://trello.com/1/tokens/{self.token}/webhooks/{wh_id}"
+        url = f"{self.base_url}/tokens/{self.token}/webhooks/{wh_id}"
         json = self.base_json_params.copy()
         # return await self.delete(url=url, json=json)
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.delete(url, json=json)
-            if response.content_type == "text/plain":
-                return {"status": response.status, "message": await response.text(), "error": "ERROR"}
-            return await response.json()
+        return await self._request("DELETE", url, json, "del_webhook")
 
     async def set_webhook(self, callback_url: str, description: str = "", id_model: str = None) -> dict:
         """
@@ -65,19 +435,15 @@ class TrelloJson:
         """
         if not id_model:
             id_model = self.board_id
-        assert re.match(r'^[0-9a-fA-F]+$', id_model)
-        url = f"https://trello.com/1/tokens/{self.token}/webhooks"
+        assert ID_RE.match(id_model)
+        url = f"{self.base_url}/tokens/{self.token}/webhooks"
         json = {
             **self.base_json_params.copy(),
             "description": description,
             "callbackURL": callback_url,
             "idModel": id_model
         }
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.post(url, json=json)
-            if response.content_type == "text/plain":
-                return {"status": response.status, "message": await response.text(), "error": "ERROR"}
-            return await response.json()
+        return await self._request("POST", url, json, "set_webhook")
 
 
 
@@ -96,7 +462,7 @@ class TrelloJson:
             due = str(datetime.today())
 
         today_str_hr = datetime.now().strftime("%d.%m.%Y %H:%M")
-        url = f"https://trello.com/1/cards"
+        url = f"{self.base_url}/cards"
         json = {
             **self.base_json_params.copy(),
             "name": name,
@@ -107,29 +473,25 @@ class TrelloJson:
             "pos": pos,
             **kwargs
         }
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.post(url, json=json)
-            if response.content_type == "text/plain":
-                return {"status": response.status, "message": await response.text(), "error": "ERROR"}
-            return await response.json()
+        return await self._request("POST", url, json, "create_card")
 
-    async def get_card(self, card_id: str) -> dict: #-> TrelloCard:
+    async def get_card(self, card_id: str, fields: str = "all", checklists: str = "all",
+                       custom_field_items: bool = True) -> dict: #-> TrelloCard:
         """
         :param card_id: The ID of the Card. Pattern: ^[0-9a-fA-F]{32}$
+        :param fields: all or a comma-separated list of fields
+        :param checklists: all or none
+        :param custom_field_items: Include custom field values
         """
         # assert re.match(r'^[0-9a-fA-F]+$', card_id)
-        url = f"https://trello.com/1/cards/{card_id}"
+        url = f"{self.base_url}/cards/{card_id}"
         json = {
             **self.base_json_params.copy(),
-            "fields": "all",
-            "checklists": "all",
-            "customFieldItems": True,
+            "fields": fields,
+            "checklists": checklists,
+            "customFieldItems": custom_field_items,
         }
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.get(url, json=json)
-            if response.content_type == "text/plain":
-                return {"status": response.status, "message": await response.text(), "error": "ERROR"}
-            return await response.json()
+        return await self._request("GET", url, json, "get_card")
         #return TrelloCard.parse_obj(await self.get(url=url, json=json))
 
     async def update_card(self, card_id, **kwagrs) -> dict:  # -> TrelloCard:
@@ -138,17 +500,13 @@ class TrelloJson:
         """
         # assert re.match(r'^[0-9a-fA-F]+$', card_id)
         # , title: str = None, desc: str = None
-        url = f"https://trello.com/1/cards/{card_id}"
+        url = f"{self.base_url}/cards/{card_id}"
         json = {
             **self.base_json_params.copy(),
             **kwagrs
         }
 
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.put(url, json=json)
-            if response.content_type == "text/plain":
-                return {"status": response.status, "message": await response.text(), "error": "ERROR"}
-            return await response.json()
+        return await self._request("PUT", url, json, "update_card")
         #return TrelloCard.parse_obj(await self.put(url=url, json=json))
 
         # new_title = "🔄 " + str(card_short_id) + " " + title
@@ -166,20 +524,94 @@ class TrelloJson:
         #
         # return card, lab
 
-    async def get_lists(self, **kwargs):  #-> List[TrelloList]:
-        url = f"https://trello.com/1/boards/{self.board_id}/lists"
+    async def get_lists(self, board_id: str = None, **kwargs):  #-> List[TrelloList]:
+        url = f"{self.base_url}/boards/{board_id or self.board_id}/lists"
         json = {
             **self.base_json_params.copy(),
             **kwargs
         }
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.get(url, json=json)
-            if response.content_type == "text/plain":
-                return {"status": response.status, "message": await response.text(), "error": "ERROR"}
-            return await response.json()
+        return await self._request("GET", url, json, "get_lists")
         # response = await self.get(url=url, json=json)
         # return [TrelloList.parse_obj(lst) for lst in response]
 
+    async def batch_get(self, urls: List[str]) -> List[dict]:
+        """
+        Several GETs in one round trip per 10 urls, chunks are sent concurrently
+        :param urls: API routes without version, e.g. ["/cards/5fc10d349569a54078da50fe", "/boards/{id}/lists"]
+        :return: Responses in the order of urls. A failed one is {"status": ..., "message": ..., "error": "ERROR"}
+        """
+        chunks = [urls[i:i + BATCH_SIZE] for i in range(0, len(urls), BATCH_SIZE)]
+        responses = await asyncio.gather(*(self._batch_chunk(chunk) for chunk in chunks))
+        return [item for chunk in responses for item in chunk]
+
+    async def _batch_chunk(self, urls: List[str]) -> List[dict]:
+        url = f"{self.base_url}/batch"
+        json = {
+            **self.base_json_params.copy(),
+            "urls": ",".join(urls),
+        }
+        response = await self._request("GET", url, json, "batch_get")
+        if "error" in response:
+            return [response] * len(urls)
+        return [_unwrap_batch_item(item) for item in response]
+
+    async def get_board_cards(self, board_id: str = None, **kwargs) -> list:  # -> List[TrelloCard]:
+        """
+        :param kwargs: Query params, e.g. filter="all", fields="name,idList", limit=1000, before=card_id
+        """
+        url = f"{self.base_url}/boards/{board_id or self.board_id}/cards"
+        json = {
+            **self.base_json_params.copy(),
+            **kwargs
+        }
+        return await self._request("GET", url, json, "get_board_cards")
+
+    async def get_board_actions(self, board_id: str = None, **kwargs) -> list:
+        """
+        :param kwargs: Query params, e.g. filter="updateCard", limit=1000, since=date_or_id, before=date_or_id
+        """
+        url = f"{self.base_url}/boards/{board_id or self.board_id}/actions"
+        json = {
+            **self.base_json_params.copy(),
+            **kwargs
+        }
+        return await self._request("GET", url, json, "get_board_actions")
+
+    async def get_board_members(self, board_id: str = None, **kwargs) -> list:
+        url = f"{self.base_url}/boards/{board_id or self.board_id}/members"
+        json = {
+            **self.base_json_params.copy(),
+            **kwargs
+        }
+        return await self._request("GET", url, json, "get_board_members")
+
+    def stream_board_cards(self, board_id: str = None, **kwargs) -> AsyncIterator[dict]:
+        """
+        get_board_cards() decoded card by card from the response stream
+        """
+        url = f"{self.base_url}/boards/{board_id or self.board_id}/cards"
+        json = {
+            **self.base_json_params.copy(),
+            **kwargs
+        }
+        return self._stream("GET", url, json, "stream_board_cards")
+
+    def stream_lists(self, board_id: str = None, **kwargs) -> AsyncIterator[dict]:
+        url = f"{self.base_url}/boards/{board_id or self.board_id}/lists"
+        json = {
+            **self.base_json_params.copy(),
+            **kwargs
+        }
+        return self._stream("GET", url, json, "stream_lists")
+
+    def stream_board_actions(self, board_id: str = None, **kwargs) -> AsyncIterator[dict]:
+        url = f"{self.base_url}/boards/{board_id or self.board_id}/actions"
+        json = {
+            **self.base_json_params.copy(),
+            **kwargs
+        }
+        return self._stream("GET", url, json, "stream_board_actions")
+
     async def add_member(self, card_id, value) -> Union[dict, list]:
         """
         :param card_id: The ID of the Card. Pattern: ^[0-9a-fA-F]{32}$
@@ -189,16 +621,12 @@ class TrelloJson:
         # assert re.match(r'^[0-9a-fA-F]+$', card_id)
         # assert re.match(r'^[0-9a-fA-F]+$', value)
         #
-        url = f"https://trello.com/1/cards/{card_id}/idMembers"
+        url = f"{self.base_url}/cards/{card_id}/idMembers"
         json = {
             **self.base_json_params.copy(),
             "value": value,
         }
-        async with ClientSession(headers={"Accept": "application/json"}) as c:
-            response = await c.post(url, json=json)
-            if response.content_type == "text/plain":
-                return {"status": response.status, "message": await response.text(), "error": "ERROR"}
-            return await response.json()
+        return await self._request("POST", url, json, "add_member")
         # return await self.post(url=url, json=json)
 
 
@@ -218,3 +646,11 @@ class TrelloJson:
     #         new_title = "🔄" + re.sub("[" + re.escape("🆘✅🔄" + "]"), "", card.name)
     #         await self.update_card(card.id, due_complete=False, title=new_title)
 
+
+def _unwrap_batch_item(item: dict) -> dict:
+    """
+    Trello wraps a successful item as {"200": {...}}, a failed one is {"name": ..., "message": ..., "statusCode": 404}
+    """
+    if "200" in item:
+        return item["200"]
+    return {"status": item.get("statusCode"), "message": item.get("message") or item.get("name"), "error": "ERROR"}
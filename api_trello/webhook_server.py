@@ -0,0 +1,157 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+from typing import Any, Awaitable, Callable, Optional
+
+from aiohttp import web
+from loguru import logger as log
+
+from .codec import default_codec
+from .pydantic_model import Action, TrelloUpdate
+
+
+def verify_signature(secret: str, callback_url: str, body: bytes, signature: str) -> bool:
+    """
+    X-Trello-Webhook is base64(HMAC-SHA1(app secret, body + callbackURL))
+    """
+    digest = hmac.new(secret.encode(), body + callback_url.encode(), hashlib.sha1).digest()
+    return hmac.compare_digest(base64.b64encode(digest).decode(), signature or "")
+
+
+class LazyUpdate:
+    """
+    Webhook payload with cheap access to the action type and IDs.
+    The pydantic TrelloUpdate is built only when .update is read.
+    """
+    __slots__ = ("raw", "_update")
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+        self._update = None
+
+    def _data(self, key: str) -> Optional[str]:
+        value = self.raw["action"].get("data", {}).get(key)
+        return value.get("id") if value else None
+
+    @property
+    def action_id(self) -> str:
+        return self.raw["action"]["id"]
+
+    @property
+    def action_type(self) -> str:
+        return self.raw["action"]["type"]
+
+    @property
+    def model_id(self) -> str:
+        return self.raw["model"]["id"]
+
+    @property
+    def board_id(self) -> Optional[str]:
+        return self._data("board")
+
+    @property
+    def card_id(self) -> Optional[str]:
+        return self._data("card")
+
+    @property
+    def list_before_id(self) -> Optional[str]:
+        return self._data("listBefore")
+
+    @property
+    def list_after_id(self) -> Optional[str]:
+        return self._data("listAfter")
+
+    @property
+    def update(self) -> TrelloUpdate:
+        if self._update is None:
+            self._update = TrelloUpdate.parse_obj(self.raw)
+        return self._update
+
+    @property
+    def action(self) -> Action:
+        return self.update.action
+
+
+Handler = Callable[[LazyUpdate], Awaitable[Any]]
+
+
+class WebhookReceiver:
+    """
+    aiohttp app for Trello webhooks: answers the HEAD probe, checks the signature,
+    acknowledges at once and leaves parsing and handling to a pool of workers.
+
+        receiver = WebhookReceiver(handle, secret=app_secret, callback_url="https://host/trello/wh")
+        web.run_app(receiver.app())
+    """
+
+    def __init__(self, handler: Handler, secret: str = None, callback_url: str = None, path: str = "/trello/wh",
+                 workers: int = 4, queue_size: int = 10000, loads: Callable[[bytes], Any] = None):
+        """
+        :param handler: Coroutine function called with a LazyUpdate per event
+        :param secret: Trello app secret. Signatures are not checked without it
+        :param callback_url: callbackURL the webhook was registered with, signed by Trello
+        :param queue_size: Events waiting for workers. A full queue answers 503 and Trello retries later
+        :param loads: Json decoder of payloads, default_codec().loads by default
+        """
+        self.handler = handler
+        self.secret = secret
+        self.callback_url = callback_url
+        self.path = path
+        self.workers = workers
+        self.loads = loads or default_codec().loads
+        self.queue: asyncio.Queue = None
+        self.queue_size = queue_size
+        self.received = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self._tasks = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("HEAD", self.path, self._head)
+        app.router.add_post(self.path, self._post)
+        app.on_startup.append(self._start)
+        app.on_cleanup.append(self._stop)
+        return app
+
+    async def _head(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _post(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        if self.secret is not None:
+            callback_url = self.callback_url or str(request.url)
+            if not verify_signature(self.secret, callback_url, body, request.headers.get("X-Trello-Webhook")):
+                self.rejected += 1
+                return web.Response(status=401)
+        try:
+            self.queue.put_nowait(body)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return web.Response(status=503)
+        self.received += 1
+        return web.Response()
+
+    async def _start(self, app: web.Application):
+        self.queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def _stop(self, app: web.Application):
+        await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _worker(self):
+        while True:
+            body = await self.queue.get()
+            try:
+                await self.handler(LazyUpdate(self.loads(body)))
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                log.error(f"Trello webhook handler failed: {e!r}")
+            finally:
+                self.queue.task_done()
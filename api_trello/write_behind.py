@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+
+class _Batch:
+    __slots__ = ("fields", "futures", "wake")
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.futures: List[asyncio.Future] = []
+        self.wake = asyncio.Event()
+
+
+class UpdateCoalescer:
+    """
+    Write-behind queue: field updates of one object within `window` seconds are merged into one write.
+    Every caller gets the result of that write. Writes of one object run strictly in submission order.
+
+        coalescer = UpdateCoalescer(lambda card_id, fields: json_client.update_card(card_id, **fields))
+        await asyncio.gather(coalescer.submit(card_id, {"name": "x"}), coalescer.submit(card_id, {"closed": True}))
+    """
+
+    def __init__(self, write: Callable[[Hashable, dict], Awaitable[Any]], window: float = 0.05):
+        """
+        :param write: Coroutine function called with (key, merged fields)
+        :param window: Seconds to wait for more updates of the same key after the first one
+        """
+        self.write = write
+        self.window = window
+        self.submitted = 0
+        self.writes = 0
+        self._batches: Dict[Hashable, _Batch] = {}
+        self._tails: Dict[Hashable, asyncio.Task] = {}
+        self._tasks = set()
+
+    def __len__(self):
+        return len(self._batches)
+
+    async def submit(self, key: Hashable, fields: dict):
+        """
+        Merge fields into the pending write of key. Later values of a field win
+        :return: Result of the write
+        """
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            task = asyncio.ensure_future(self._flush_later(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        batch.fields.update(fields)
+        future = asyncio.get_running_loop().create_future()
+        batch.futures.append(future)
+        self.submitted += 1
+        return await asyncio.shield(future)
+
+    async def flush(self):
+        """
+        Write all pending updates now and wait for them, e.g. before closing the client
+        """
+        for batch in self._batches.values():
+            batch.wake.set()
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _flush_later(self, key: Hashable, batch: _Batch):
+        try:
+            await asyncio.wait_for(batch.wake.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        # updates submitted from now on go to the next write, queued behind this one
+        del self._batches[key]
+        previous = self._tails.get(key)
+        current = self._tails[key] = asyncio.current_task()
+        try:
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            try:
+                result = await self.write(key, batch.fields)
+            except Exception as e:
+                for future in batch.futures:
+                    if not future.done():
+                        future.set_exception(e)
+                        future.exception()  # a cancelled caller may not retrieve it
+            else:
+                for future in batch.futures:
+                    if not future.done():
+                        future.set_result(result)
+            self.writes += 1
+        finally:
+            if self._tails.get(key) is current:
+                del self._tails[key]
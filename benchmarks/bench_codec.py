@@ -0,0 +1,44 @@
+"""
+Encode/decode time of recorded Trello payloads with every installed json codec.
+
+    python -m benchmarks.bench_codec [rounds]
+"""
+import sys
+import time
+
+from api_trello.codec import JsonCodec, OrjsonCodec, UjsonCodec
+from benchmarks.fake_trello import make_card, make_webhook_update
+
+PAYLOADS = {
+    "card": make_card("5fc10d349569a54078da50fe"),
+    "board cards (1000)": [make_card(f"5fc10d349569a54078da{i:04x}") for i in range(1000)],
+    "webhook update": make_webhook_update(),
+}
+
+
+def main(rounds: int = 200):
+    codecs = [JsonCodec()]
+    for codec in (OrjsonCodec, UjsonCodec):
+        try:
+            codecs.append(codec())
+        except ImportError:
+            print(f"{codec.name} is not installed")
+
+    for name, payload in PAYLOADS.items():
+        encoded = JsonCodec().dumps(payload).encode()
+        n = rounds if isinstance(payload, list) else rounds * 100
+        print(f"{name}, {len(encoded)} bytes:")
+        for codec in codecs:
+            start = time.perf_counter()
+            for _ in range(n):
+                codec.loads(encoded)
+            decode = (time.perf_counter() - start) / n
+            start = time.perf_counter()
+            for _ in range(n):
+                codec.dumps(payload)
+            encode = (time.perf_counter() - start) / n
+            print(f"{codec.name:>10}: loads {decode * 1e6:9.1f} us, dumps {encode * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
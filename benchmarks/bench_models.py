@@ -0,0 +1,32 @@
+"""
+Objects/sec and bytes/object of pydantic models vs fast __slots__ models on a 50k-card board.
+
+    python -m benchmarks.bench_models [cards]
+"""
+import sys
+import time
+import tracemalloc
+
+from api_trello import TrelloCard
+from api_trello.fast_model import FastTrelloCard
+from benchmarks.fake_trello import make_card
+
+
+def main(cards: int = 50000):
+    board = [make_card(f"5fc10d349569a54078{i:06x}", idMembers=["5a214fe083df8aa8c81899e8"]) for i in range(cards)]
+    for model in (TrelloCard, FastTrelloCard):
+        start = time.perf_counter()
+        parsed = [model.parse_obj(card) for card in board]
+        elapsed = time.perf_counter() - start
+        del parsed
+
+        tracemalloc.start()
+        parsed = [model.parse_obj(card) for card in board]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del parsed
+        print(f"{model.__name__:>15}: {cards / elapsed:9.0f} objects/s, {size / cards:6.0f} bytes/object")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
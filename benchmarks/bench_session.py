@@ -0,0 +1,50 @@
+"""
+Requests/sec of TrelloJson.get_card with one pooled session vs a new ClientSession per call.
+
+    python -m benchmarks.bench_session [requests] [concurrency]
+"""
+import asyncio
+import sys
+import time
+
+from aiohttp import ClientSession
+
+from api_trello import RateLimiter, TrelloJson
+from benchmarks import fake_trello
+
+
+class SessionPerCall(TrelloJson):
+    """Behaviour before the shared session: connect on every call"""
+
+    async def _request(self, method, url, json, *args, **kwargs):  # endpoint and whatever _request gains later
+        async with ClientSession(headers={"Accept": "application/json"}) as c:
+            async with c.request(method, url, json=json) as response:
+                return await response.json()
+
+
+async def run(client: TrelloJson, requests: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with sem:
+            await client.get_card(f"5fc10d349569a54078da{i:04x}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int = 2000, concurrency: int = 20):
+    runner, base_url = await fake_trello.start()
+    try:
+        for cls in (SessionPerCall, TrelloJson):
+            async with cls(api_key=fake_trello.API_KEY, token=fake_trello.TOKEN, board_id=fake_trello.BOARD_ID,
+                           base_url=base_url, rate_limiter=RateLimiter((10 ** 9, 1.0), (10 ** 9, 1.0))) as client:
+                rps = await run(client, requests, concurrency)
+            print(f"{cls.__name__:>15}: {rps:8.0f} req/s")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*map(int, sys.argv[1:])))
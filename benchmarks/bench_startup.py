@@ -0,0 +1,50 @@
+"""
+Cold-start cost: `import api_trello` and importing Client in fresh interpreters, and Client/TrelloJson
+construction time in this one.
+
+    python -m benchmarks.bench_startup [runs]
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.fake_trello import API_KEY, TOKEN, BOARD_ID
+
+IMPORTS = {
+    "import api_trello": "import api_trello",
+    "import Client": "from api_trello import Client",
+    "import FastTrelloCard": "from api_trello import FastTrelloCard",
+}
+
+
+def cold(statement: str, runs: int) -> float:
+    """
+    Median ms of a statement in a new interpreter, without the interpreter's own startup
+    """
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    return statistics.median(
+        float(subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.PIPE).stdout) * 1000
+        for _ in range(runs))
+
+
+def construct(cls, calls: int = 10000) -> float:
+    """
+    µs per constructor call
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        cls(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(runs: int = 10):
+    for name, statement in IMPORTS.items():
+        print(f"{name:>22}: {cold(statement, runs):8.1f} ms")
+    from api_trello import Client, TrelloJson
+    for cls in (TrelloJson, Client):
+        print(f"{cls.__name__ + '()':>22}: {construct(cls):8.1f} µs")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
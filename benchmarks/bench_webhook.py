@@ -0,0 +1,59 @@
+"""
+Webhook events/sec on one core: full TrelloUpdate parsing vs LazyUpdate, and through WebhookReceiver over HTTP.
+
+    python -m benchmarks.bench_webhook [events]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+
+from api_trello import TrelloUpdate
+from api_trello.webhook_server import LazyUpdate, WebhookReceiver
+from benchmarks.fake_trello import make_webhook_update
+
+
+def bench_parse(events: int):
+    body = json.dumps(make_webhook_update()).encode()
+    for name, parse in (("parse_obj", lambda b: TrelloUpdate.parse_obj(json.loads(b)).action.type),
+                        ("LazyUpdate", lambda b: LazyUpdate(json.loads(b)).action_type)):
+        start = time.perf_counter()
+        for _ in range(events):
+            parse(body)
+        print(f"{name:>15}: {events / (time.perf_counter() - start):8.0f} events/s")
+
+
+async def bench_receiver(events: int, concurrency: int = 20):
+    done = asyncio.Event()
+    handled = 0
+
+    async def handler(update: LazyUpdate):
+        nonlocal handled
+        handled += 1
+        if handled == events:
+            done.set()
+
+    receiver = WebhookReceiver(handler)
+    body = json.dumps(make_webhook_update()).encode()
+    sem = asyncio.Semaphore(concurrency)
+    async with TestServer(receiver.app()) as server, ClientSession() as session:
+        url = str(server.make_url("/trello/wh"))
+
+        async def post():
+            async with sem:
+                async with session.post(url, data=body) as response:
+                    await response.read()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post() for _ in range(events)))
+        await done.wait()
+        print(f"{'receiver':>15}: {events / (time.perf_counter() - start):8.0f} events/s")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    bench_parse(n)
+    asyncio.run(bench_receiver(min(n, 5000)))
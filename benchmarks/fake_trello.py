@@ -0,0 +1,184 @@
+"""
+Local stub of the Trello REST API for benchmarks.
+Serves generated json on the same routes as https://trello.com/1/,
+with optional latency, 429 injection, large card descriptions and big boards.
+"""
+import asyncio
+import itertools
+import random
+
+from aiohttp import web
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+
+
+def make_card(card_id: str, id_list: str = "5f43db65a1d25218690c062c", **kwargs) -> dict:
+    return {
+        "id": card_id,
+        "idShort": 427,
+        "idList": id_list,
+        "idBoard": BOARD_ID,
+        "due": "2020-11-27T19:29:08.072Z",
+        "pos": 128,
+        "name": "Card " + card_id[-4:],
+        "shortLink": "i3D9oTTF",
+        "desc": "Card Text",
+        "closed": False,
+        "idMembers": [],
+        "badges": {"dueComplete": False, "comments": 0, "attachments": 0},
+        **kwargs,
+    }
+
+
+def make_webhook_update(card_id: str = "5fc10d349569a54078da50fe") -> dict:
+    """Webhook payload of a card moved between lists"""
+    member = {"id": "5a214fe083df8aa8c81899e8", "username": "herr_horror", "fullName": "herr_horror"}
+    before = {"id": "5f43db65a1d25218690c062c", "name": "ToDo"}
+    after = {"id": "5f43db65a1d25218690c062d", "name": "Done"}
+    card = {"id": card_id, "idList": after["id"], "idShort": 427, "name": "Card", "shortLink": "i3D9oTTF"}
+    return {
+        "model": {"id": BOARD_ID, "name": "Board", "desc": "", "closed": False, "idOrganization": None},
+        "action": {
+            "id": "5fc10d349569a54078da5100",
+            "idMemberCreator": member["id"],
+            "type": "updateCard",
+            "date": "2020-11-27T14:29:08.437Z",
+            "data": {"card": card, "old": {"idList": before["id"]}, "board": {"id": BOARD_ID, "name": "Board"},
+                     "listBefore": before, "listAfter": after},
+            "display": {
+                "translationKey": "action_move_card_from_list_to_list",
+                "entities": {"card": {"type": "card", **card, "text": "Card"},
+                             "listBefore": {"type": "list", **before, "text": before["name"]},
+                             "listAfter": {"type": "list", **after, "text": after["name"]},
+                             "memberCreator": {"type": "member", **member, "text": member["fullName"]}},
+            },
+            "memberCreator": member,
+        },
+    }
+
+
+@web.middleware
+async def conditions(request: web.Request, handler) -> web.Response:
+    """
+    Latency and 429 injection configured by make_app()
+    """
+    config = request.app["config"]
+    if config["latency"]:
+        await asyncio.sleep(config["latency"])
+    if config["throttle"] and config["random"].random() < config["throttle"]:
+        return web.json_response({"error": "API_TOKEN_LIMIT_EXCEEDED", "message": "Rate limit exceeded"},
+                                 status=429, headers={"Retry-After": "0"})
+    return await handler(request)
+
+
+async def params(request: web.Request) -> dict:
+    """
+    Query string and json body: the client sends parameters of GET requests in the body
+    """
+    result = dict(request.query)
+    if request.can_read_body:
+        result.update(await request.json())
+    return result
+
+
+def _card(request: web.Request, card_id: str) -> dict:
+    return make_card(card_id, desc="x" * request.app["config"]["desc_size"])
+
+
+async def get_card(request: web.Request) -> web.Response:
+    return web.json_response(_card(request, request.match_info["card_id"]))
+
+
+async def update_card(request: web.Request) -> web.Response:
+    body = await params(request)
+    fields = {k: v for k, v in body.items() if k not in ("key", "token")}
+    return web.json_response(make_card(request.match_info["card_id"], **fields))
+
+
+async def create_card(request: web.Request) -> web.Response:
+    body = await params(request)
+    created = next(request.app["config"]["created"])
+    return web.json_response(make_card(f"5fc10d349569a5{created:010x}", id_list=body.get("idList"),
+                                       name=body.get("name", "")))
+
+
+async def get_lists(request: web.Request) -> web.Response:
+    return web.json_response([
+        {"id": f"5f43db65a1d2521869{i:06x}", "name": f"List {i}", "closed": False, "pos": 16384 * (i + 1),
+         "idBoard": BOARD_ID}
+        for i in range(request.app["config"]["lists"])
+    ])
+
+
+async def get_board_cards(request: web.Request) -> web.Response:
+    """
+    Newest first, paged with limit/before like Trello
+    """
+    query = await params(request)
+    total = request.app["config"]["cards"]
+    end = int(query["before"][-8:], 16) if query.get("before") else total
+    limit = int(query.get("limit", 1000))
+    ids = range(end - 1, max(end - limit, 0) - 1, -1)
+    return web.json_response([_card(request, f"5fc10d349569a540{i:08x}") for i in ids])
+
+
+async def batch(request: web.Request) -> web.Response:
+    urls = (await params(request))["urls"].split(",")
+    return web.json_response([{"200": _card(request, url.split("?")[0].rsplit("/", 1)[-1])} for url in urls])
+
+
+def make_app(latency: float = 0, throttle: float = 0, desc_size: int = 9, lists: int = 2, cards: int = 1000,
+             seed: int = 0) -> web.Application:
+    """
+    :param latency: Seconds added to every response
+    :param throttle: Share of requests answered with 429 and Retry-After: 0
+    :param desc_size: Length of card descriptions, for large payloads
+    :param lists: Lists on the board
+    :param cards: Cards on the board
+    """
+    app = web.Application(middlewares=[conditions])
+    app["config"] = {"latency": latency, "throttle": throttle, "desc_size": desc_size, "lists": lists,
+                     "cards": cards, "random": random.Random(seed), "created": itertools.count(1)}
+    app.router.add_get("/1/cards/{card_id}", get_card)
+    app.router.add_put("/1/cards/{card_id}", update_card)
+    app.router.add_post("/1/cards", create_card)
+    app.router.add_get("/1/boards/{board_id}/lists", get_lists)
+    app.router.add_get("/1/boards/{board_id}/cards", get_board_cards)
+    app.router.add_get("/1/batch", batch)
+    return app
+
+
+async def start(host: str = "127.0.0.1", port: int = 0, app: web.Application = None):
+    """
+    :return: runner to cleanup() and base_url to pass into TrelloJson
+    """
+    runner = web.AppRunner(app or make_app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://{host}:{port}/1"
+
+
+async def serve(**settings):
+    runner, base_url = await start(app=make_app(**settings))
+    print(base_url, flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_trello",
+                                     description="Serve the fake Trello API and print its base url")
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--throttle", type=float, default=0)
+    parser.add_argument("--desc-size", type=int, default=9)
+    parser.add_argument("--lists", type=int, default=2)
+    parser.add_argument("--cards", type=int, default=1000)
+    asyncio.run(serve(**vars(parser.parse_args())))
@@ -0,0 +1,282 @@
+"""
+Benchmark scenarios against the local fake Trello server: requests/sec, p50/p99 latency, peak RSS and
+peak traced memory per call. Every scenario runs in its own process, so peak RSS is its own, and the server
+runs in another one, so its CPU time is not counted.
+Save results with --json and pass them to --compare on another version.
+
+Scenarios mixed_priority and mixed_fifo also report the p99 of the interactive lane under a background flood.
+
+    python -m benchmarks.run [--scenario get_card bulk_read ...] [--calls 2000] [--concurrency 20]
+                             [--latency 0.005] [--throttle 0.05] [--desc-size 10000] [--lists 5000]
+                             [--json results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+
+from loguru import logger as log
+
+from api_trello import BACKGROUND, INTERACTIVE, NORMAL, Client, RateLimiter, RetryPolicy, TrelloUpdate, request_priority
+from api_trello.bulk import run_bounded
+from benchmarks import fake_trello
+
+# scenario name: (coroutine function (client, calls, concurrency) -> latencies or Timings, fake server settings)
+SCENARIOS: Dict[str, tuple] = {}
+
+
+class Timings(NamedTuple):
+    latencies: List[float]  # of every call
+    interactive: List[float] = None  # of the interactive lane, when the scenario has one
+
+
+def scenario(**server):
+    def register(func: Callable):
+        SCENARIOS[func.__name__] = (func, server)
+        return func
+    return register
+
+
+def card_id(i: int) -> str:
+    return f"5fc10d349569a540{i:08x}"
+
+
+async def bounded(call: Callable, calls: int, concurrency: int) -> List[float]:
+    """
+    call(i) for i in range(calls), at most concurrency at a time
+    :return: Latency of every call
+    """
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with sem:
+            start = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return latencies
+
+
+@scenario()
+async def get_card(client: Client, calls: int, concurrency: int) -> List[float]:
+    return await bounded(lambda i: client.get_card(card_id(i)), calls, concurrency)
+
+
+@scenario()
+async def bulk_read(client: Client, calls: int, concurrency: int) -> List[float]:
+    """
+    One call reads 100 cards with batch requests
+    """
+    return await bounded(lambda i: client.get_cards([card_id(i * 100 + j) for j in range(100)]),
+                         max(1, calls // 100), concurrency)
+
+
+@scenario()
+async def bulk_create(client: Client, calls: int, concurrency: int) -> List[float]:
+    """
+    create_cards(), with every create_card timed
+    """
+    specs = ({"id_list": "5f43db65a1d25218690c062c", "name": f"Card {i}"} for i in range(calls))
+    latencies = []
+
+    async def create(spec):
+        start = time.perf_counter()
+        card = await client.create_card(**spec)
+        latencies.append(time.perf_counter() - start)
+        return card
+
+    async for r in run_bounded(create, specs, concurrency):
+        if not r.ok:
+            raise r.error
+    return latencies
+
+
+@scenario(lists=5000)
+async def big_board_lists(client: Client, calls: int, concurrency: int) -> List[float]:
+    """
+    One call reads all lists of a board with 5000 lists
+    """
+    return await bounded(lambda i: client.get_lists(), max(1, calls // 100), concurrency)
+
+
+async def mixed(client: Client, calls: int, concurrency: int, background: int, interactive: int,
+                reserved: float) -> Timings:
+    """
+    A background sync floods a limit of 1000 requests/sec while a user creates a card every 10 ms
+    """
+    client._json_client.rate_limiter = RateLimiter(key_limit=(10 ** 9, 1.0), token_limit=(100, 0.1),
+                                                   reserved=reserved)
+
+    async def sync():
+        with request_priority(background):
+            return await bounded(lambda i: client.get_card(card_id(i)), calls, concurrency)
+
+    async def user(i):
+        await asyncio.sleep(i * 0.01)
+        with request_priority(interactive):
+            start = time.perf_counter()
+            await client.create_card("5f43db65a1d25218690c062c", name=f"Card {i}")
+            return time.perf_counter() - start
+
+    flood = asyncio.ensure_future(sync())
+    interactive = list(await asyncio.gather(*(user(i) for i in range(max(1, calls // 20)))))
+    return Timings(await flood + interactive, interactive)
+
+
+@scenario()
+async def mixed_priority(client: Client, calls: int, concurrency: int) -> Timings:
+    """
+    Interactive p99 with priority lanes and 20% reserved capacity
+    """
+    return await mixed(client, calls, concurrency, BACKGROUND, INTERACTIVE, reserved=0.2)
+
+
+@scenario()
+async def mixed_fifo(client: Client, calls: int, concurrency: int) -> Timings:
+    """
+    The same traffic without priorities, first come first served
+    """
+    return await mixed(client, calls, concurrency, NORMAL, NORMAL, reserved=0)
+
+
+@scenario()
+async def webhook_parse(client: Client, calls: int, concurrency: int) -> List[float]:
+    """
+    Decode and fully parse webhook payloads, no network
+    """
+    body = json.dumps(fake_trello.make_webhook_update()).encode()
+    loads = client._json_client.codec.loads
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        TrelloUpdate.parse_obj(loads(body))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else 0.0
+
+
+def peak_rss_mib() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / (1024 if sys.platform == "darwin" else 1)  # bytes on macOS, KiB elsewhere
+
+
+def start_server(args: argparse.Namespace, settings: dict):
+    """
+    Fake Trello in a separate process
+    :return: process to terminate() and its base url
+    """
+    settings = {"latency": args.latency, "throttle": args.throttle, "desc_size": args.desc_size,
+                "lists": args.lists, **settings}
+    argv = [f"--{key.replace('_', '-')}={value}" for key, value in settings.items()]
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.fake_trello", *argv], stdout=subprocess.PIPE)
+    return process, process.stdout.readline().decode().strip()
+
+
+async def measure(name: str, args: argparse.Namespace) -> dict:
+    func, settings = SCENARIOS[name]
+    server, base_url = start_server(args, settings)
+    # the fake server does not enforce Trello quotas; coalescing would merge the identical get_lists calls
+    unlimited = RateLimiter(key_limit=(10 ** 9, 1.0), token_limit=(10 ** 9, 1.0))
+    try:
+        async with Client(api_key=fake_trello.API_KEY, token=fake_trello.TOKEN, board_id=fake_trello.BOARD_ID,
+                          base_url=base_url, rate_limiter=unlimited, coalesce=False,
+                          retry_policy=RetryPolicy(max_retries=20, retry_unsafe=True)) as client:
+            await func(client, max(1, args.calls // 10), args.concurrency)  # warm up connections and caches
+
+            start = time.perf_counter()
+            timings = _timings(await func(client, args.calls, args.concurrency))
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            traced_calls = len(_timings(await func(client, max(1, args.calls // 10), args.concurrency)).latencies)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = timings.latencies
+    return {
+        "scenario": name,
+        "calls": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "interactive_p99_ms": percentile(timings.interactive, 0.99) * 1000 if timings.interactive else None,
+        "peak_rss_mib": peak_rss_mib(),
+        "peak_kib_per_call": peak / 1024 / traced_calls,
+    }
+
+
+def _timings(result) -> Timings:
+    return result if isinstance(result, Timings) else Timings(result)
+
+
+def run_isolated(name: str, args: argparse.Namespace) -> dict:
+    argv = [f"--calls={args.calls}", f"--concurrency={args.concurrency}", f"--latency={args.latency}",
+            f"--throttle={args.throttle}", f"--desc-size={args.desc_size}", f"--lists={args.lists}"]
+    output = subprocess.run([sys.executable, "-m", "benchmarks.run", "--child", name, *argv],
+                            check=True, stdout=subprocess.PIPE).stdout
+    return json.loads(output.decode().splitlines()[-1])
+
+
+def report(results: List[dict], baseline: List[dict] = None):
+    base = {r["scenario"]: r for r in baseline or []}
+    print(f"{'scenario':>16} {'calls':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'UI p99 ms':>9} {'RSS MiB':>8} "
+          f"{'peak KiB/call':>13}")
+    for r in results:
+        interactive = f"{r['interactive_p99_ms']:>9.2f}" if r.get("interactive_p99_ms") is not None else f"{'-':>9}"
+        line = (f"{r['scenario']:>16} {r['calls']:>7} {r['rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+                f"{interactive} {r['peak_rss_mib']:>8.1f} {r['peak_kib_per_call']:>13.2f}")
+        old = base.get(r["scenario"])
+        if old:
+            line += f"   req/s {r['rps'] / old['rps'] - 1:+.0%}, p99 {r['p99_ms'] / old['p99_ms'] - 1:+.0%}"
+        print(line)
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0, help="seconds added by the fake server")
+    parser.add_argument("--throttle", type=float, default=0, help="share of requests answered with 429")
+    parser.add_argument("--desc-size", type=int, default=9, help="characters of every card description")
+    parser.add_argument("--lists", type=int, default=2, help="lists on the board")
+    parser.add_argument("--json", help="save results to this file")
+    parser.add_argument("--compare", help="results of another version saved with --json")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    args = parse_args(argv)
+    if args.child:
+        log.disable("api_trello")  # retry warnings of --throttle
+        print(json.dumps(asyncio.run(measure(args.child, args))))
+        return
+
+    results = [run_isolated(name, args) for name in args.scenario]
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
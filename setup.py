@@ -30,7 +30,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/DmitriyKalekin/python-trello-api",
-    packages=find_packages(exclude=['contrib', 'docs', 'tests']),
+    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'benchmarks']),
     keywords='pydantic trello rest api sdk client',
     classifiers=[
         # "Development Status :: 3 - Alpha",
@@ -43,6 +43,8 @@ setup(
     install_requires=read_requirements(),
     extras_require={
         "test": read_requirements("requirements-dev.txt"),
+        "fast": ["orjson>=3.4"],
+        "snapshot": ["pyarrow>=2.0", "numpy>=1.17"],
     },
     python_requires='>=3.7, <4',
     project_urls={
@@ -16,17 +16,19 @@ def mock_aioresponse():
         yield m
 
 @pytest.fixture(scope="module")
-def client_trello_json():
+def client_trello_json(event_loop):
     client = TrelloJson(
         api_key="aaaaaaaaaa1234567890AAAAAAAAAA00",
         token="cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11",
         board_id="bbbbbbbbbb1234567890BBBBBBBBBB00")
     yield client
+    event_loop.run_until_complete(client.aclose())
 
 @pytest.fixture(scope="module")
-def client():
+def client(event_loop):
     client = Client(
         api_key="aaaaaaaaaa1234567890AAAAAAAAAA00",
         token="cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11",
         board_id="bbbbbbbbbb1234567890BBBBBBBBBB00")
-    yield client
\ No newline at end of file
+    yield client
+    event_loop.run_until_complete(client.aclose())
@@ -0,0 +1,9 @@
+import pytest
+from benchmarks import bench_session
+
+
+@pytest.mark.asyncio
+async def test_bench_session_runs(capsys):
+    await bench_session.main(requests=20, concurrency=5)
+
+    assert [line.split(":")[0].strip() for line in capsys.readouterr().out.splitlines()] == ["SessionPerCall", "TrelloJson"]
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from aioresponses import CallbackResult
+from api_trello import TrelloCard, TrelloException, Member
+from api_trello.bulk import run_bounded
+
+
+@pytest.mark.asyncio
+async def test_run_bounded_limits_concurrency():
+    in_flight = max_in_flight = 0
+
+    async def call(spec):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if spec % 5 == 0:
+            raise ValueError(spec)
+        return spec * 2
+
+    async def specs():
+        for i in range(20):
+            yield i
+
+    progress = []
+    results = [r async for r in run_bounded(call, specs(), concurrency=3, on_progress=lambda *p: progress.append(p))]
+
+    assert max_in_flight == 3
+    assert sorted(r.index for r in results) == list(range(20))
+    assert all(r.result == r.spec * 2 for r in results if r.ok)
+    assert sorted(r.spec for r in results if not r.ok) == [0, 5, 10, 15]
+    assert progress[-1] == (20, 4)
+
+
+@pytest.mark.asyncio
+async def test_run_bounded_source_error():
+    def specs():
+        yield 1
+        raise RuntimeError("broken source")
+
+    async def call(spec):
+        return spec
+
+    results = []
+    with pytest.raises(RuntimeError):
+        async for r in run_bounded(call, specs(), concurrency=2):
+            results.append(r)
+    assert [r.result for r in results] == [1]
+
+
+@pytest.mark.asyncio
+async def test_run_bounded_waits_for_slow_consumer():
+    calls = 0
+
+    async def call(spec):
+        nonlocal calls
+        calls += 1
+        return spec
+
+    results = run_bounded(call, range(100), concurrency=2)
+    await results.__anext__()
+    await asyncio.sleep(0.01)
+    # one taken, two queued, two more held by the workers
+    assert calls == 5
+    await results.aclose()
+
+
+@pytest.mark.asyncio
+async def test_create_cards(client, mock_aioresponse):
+    def create_callback(url, **kwargs):
+        if not kwargs["json"]["idList"]:
+            return CallbackResult(status=400, content_type="text/plain", body="invalid value for idList")
+        return CallbackResult(payload={"id": "5fc10d349569a54078da50fe", "name": kwargs["json"]["name"]})
+    mock_aioresponse.post("https://trello.com/1/cards", callback=create_callback, repeat=True)
+    specs = [{"id_list": "5f43db65a1d25218690c062c", "name": f"Card {i}"} for i in range(5)] + [{"id_list": "", "name": "Broken"}]
+
+    results = [r async for r in client.create_cards(specs, concurrency=2)]
+
+    assert len(results) == 6
+    assert sorted(r.result.name for r in results if r.ok) == [f"Card {i}" for i in range(5)]
+    failed = [r for r in results if not r.ok]
+    assert failed[0].spec["name"] == "Broken"
+    assert type(failed[0].error) == TrelloException
+
+
+@pytest.mark.asyncio
+async def test_update_cards(client, mock_aioresponse):
+    card_id = "5fc10d349569a54078da50fe"
+    mock_aioresponse.put(f"https://trello.com/1/cards/{card_id}", callback=lambda url, **kwargs: CallbackResult(payload={"id": card_id, "name": kwargs["json"]["name"]}))
+
+    results = [r async for r in client.update_cards([{"card_id": card_id, "name": "New name card"}])]
+
+    assert results[0].result == TrelloCard(id=card_id, name="New name card")
+
+
+@pytest.mark.asyncio
+async def test_add_members(client, mock_aioresponse):
+    card_id, member_id = "5fc10d349569a54078da50fe", "5a214fe083df8aa8c81899e8"
+    mock_aioresponse.post(f"https://trello.com/1/cards/{card_id}/idMembers", payload=[{"id": member_id, "username": "herr_horror"}])
+
+    results = [r async for r in client.add_members([(card_id, member_id)])]
+
+    assert results[0].result == [Member(id=member_id, username="herr_horror")]
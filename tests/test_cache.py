@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from aioresponses import CallbackResult
+from api_trello import Client, ResponseCache, TrelloCard, TrelloException
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+CARD_ID = "5fc10d349569a54078da50fe"
+
+
+@pytest.fixture
+def cached_client(event_loop):
+    client = Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, cache=ResponseCache())
+    yield client
+    event_loop.run_until_complete(client.aclose())
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.put("card", 1, {"id": 1})
+    cache.put("card", 2, {"id": 2})
+    cache.get("card", 1)
+    cache.put("card", 3, {"id": 3})
+
+    assert cache.get("card", 2) is None
+    assert cache.get("card", 1) == {"id": 1}
+    assert cache.evictions == 1
+
+
+def test_memory_cap():
+    cache = ResponseCache(max_bytes=2000)
+    for i in range(10):
+        cache.put("card", i, {"id": i, "desc": "x" * 500})
+
+    assert 0 < len(cache) < 10
+    assert cache.size <= 2000
+
+
+def test_ttl_expiry():
+    cache = ResponseCache(ttl={"card": 0})
+    cache.put("card", 1, {"id": 1})
+
+    assert cache.get("card", 1) is None
+
+
+@pytest.mark.asyncio
+async def test_get_card_is_cached_and_invalidated(cached_client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", payload={"id": CARD_ID, "name": "Old"})
+    mock_aioresponse.put(f"https://trello.com/1/cards/{CARD_ID}", payload={"id": CARD_ID, "name": "New"})
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", payload={"id": CARD_ID, "name": "New"})
+
+    first = await cached_client.get_card(CARD_ID)
+    second = await cached_client.get_card(CARD_ID)
+    await cached_client.update_card(CARD_ID, name="New")
+    third = await cached_client.get_card(CARD_ID)
+
+    assert first == second == TrelloCard(id=CARD_ID, name="Old")
+    assert third == TrelloCard(id=CARD_ID, name="New")
+    assert cached_client.cache.stats()["hits"] == {"card": 1}
+    assert cached_client.cache.stats()["misses"] == {"card": 2}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_request(cached_client, mock_aioresponse):
+    calls = 0
+
+    async def callback(url, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return CallbackResult(payload=[{"id": "5f43db65a1d25218690c062c", "name": "ToDo"}])
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", callback=callback, repeat=True)
+
+    responses = await asyncio.gather(*(cached_client.get_lists() for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == responses[0] for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(cached_client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", status=404, content_type="text/plain", body="card not found")
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", payload={"id": CARD_ID})
+
+    with pytest.raises(TrelloException):
+        await cached_client.get_card(CARD_ID)
+    response = await cached_client.get_card(CARD_ID)
+
+    assert response == TrelloCard(id=CARD_ID)
+
+
+@pytest.mark.asyncio
+async def test_load_in_flight_during_invalidate_is_not_stored():
+    cache = ResponseCache()
+    release = asyncio.Event()
+
+    async def old_card():
+        await release.wait()
+        return {"name": "old"}
+
+    load = asyncio.ensure_future(cache.get_or_load("card", "c1", old_card))
+    await asyncio.sleep(0)
+    cache.invalidate("card", "c1")  # update_card finished while the load was in flight
+    release.set()
+
+    assert await load == {"name": "old"}
+    assert cache.get("card", "c1") is None
+    assert await cache.get_or_load("card", "c1", lambda: asyncio.sleep(0, {"name": "new"})) == {"name": "new"}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    cache = ResponseCache()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return {"name": "card"}
+
+    leader = asyncio.ensure_future(cache.get_or_load("card", "c1", load))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(cache.get_or_load("card", "c1", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == {"name": "card"}
+    assert leader.cancelled()
+    assert cache.get("card", "c1") == {"name": "card"}
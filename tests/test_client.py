@@ -1,5 +1,7 @@
 import pytest
+from aioresponses import CallbackResult
 from api_trello import TrelloWebHook, TrelloException, TrelloCard, TrelloList, Member
+from api_trello.projection import api_fields
 
 
 @pytest.mark.parametrize(
@@ -207,4 +209,187 @@ async def test_add_member(client, mock_aioresponse, status, card_id, memder_id,
     response = await client.add_member(card_id, memder_id)
     correct_answer = [Member.parse_obj(m) for m in response_payload]
     assert type(response) == list
-    assert response == correct_answer
\ No newline at end of file
+    assert response == correct_answer
+
+@pytest.mark.asyncio
+async def test_get_cards(client, mock_aioresponse):
+    card_ids = [f"5fc10d349569a54078da{i:04x}" for i in range(12)]
+    mock_aioresponse.get("https://trello.com/1/batch", payload=[{"200": {"id": card_id, "name": "Card"}} for card_id in card_ids[:10]])
+    mock_aioresponse.get("https://trello.com/1/batch", payload=[{"200": {"id": card_id, "name": "Card"}} for card_id in card_ids[10:]])
+
+    response = await client.get_cards(card_ids)
+
+    assert response == [TrelloCard(id=card_id, name="Card") for card_id in card_ids]
+
+
+@pytest.mark.asyncio
+async def test_get_cards_invalid(client, mock_aioresponse):
+    payload = [{"200": {"id": "5fc10d349569a54078da50fe"}}, {"name": "NotFound", "message": "card not found", "statusCode": 404}]
+    mock_aioresponse.get("https://trello.com/1/batch", payload=payload)
+    mock_aioresponse.get("https://trello.com/1/batch", payload=payload)
+
+    with pytest.raises(TrelloException) as e:
+        await client.get_cards(["5fc10d349569a54078da50fe", "12312321"])
+    response = await client.get_cards(["5fc10d349569a54078da50fe", "12312321"], return_exceptions=True)
+
+    assert str(e.value) == "card not found"
+    assert response[0] == TrelloCard(id="5fc10d349569a54078da50fe")
+    assert type(response[1]) == TrelloException
+
+
+BOARD_CARDS = [{"id": f"5fc10d349569a54078da{i:04x}", "name": f"Card {i}"} for i in range(25)]
+
+
+def paged_callback(items):
+    """Trello paging: newest first, `limit` items older than `before`"""
+    def callback(url, **kwargs):
+        json = kwargs["json"]
+        older = [item for item in sorted(items, key=lambda i: i["id"], reverse=True)
+                 if "before" not in json or item["id"] < json["before"]]
+        return CallbackResult(payload=older[:json["limit"]])
+    return callback
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+@pytest.mark.asyncio
+async def test_iter_cards(client, mock_aioresponse, prefetch):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/cards", callback=paged_callback(BOARD_CARDS), repeat=True)
+
+    response = [card async for card in client.iter_cards(page_size=10, prefetch=prefetch)]
+
+    assert sorted(card.id for card in response) == [card["id"] for card in BOARD_CARDS]
+    assert type(response[0]) == TrelloCard
+
+
+@pytest.mark.asyncio
+async def test_iter_actions(client, mock_aioresponse):
+    actions = [{"id": f"5fc10d349569a54078db{i:04x}", "type": "updateCard", "date": "2020-11-27T14:29:08.437Z",
+                "data": {}, "display": {"translationKey": "action_renamed_card", "entities": {}}} for i in range(5)]
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/actions", callback=paged_callback(actions), repeat=True)
+
+    response = [action async for action in client.iter_actions(before="5fc10d349569a54078db0004", page_size=2)]
+
+    assert [action.id for action in response] == [a["id"] for a in reversed(actions[:4])]
+
+
+@pytest.mark.asyncio
+async def test_iter_cards_page_size_over_trello_limit(client, mock_aioresponse):
+    cards = [{"id": f"5fc10d349569a54078dc{i:04x}", "name": f"Card {i}"} for i in range(2500)]
+    limits = []
+
+    def callback(url, **kwargs):
+        limits.append(kwargs["json"]["limit"])
+        kwargs["json"]["limit"] = min(kwargs["json"]["limit"], 1000)  # Trello caps the limit
+        return paged_callback(cards)(url, **kwargs)
+
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/cards", callback=callback, repeat=True)
+
+    response = [card async for card in client.iter_cards(page_size=2000)]
+
+    assert len(response) == 2500
+    assert limits == [1000, 1000, 1000]
+
+
+@pytest.mark.asyncio
+async def test_iter_cards_invalid(client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/cards", status=400, content_type="text/plain", body="invalid value for filter")
+
+    with pytest.raises(TrelloException) as e:
+        [card async for card in client.iter_cards(filter="unknown")]
+
+    assert str(e.value) == "invalid value for filter"
+
+
+@pytest.mark.asyncio
+async def test_iter_members(client, mock_aioresponse):
+    members = [{"id": "5a214fe083df8aa8c81899e8", "username": "herr_horror", "fullName": "herr_horror"}]
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/members", payload=members)
+
+    response = [member async for member in client.iter_members()]
+
+    assert response == [Member.parse_obj(m) for m in members]
+
+
+@pytest.mark.asyncio
+async def test_stream_cards(client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/cards", payload=BOARD_CARDS)
+
+    response = [card async for card in client.stream_cards()]
+
+    assert response == [TrelloCard.parse_obj(card) for card in BOARD_CARDS]
+
+
+@pytest.mark.asyncio
+async def test_stream_stopped_early_is_recorded(client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/cards", payload=BOARD_CARDS)
+    stats = client._json_client.retry_stats
+    calls = stats.calls["stream_board_cards"]
+
+    items = client._json_client.stream_board_cards()
+    async for _ in items:
+        break
+    await items.aclose()
+
+    assert stats.calls["stream_board_cards"] == calls + 1
+
+
+@pytest.mark.asyncio
+async def test_stream_lists_invalid(client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/lists", status=401, content_type="text/plain", body="invalid token")
+
+    with pytest.raises(TrelloException) as e:
+        [lst async for lst in client.stream_lists()]
+
+    assert str(e.value) == "invalid token"
+
+
+@pytest.mark.parametrize(
+    "kwargs, answer", [
+        [{}, {"fields": "id,idShort,idList,due,pos,name,shortLink,desc,closed,idMembers,badges", "checklists": "none", "customFieldItems": False}],
+        [{"fields": "all", "checklists": "all"}, {"fields": "all", "checklists": "all", "customFieldItems": False}],
+    ])
+@pytest.mark.asyncio
+async def test_get_card_projection(client, mock_aioresponse, kwargs, answer):
+    card_id = "5fc10d349569a54078da50fe"
+    sent = {}
+
+    def callback(url, **kw):
+        sent.update(kw["json"])
+        return CallbackResult(payload={"id": card_id})
+    mock_aioresponse.get(f"https://trello.com/1/cards/{card_id}", callback=callback)
+
+    await client.get_card(card_id, **kwargs)
+
+    assert {k: sent[k] for k in answer} == answer
+
+
+@pytest.mark.asyncio
+async def test_get_cards_projection(client, mock_aioresponse):
+    sent = {}
+
+    def callback(url, **kw):
+        sent.update(kw["json"])
+        return CallbackResult(payload=[{"200": {"id": "5fc10d349569a54078da50fe"}}])
+    mock_aioresponse.get("https://trello.com/1/batch", callback=callback)
+
+    await client.get_cards(["5fc10d349569a54078da50fe"], fields="name,idList")
+
+    assert sent["urls"] == "/cards/5fc10d349569a54078da50fe?fields=name%2CidList"
+
+
+@pytest.mark.parametrize("fields, expected", [
+    [None, api_fields(TrelloCard)],
+    ["all", "all"],
+])
+@pytest.mark.asyncio
+async def test_get_board_cards_projection(client, mock_aioresponse, fields, expected):
+    sent = {}
+
+    def callback(url, **kw):
+        sent.update(kw["json"])
+        return CallbackResult(payload=[{"id": "5fc10d349569a54078da50fe"}])
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client.board_id}/cards", callback=callback)
+
+    await client.get_board_cards(fields=fields, filter="open")
+
+    assert sent["fields"] == expected and sent["filter"] == "open"
@@ -0,0 +1,53 @@
+import pytest
+from api_trello import TrelloJson, JsonCodec, default_codec
+from api_trello.codec import OrjsonCodec, UjsonCodec
+
+PAYLOAD = {"id": "5fc10d349569a54078da50fe", "name": "Новая задача", "pos": 16384.5, "closed": False, "idMembers": [], "due": None}
+
+
+def available_codecs():
+    codecs = [JsonCodec()]
+    for codec in (OrjsonCodec, UjsonCodec):
+        try:
+            codecs.append(codec())
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda c: c.name)
+def test_round_trip(codec):
+    encoded = codec.dumps(PAYLOAD)
+
+    assert type(encoded) == str
+    assert codec.loads(encoded) == PAYLOAD
+    assert codec.loads(encoded.encode()) == PAYLOAD
+
+
+def test_default_codec():
+    json, *fast = available_codecs()
+
+    assert default_codec().name == (fast[0] if fast else json).name
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.decoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return super().loads(data)
+
+
+@pytest.mark.asyncio
+async def test_trello_json_decodes_with_codec(mock_aioresponse):
+    codec = CountingCodec()
+    async with TrelloJson(api_key="aaaaaaaaaa1234567890AAAAAAAAAA00",
+                          token="cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11",
+                          board_id="bbbbbbbbbb1234567890BBBBBBBBBB00", codec=codec) as client_trello_json:
+        mock_aioresponse.get(f"https://trello.com/1/cards/{PAYLOAD['id']}", payload=PAYLOAD)
+
+        response = await client_trello_json.get_card(PAYLOAD["id"])
+
+    assert response == PAYLOAD
+    assert codec.decoded == 1
@@ -0,0 +1,133 @@
+import pytest
+from aioresponses import CallbackResult
+from api_trello import CheckpointStore, Client, DeltaSync, JsonCheckpointStore, MemoryCheckpointStore
+from api_trello.fast_model import FastTrelloCard
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+TODO, DONE = "5f43db65a1d25218690c062c", "5f43db65a1d25218690c062e"
+CARD_ID = "5fc10d349569a54078da50fe"
+LISTS = [{"id": TODO, "name": "ToDo", "closed": False, "pos": 16384}, {"id": DONE, "name": "Done", "closed": False, "pos": 32768}]
+CARDS = [{"id": CARD_ID, "idList": TODO, "name": "Card", "pos": 128, "closed": False, "idMembers": []}]
+ACTIONS_URL = f"https://trello.com/1/boards/{BOARD_ID}/actions"
+
+
+def make_action(n: int, action_type: str, data: dict) -> dict:
+    return {
+        "id": f"5fc10d349569a54078da{n:04x}",
+        "idMemberCreator": "5a214fe083df8aa8c81899e8",
+        "type": action_type,
+        "date": "2020-11-27T14:29:08.437Z",
+        "data": {"board": {"id": BOARD_ID, "name": "Board"}, **data},
+        "display": {"translationKey": "action_" + action_type, "entities": {}},
+    }
+
+
+def actions_callback(actions: list):
+    """Trello actions: newest first, newer than `since`, older than `before`"""
+    def callback(url, **kwargs):
+        json = kwargs["json"]
+        items = [a for a in sorted(actions, key=lambda a: a["id"], reverse=True)
+                 if a["id"] > json.get("since", "") and ("before" not in json or a["id"] < json["before"])]
+        return CallbackResult(payload=items[:json["limit"]])
+    return callback
+
+
+def mock_board(mock_aioresponse, actions: list):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", payload=LISTS, repeat=True)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=CARDS, repeat=True)
+    mock_aioresponse.get(ACTIONS_URL, callback=actions_callback(actions), repeat=True)
+
+
+def board_loads(mock_aioresponse) -> int:
+    return sum(len(calls) for (method, url), calls in mock_aioresponse.requests.items() if str(url).endswith("/cards"))
+
+
+@pytest.mark.asyncio
+async def test_first_sync_is_full_then_deltas(client, mock_aioresponse):
+    actions = [make_action(1, "createCard", {"card": {"id": CARD_ID, "name": "Card"}, "list": {"id": TODO}})]
+    mock_board(mock_aioresponse, actions)
+    store = MemoryCheckpointStore()
+    sync = DeltaSync(client, store)
+
+    first = await sync.sync()
+    actions.append(make_action(2, "updateCard", {"card": {"id": CARD_ID, "idList": DONE}, "old": {"idList": TODO},
+                                                 "listBefore": {"id": TODO}, "listAfter": {"id": DONE}}))
+    actions.append(make_action(3, "updateCard", {"card": {"id": CARD_ID, "name": "Renamed"}, "old": {"name": "Card"}}))
+    second = await sync.sync()
+    third = await sync.sync()
+
+    assert first.full and first.reason == "no checkpoint" and first.action_id == actions[0]["id"]
+    assert not second.full and second.applied == 2 and second.action_id == actions[2]["id"]
+    assert not third.full and third.applied == 0
+    assert [c.name for c in sync.mirror.cards_in_list(DONE)] == ["Renamed"]
+    assert store.load(BOARD_ID)["action_id"] == actions[2]["id"]
+    assert board_loads(mock_aioresponse) == 1
+
+
+@pytest.mark.asyncio
+async def test_json_store_resumes_without_reload(client, mock_aioresponse, tmp_path):
+    actions = [make_action(1, "createList", {"list": {"id": TODO, "name": "ToDo"}})]
+    mock_board(mock_aioresponse, actions)
+    await DeltaSync(client, JsonCheckpointStore(str(tmp_path))).sync()
+    actions.append(make_action(2, "createCard", {"card": {"id": "5fc10d349569a54078da5101", "name": "New"},
+                                                 "list": {"id": TODO}}))
+
+    sync = DeltaSync(client, JsonCheckpointStore(str(tmp_path)))
+    result = await sync.sync()
+
+    assert not result.full and result.applied == 1
+    assert sorted(c.name for c in sync.mirror.cards_in_list(TODO)) == ["Card", "New"]
+    assert board_loads(mock_aioresponse) == 1
+
+
+@pytest.mark.parametrize("new_actions, reason", [
+    [[make_action(n, "createCard", {"card": {"id": f"5fc10d349569a54078db{n:04x}"}, "list": {"id": TODO}})
+      for n in range(2, 6)], "more than 3 actions"],
+    [[make_action(2, "moveListToBoard", {"list": {"id": DONE}})], "moveListToBoard cannot be replayed"],
+])
+@pytest.mark.asyncio
+async def test_falls_back_to_full_resync(client, mock_aioresponse, new_actions, reason):
+    actions = [make_action(1, "createList", {"list": {"id": TODO, "name": "ToDo"}})]
+    mock_board(mock_aioresponse, actions)
+    sync = DeltaSync(client, max_actions=3, page_size=2)
+    await sync.sync()
+    actions.extend(new_actions)
+
+    result = await sync.sync()
+
+    assert result.full and result.reason == reason
+    assert result.action_id == new_actions[-1]["id"]
+    assert board_loads(mock_aioresponse) == 2
+
+
+@pytest.mark.asyncio
+async def test_resync_when_actions_fail(client, mock_aioresponse):
+    store = MemoryCheckpointStore()
+    store.save(BOARD_ID, {"action_id": "5fc10d349569a54078da0001", "lists": LISTS, "cards": CARDS})
+    mock_aioresponse.get(ACTIONS_URL, status=400, content_type="text/plain", body="invalid value for since")
+    mock_board(mock_aioresponse, [make_action(1, "createList", {"list": {"id": TODO, "name": "ToDo"}})])
+
+    result = await DeltaSync(client, store).sync()
+
+    assert result.full and result.reason.startswith("actions since 5fc10d349569a54078da0001 failed")
+
+
+@pytest.mark.asyncio
+async def test_fast_models_round_trip(mock_aioresponse, tmp_path):
+    actions = [make_action(1, "createList", {"list": {"id": TODO, "name": "ToDo"}})]
+    mock_board(mock_aioresponse, actions)
+    async with Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, fast_models=True) as client:
+        await DeltaSync(client, JsonCheckpointStore(str(tmp_path))).sync()
+
+        sync = DeltaSync(client, JsonCheckpointStore(str(tmp_path)))
+        result = await sync.sync()
+
+    assert not result.full
+    assert sync.mirror.cards[CARD_ID] == FastTrelloCard.parse_obj(CARDS[0])
+
+
+def test_checkpoint_store_is_abstract():
+    with pytest.raises(TypeError):
+        CheckpointStore()
@@ -0,0 +1,84 @@
+import pytest
+from aioresponses import CallbackResult
+from api_trello import Client, SqliteHttpCache, TrelloJson
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+LISTS_URL = f"https://trello.com/1/boards/{BOARD_ID}/lists"
+LISTS = [{"id": "5fc10d349569a54078da5001", "name": "To do"}]
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    cache = SqliteHttpCache(str(tmp_path / "trello.sqlite"), fresh_for=0)
+    yield cache
+    cache.close()
+
+
+def make_client(http_cache):
+    return TrelloJson(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, http_cache=http_cache)
+
+
+@pytest.mark.asyncio
+async def test_revalidate_with_etag(mock_aioresponse, http_cache):
+    sent = []
+
+    def callback(url, **kwargs):
+        sent.append(kwargs.get("headers") or {})
+        if len(sent) == 1:
+            return CallbackResult(payload=LISTS, headers={"ETag": '"v1"'})
+        return CallbackResult(status=304)
+
+    mock_aioresponse.get(LISTS_URL, callback=callback, repeat=True)
+    async with make_client(http_cache) as client:
+        first = await client.get_lists()
+        second = await client.get_lists()
+
+    assert first == second == LISTS
+    assert "If-None-Match" not in sent[0]
+    assert sent[1]["If-None-Match"] == '"v1"'
+    assert http_cache.stats["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_file_and_fresh_for(mock_aioresponse, tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    mock_aioresponse.get(LISTS_URL, payload=LISTS, headers={"Last-Modified": "Fri, 27 Nov 2020 10:00:00 GMT"})
+    writer = SqliteHttpCache(path, fresh_for=0)
+    async with make_client(writer) as client:
+        await client.get_lists()
+    writer.close()
+
+    # another process: the stored copy is served without a request
+    reader = SqliteHttpCache(path, fresh_for=60)
+    async with make_client(reader) as client:
+        response = await client.get_lists()
+    reader.close()
+
+    assert response == LISTS
+    assert reader.stats["fresh"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fresh_by_default(mock_aioresponse, tmp_path):
+    mock_aioresponse.get(LISTS_URL, payload=LISTS, headers={"ETag": '"v1"'})
+    http_cache = SqliteHttpCache(str(tmp_path / "trello.sqlite"))
+    async with make_client(http_cache) as client:
+        responses = [await client.get_lists() for _ in range(3)]
+    http_cache.close()
+
+    assert responses == [LISTS] * 3
+    assert http_cache.stats["fresh"] == 2
+
+
+def test_key_depends_on_token():
+    params = {"key": API_KEY, "token": TOKEN}
+    other = {"key": API_KEY, "token": TOKEN[::-1]}
+    assert SqliteHttpCache.key("GET", LISTS_URL, params) != SqliteHttpCache.key("GET", LISTS_URL, other)
+    assert TOKEN not in SqliteHttpCache.key("GET", LISTS_URL, params)
+
+
+def test_client_passes_http_cache(http_cache):
+    client = Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, http_cache=http_cache)
+    assert client._json_client.http_cache is http_cache
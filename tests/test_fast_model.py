@@ -0,0 +1,45 @@
+import pytest
+from api_trello import Client, TrelloCard, TrelloWebHook
+from api_trello.fast_model import FastTrelloCard, FastTrelloWebHook
+
+CARD = {'id': '5fc10d349569a54078da50fe', 'idShort': 427, 'idList': '5f43db65a1d25218690c062c', 'due': '2020-11-27T19:29:08.072Z',
+        'pos': 128, 'name': 'New name card', 'shortLink': 'i3D9oTTF', 'desc': 'Card Text', 'closed': False, 'idMembers': ['5a214fe083df8aa8c81899e8'],
+        'badges': {'dueComplete': True, 'comments': 0}, 'dateLastActivity': '2020-11-27T14:57:07.141Z'}
+
+
+@pytest.mark.parametrize(
+    "fast_model, model, payload", [
+        [FastTrelloCard, TrelloCard, CARD],
+        [FastTrelloCard, TrelloCard, {"id": "5fc10d349569a54078da50fe"}],
+        [FastTrelloWebHook, TrelloWebHook, {'id': '5fbf92a8a8ceaf0ea2806041', 'description': 'WH for Helpdesk TG Bot', 'idModel': 'bbbbbbbbbb1234567890BBBBBBBBBB00',
+                                            'active': True, 'consecutiveFailures': 2, 'firstConsecutiveFailDate': '2020-11-27T14:57:07.141Z'}],
+    ])
+def test_same_attributes_as_pydantic(fast_model, model, payload):
+    fast = fast_model.parse_obj(payload)
+    slow = model.parse_obj(payload)
+
+    for name, value in slow.dict().items():
+        fast_value = getattr(fast, name)
+        assert (fast_value.dict() if hasattr(fast_value, "dict") else fast_value) == value
+
+
+def test_datetime_is_parsed_lazily():
+    card = FastTrelloCard.parse_obj(CARD)
+
+    assert card._due == CARD["due"]
+    assert card.due == TrelloCard.parse_obj(CARD).due
+    assert card._due is card.due
+
+
+@pytest.mark.asyncio
+async def test_client_fast_models(mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD['id']}", payload=CARD)
+
+    async with Client(api_key="aaaaaaaaaa1234567890AAAAAAAAAA00",
+                      token="cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11",
+                      board_id="bbbbbbbbbb1234567890BBBBBBBBBB00", fast_models=True) as client:
+        response = await client.get_card(CARD["id"])
+
+    assert type(response) == FastTrelloCard
+    assert response.badges.due_complete is True
+    assert response == FastTrelloCard.parse_obj(CARD)
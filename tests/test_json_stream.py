@@ -0,0 +1,53 @@
+import json
+import pytest
+from api_trello.json_stream import iter_json_array
+
+
+class ChunkedContent:
+    """StreamReader stub returning the body in small chunks"""
+
+    def __init__(self, body: bytes, size: int):
+        self.chunks = [body[i:i + size] for i in range(0, len(body), size)]
+
+    async def read(self, n: int = -1) -> bytes:
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+@pytest.mark.parametrize(
+    "value", [
+        [],
+        [1, 22, 333, -4.5e10],
+        [{"id": "5fc10d349569a54078da50fe", "name": "Новая задача", "idMembers": [], "badges": {"dueComplete": False}}] * 20,
+        ["a", None, True, {"nested": [[1], {"x": "]"}]}],
+    ])
+@pytest.mark.parametrize("size", [1, 7, 4096])
+@pytest.mark.asyncio
+async def test_iter_json_array(value, size):
+    content = ChunkedContent(json.dumps(value, ensure_ascii=False, indent=1).encode(), size)
+
+    response = [item async for item in iter_json_array(content, chunk_size=size)]
+
+    assert response == value
+
+
+@pytest.mark.parametrize("body", [b'{"message": "error"}', b'[{"id": 1}, {"id"', b'[1, 2'])
+@pytest.mark.asyncio
+async def test_iter_json_array_invalid(body):
+    with pytest.raises(ValueError):
+        [item async for item in iter_json_array(ChunkedContent(body, 4))]
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_loads():
+    decoded = []
+
+    def loads(data):
+        decoded.append(data)
+        return json.loads(data)
+
+    content = ChunkedContent(b'[{"x": "a\\\\\\"]"}, "]", 1.5]', 3)
+
+    response = [item async for item in iter_json_array(content, chunk_size=3, loads=loads)]
+
+    assert response == [{"x": 'a\\"]'}, "]", 1.5]
+    assert decoded == ['{"x": "a\\\\\\"]"}', '"]"', "1.5"]
@@ -0,0 +1,104 @@
+import socket
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from api_trello import Client, TrelloJson, RetryPolicy, SqliteHttpCache
+from api_trello.metrics import InMemoryMetrics, PrometheusMetrics, StatsdMetrics
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+CARD_ID = "5fc10d349569a54078da50fe"
+CARD_URL = f"https://trello.com/1/cards/{CARD_ID}"
+
+
+@pytest.mark.asyncio
+async def test_client_call_metrics(mock_aioresponse):
+    mock_aioresponse.get(CARD_URL, status=503)
+    mock_aioresponse.get(CARD_URL, payload={"id": CARD_ID, "name": "Card"},
+                         headers={"x-rate-limit-api-token-remaining": "87"})
+    metrics = InMemoryMetrics()
+    async with Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, metrics=metrics,
+                      retry_policy=RetryPolicy(backoff_base=0.001)) as client:
+        card = await client.get_card(CARD_ID)
+
+    assert card.name == "Card"
+    assert metrics.count("responses", endpoint="get_card", status="503") == 1
+    assert metrics.count("responses", endpoint="get_card", status="200") == 1
+    assert metrics.count("retries", endpoint="get_card") == 1
+    for phase in ("request", "download", "decode", "parse"):
+        assert metrics.summary(phase, endpoint="get_card")["count"] >= 1, phase
+    assert metrics.gauges[("rate_limit_remaining", (("kind", "api-token"),))] == 87
+    assert metrics.gauges[("in_flight", (("endpoint", "get_card"),))] == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_and_streamed_call_metrics(mock_aioresponse, tmp_path):
+    mock_aioresponse.get(CARD_URL, payload={"id": CARD_ID}, headers={"ETag": '"v1"'})
+    mock_aioresponse.get(CARD_URL, status=304)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=[{"id": CARD_ID}] * 3)
+    metrics = InMemoryMetrics()
+    http_cache = SqliteHttpCache(str(tmp_path / "trello.sqlite"), fresh_for=0)
+    async with TrelloJson(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, metrics=metrics,
+                          http_cache=http_cache) as trello:
+        for _ in range(2):
+            await trello.get_card(CARD_ID)
+        items = trello.stream_board_cards()
+        async for _ in items:
+            break
+        await items.aclose()
+    http_cache.close()
+
+    assert metrics.summary("download", endpoint="get_card")["count"] == 1
+    assert metrics.summary("decode", endpoint="get_card")["count"] == 2  # the 304 decodes the stored body
+    assert metrics.summary("download", endpoint="stream_board_cards")["count"] == 1
+    assert metrics.summary("decode", endpoint="stream_board_cards")["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_phases():
+    async def card(request):
+        return web.json_response({"id": CARD_ID})
+
+    app = web.Application()
+    app.router.add_get(f"/1/cards/{CARD_ID}", card)
+    metrics = InMemoryMetrics()
+    async with TestServer(app) as server:
+        async with TrelloJson(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, base_url=str(server.make_url("/1")),
+                              metrics=metrics) as client:
+            for _ in range(3):
+                await client.get_card(CARD_ID)
+
+    assert metrics.summary("connect", endpoint="get_card")["count"] == 1
+    assert metrics.count("connections_reused", endpoint="get_card") == 2
+    assert metrics.summary("ttfb", endpoint="get_card")["count"] == 3
+
+
+def test_prometheus_exposition():
+    metrics = PrometheusMetrics(buckets=(0.1, 1))
+    metrics.timing("ttfb", 0.05, {"endpoint": "get_card"})
+    metrics.timing("ttfb", 0.5, {"endpoint": "get_card"})
+    metrics.increment("responses", {"endpoint": "get_card", "status": "200"})
+    metrics.gauge("in_flight", 3, {"endpoint": "get_card"})
+    text = metrics.exposition()
+
+    assert "# TYPE trello_ttfb_seconds histogram" in text
+    assert 'trello_ttfb_seconds_bucket{endpoint="get_card",le="0.1"} 1' in text
+    assert 'trello_ttfb_seconds_bucket{endpoint="get_card",le="+Inf"} 2' in text
+    assert 'trello_ttfb_seconds_count{endpoint="get_card"} 2' in text
+    assert 'trello_responses_total{endpoint="get_card",status="200"} 1' in text
+    assert 'trello_in_flight{endpoint="get_card"} 3' in text
+
+
+def test_statsd_datagrams():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(1)
+    metrics = StatsdMetrics(port=server.getsockname()[1])
+    metrics.timing("ttfb", 0.0125, {"endpoint": "get_card"})
+    metrics.increment("retries", {"endpoint": "get_card"})
+    received = [server.recv(1024).decode() for _ in range(2)]
+    metrics.close()
+    server.close()
+
+    assert received == ["trello.ttfb:12.5|ms|#endpoint:get_card", "trello.retries:1|c|#endpoint:get_card"]
@@ -0,0 +1,93 @@
+import pytest
+from api_trello import BoardMirror, Client, TrelloUpdate
+from api_trello.fast_model import FastTrelloCard
+
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+TODO, DONE = "5f43db65a1d25218690c062c", "5f43db65a1d25218690c062e"
+CARD_ID = "5fc10d349569a54078da50fe"
+LISTS = [{"id": TODO, "name": "ToDo", "closed": False, "pos": 16384}, {"id": DONE, "name": "Done", "closed": False, "pos": 32768}]
+CARDS = [{"id": CARD_ID, "idList": TODO, "name": "Card", "pos": 128, "closed": False, "idMembers": []},
+         {"id": "5fc10d349569a54078da50ff", "idList": TODO, "name": "Other", "pos": 256, "closed": False, "idMembers": []}]
+
+
+def make_update(action_type: str, data: dict) -> TrelloUpdate:
+    return TrelloUpdate.parse_obj({
+        "model": {"id": BOARD_ID, "name": "Board"},
+        "action": {
+            "id": "5fc10d349569a54078da5100",
+            "idMemberCreator": "5a214fe083df8aa8c81899e8",
+            "type": action_type,
+            "date": "2020-11-27T14:29:08.437Z",
+            "data": {"board": {"id": BOARD_ID, "name": "Board"}, **data},
+            "display": {"translationKey": "action_" + action_type, "entities": {}},
+        },
+    })
+
+
+@pytest.mark.asyncio
+async def test_seed(client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", payload=LISTS)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=CARDS)
+    mirror = BoardMirror(client)
+
+    await mirror.seed()
+
+    assert [c.id for c in mirror.cards_in_list(TODO)] == [CARD_ID, "5fc10d349569a54078da50ff"]
+    assert mirror.cards_in_list(DONE) == []
+
+
+@pytest.mark.asyncio
+async def test_apply_updates(client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", payload=LISTS)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=CARDS)
+    mirror = BoardMirror(client)
+    await mirror.seed()
+
+    mirror.apply(make_update("updateCard", {"card": {"id": CARD_ID, "idList": DONE}, "old": {"idList": TODO},
+                                            "listBefore": {"id": TODO}, "listAfter": {"id": DONE}}))
+    mirror.apply(make_update("updateCard", {"card": {"id": CARD_ID, "name": "Renamed"}, "old": {"name": "Card"}}))
+    mirror.apply(make_update("addMemberToCard", {"card": {"id": CARD_ID}, "idMember": "5a214fe083df8aa8c81899e8"}))
+    mirror.apply(make_update("updateCard", {"card": {"id": "5fc10d349569a54078da50ff", "closed": True}, "old": {"closed": False}}))
+    mirror.apply(make_update("createCard", {"card": {"id": "5fc10d349569a54078da5101", "name": "New"}, "list": {"id": TODO}}))
+    ignored = mirror.apply(make_update("commentCard", {"card": {"id": CARD_ID}}))
+
+    card = mirror.cards[CARD_ID]
+    assert [c.id for c in mirror.cards_in_list(DONE)] == [CARD_ID]
+    assert card.name == "Renamed"
+    assert card.id_members == ["5a214fe083df8aa8c81899e8"]
+    assert [c.id for c in mirror.cards_in_list(TODO)] == ["5fc10d349569a54078da5101"]
+    assert len(mirror.cards_in_list(TODO, closed=True)) == 2
+    assert not ignored
+    assert (mirror.applied, mirror.ignored) == (5, 1)
+
+
+@pytest.mark.asyncio
+async def test_reconcile(client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", payload=LISTS, repeat=True)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=CARDS)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=[{**CARDS[0], "idList": DONE}])
+    mirror = BoardMirror(client)
+    await mirror.seed()
+
+    drift = await mirror.reconcile()
+
+    assert drift == 2
+    assert [c.id for c in mirror.cards_in_list(DONE)] == [CARD_ID]
+    assert mirror.cards_in_list(TODO) == []
+
+
+@pytest.mark.asyncio
+async def test_fast_model_mirror_keeps_fast_cards(mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", payload=LISTS)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=CARDS)
+    async with Client(api_key="aaaaaaaaaa1234567890AAAAAAAAAA00", board_id=BOARD_ID, fast_models=True,
+                      token="cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11") as client:
+        mirror = BoardMirror(client)
+        await mirror.seed()
+
+    mirror.apply(make_update("createCard", {"card": {"id": "5fc10d349569a54078da5101", "name": "New"}, "list": {"id": TODO}}))
+    mirror.apply(make_update("addMemberToCard", {"card": {"id": "5fc10d349569a54078da5102"}, "idMember": "5a214fe083df8aa8c81899e8"}))
+
+    assert {type(card) for card in mirror.cards.values()} == {FastTrelloCard}
+    assert mirror.cards["5fc10d349569a54078da5101"].id_list == TODO
+    assert mirror.cards["5fc10d349569a54078da5102"].id_members == ["5a214fe083df8aa8c81899e8"]
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from api_trello import RetryPolicy, TrelloException
+from api_trello.pool import ClientPool, FairScheduler
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN_A = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+TOKEN_B = "dddddddddd1234567890DDDDDDDDDD11dddddddddd1234567890DDDDDDDDDD22"
+BOARD_1 = "bbbbbbbbbb1234567890BBBBBBBBBB01"
+BOARD_2 = "bbbbbbbbbb1234567890BBBBBBBBBB02"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_round_robin_between_boards():
+    scheduler = FairScheduler(concurrency=1)
+    order = []
+
+    async def call(board, i):
+        await scheduler.acquire("token", board)
+        try:
+            order.append(board)
+            await asyncio.sleep(0)
+        finally:
+            scheduler.release("token")
+
+    # the noisy board queues 6 calls before the quiet one queues 2
+    await asyncio.gather(*[call("noisy", i) for i in range(6)], *[call("quiet", i) for i in range(2)])
+
+    assert order[:5] == ["noisy", "noisy", "quiet", "noisy", "quiet"]
+    assert scheduler.active("token") == 0 and scheduler.queued("token") == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiter():
+    scheduler = FairScheduler(concurrency=1)
+    await scheduler.acquire("token", "board")
+    waiter = asyncio.ensure_future(scheduler.acquire("token", "board"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+    scheduler.release("token")
+
+    assert scheduler.active("token") == 0 and scheduler.queued("token") == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_session_and_limiter(mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_1}/lists", payload=[], repeat=True)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_2}/lists", status=429, repeat=True,
+                         body="API_TOKEN_LIMIT_EXCEEDED", content_type="text/plain")
+    async with ClientPool(API_KEY, retry_policy=RetryPolicy(max_retries=0)) as pool:
+        a1, a2, b1 = pool.client(BOARD_1, TOKEN_A), pool.client(BOARD_2, TOKEN_A), pool.client(BOARD_1, TOKEN_B)
+        await a1.get_lists()
+        await a1.get_lists(filter="open")
+        await b1.get_lists()
+        with pytest.raises(TrelloException):
+            await a2.get_lists()
+        session = a1._json_client._get_session()
+
+        assert pool.client(BOARD_1, TOKEN_A) is a1
+        assert b1._json_client._get_session() is session
+        assert a1._json_client.rate_limiter is b1._json_client.rate_limiter is pool.rate_limiter
+    stats = pool.stats()
+
+    assert session.closed
+    assert stats["..." + TOKEN_A[-6:]] == {"boards": 2, "calls": 3, "attempts": 3, "retries": 0, "giveups": 0,
+                                           "throttled": 1, "in_flight": 0, "queued": 0}
+    assert stats["..." + TOKEN_B[-6:]]["calls"] == 1
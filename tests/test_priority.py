@@ -0,0 +1,125 @@
+import asyncio
+import time
+import pytest
+from api_trello import BACKGROUND, INTERACTIVE, NORMAL, RateLimiter, TrelloJson, request_priority
+from api_trello.pool import FairScheduler
+from api_trello.priority import current_priority
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+
+
+@pytest.mark.asyncio
+async def test_limiter_serves_interactive_first():
+    limiter = RateLimiter(token_limit=(1, 0.05), aging=60)
+    await limiter.acquire(API_KEY, TOKEN)  # empty the bucket
+    order = []
+
+    async def call(name, level):
+        await limiter.acquire(API_KEY, TOKEN, level)
+        order.append(name)
+
+    background = [asyncio.ensure_future(call(f"bg{i}", BACKGROUND)) for i in range(3)]
+    await asyncio.sleep(0.01)
+    interactive = asyncio.ensure_future(call("ui", INTERACTIVE))
+    await asyncio.gather(*background, interactive)
+
+    assert order[0] == "ui"
+
+
+@pytest.mark.asyncio
+async def test_reserve_is_left_to_interactive():
+    limiter = RateLimiter(token_limit=(10, 1), reserved=0.5, aging=60)
+    for _ in range(4):
+        await limiter.acquire(API_KEY, TOKEN, BACKGROUND)
+
+    # 6 left: background needs 1 + 5 reserved
+    await asyncio.wait_for(limiter.acquire(API_KEY, TOKEN, BACKGROUND), 0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(API_KEY, TOKEN, BACKGROUND), 0.05)
+    for _ in range(4):
+        await asyncio.wait_for(limiter.acquire(API_KEY, TOKEN, INTERACTIVE), 0.05)
+
+
+@pytest.mark.asyncio
+async def test_aging_lets_background_use_the_reserve():
+    limiter = RateLimiter(token_limit=(10, 1000), reserved=0.5, aging=0.05)
+    for _ in range(5):
+        await limiter.acquire(API_KEY, TOKEN, NORMAL)
+
+    start = time.monotonic()
+    # a waiting BACKGROUND request reaches NORMAL after 5 * aging
+    await asyncio.wait_for(limiter.acquire(API_KEY, TOKEN, BACKGROUND), 1)
+
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_passes_the_gate_on():
+    limiter = RateLimiter(token_limit=(1, 0.1))
+    await limiter.acquire(API_KEY, TOKEN)
+    first = asyncio.ensure_future(limiter.acquire(API_KEY, TOKEN))
+    second = asyncio.ensure_future(limiter.acquire(API_KEY, TOKEN))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    await asyncio.wait_for(second, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_admits_urgent_before_boards():
+    scheduler = FairScheduler(concurrency=1)
+    await scheduler.acquire("token", "board")
+    order = []
+
+    async def call(name, level):
+        await scheduler.acquire("token", name, level)
+        order.append(name)
+        scheduler.release("token")
+
+    waiters = [asyncio.ensure_future(call("sync", BACKGROUND))]
+    await asyncio.sleep(0)
+    waiters.append(asyncio.ensure_future(call("ui", INTERACTIVE)))
+    await asyncio.sleep(0)
+    scheduler.release("token")
+    await asyncio.gather(*waiters)
+
+    assert order == ["ui", "sync"]
+    assert scheduler.queued("token") == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_context_overrides_client_default(mock_aioresponse):
+    levels = []
+
+    class Recording(RateLimiter):
+        async def acquire(self, api_key, token, priority=NORMAL):
+            levels.append(priority)
+            await super().acquire(api_key, token, priority)
+
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", payload=[], repeat=True)
+    async with TrelloJson(API_KEY, TOKEN, BOARD_ID, rate_limiter=Recording(), priority=BACKGROUND) as trello:
+        await trello.get_lists()
+        with request_priority(INTERACTIVE):
+            await trello.get_lists(filter="open")
+
+    assert levels == [BACKGROUND, INTERACTIVE]
+    assert current_priority() == NORMAL
+
+
+@pytest.mark.asyncio
+async def test_cancelled_preempted_request_keeps_the_gate_of_the_holder():
+    limiter = RateLimiter(token_limit=(1, 0.2), aging=60)
+    await limiter.acquire(API_KEY, TOKEN)
+    background = asyncio.ensure_future(limiter.acquire(API_KEY, TOKEN, BACKGROUND))
+    await asyncio.sleep(0.01)
+    interactive = asyncio.ensure_future(limiter.acquire(API_KEY, TOKEN, INTERACTIVE))
+    await asyncio.sleep(0.01)  # background is preempted and waits to re-enter
+    background.cancel()
+    await asyncio.sleep(0)
+
+    gate = limiter._gates[(API_KEY, TOKEN)]
+    assert gate.locked and not interactive.done()
+    await asyncio.wait_for(interactive, 0.5)
+    assert not gate.locked
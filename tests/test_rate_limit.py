@@ -0,0 +1,56 @@
+import asyncio
+import time
+import pytest
+from api_trello import RateLimiter
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_capacity():
+    limiter = RateLimiter(key_limit=(300, 10), token_limit=(5, 0.5))
+
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire(API_KEY, TOKEN) for _ in range(10)))
+    elapsed = time.monotonic() - start
+
+    # 5 immediately, the other 5 refill at 10 per second
+    assert 0.4 < elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_tokens_have_separate_buckets():
+    limiter = RateLimiter(token_limit=(1, 10))
+
+    await limiter.acquire(API_KEY, TOKEN)
+    await asyncio.wait_for(limiter.acquire(API_KEY, "d" * 64), 0.1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(API_KEY, TOKEN), 0.1)
+
+
+@pytest.mark.parametrize(
+    "headers, status, capacity, tokens", [
+        [{"x-rate-limit-api-token-max": "50", "x-rate-limit-api-token-interval-ms": "5000", "x-rate-limit-api-token-remaining": "3"}, 200, 50, 3],
+        [{"x-rate-limit-api-token-remaining": "200"}, 200, 100, 100],
+        [{}, 429, 100, 0],
+    ])
+def test_update_from_headers(headers, status, capacity, tokens):
+    limiter = RateLimiter()
+
+    limiter.update(API_KEY, TOKEN, headers, status)
+    bucket = limiter.bucket("api-token", TOKEN)
+
+    assert bucket.capacity == capacity
+    assert int(bucket.tokens) == tokens
+
+
+@pytest.mark.asyncio
+async def test_trello_json_syncs_limiter(client_trello_json, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{client_trello_json.board_id}/lists", payload=[],
+                         headers={"x-rate-limit-api-key-max": "300", "x-rate-limit-api-key-remaining": "7"})
+
+    await client_trello_json.get_lists()
+
+    assert client_trello_json.rate_limiter.bucket("api-key", client_trello_json.api_key).tokens < 8
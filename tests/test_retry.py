@@ -0,0 +1,86 @@
+import pytest
+from api_trello import TrelloJson, Client, TrelloException, TrelloCard, RetryPolicy
+from api_trello.retry import parse_retry_after
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+CARD_ID = "5fc10d349569a54078da50fe"
+FAST = RetryPolicy(max_retries=2, backoff_base=0.001)
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried(mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", status=503, content_type="text/plain", body="unavailable")
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", status=429, content_type="text/plain", body="slow down", headers={"Retry-After": "0"})
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", payload={"id": CARD_ID, "name": "Card"})
+
+    async with Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, retry_policy=FAST) as client:
+        response = await client.get_card(CARD_ID)
+        stats = client._json_client.retry_stats.snapshot()
+
+    assert response == TrelloCard(id=CARD_ID, name="Card")
+    assert stats["get_card"]["attempts"] == 3
+    assert stats["get_card"]["retries"] == 2
+    assert stats["get_card"]["statuses"] == {503: 1, 429: 1, 200: 1}
+
+
+@pytest.mark.asyncio
+async def test_retries_are_limited(mock_aioresponse):
+    for _ in range(3):
+        mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", status=500, content_type="text/plain", body="boom")
+
+    async with Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, retry_policy=FAST) as client:
+        with pytest.raises(TrelloException) as e:
+            await client.get_card(CARD_ID)
+        stats = client._json_client.retry_stats.snapshot()
+
+    assert str(e.value) == "boom"
+    assert stats["get_card"]["giveups"] == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_retries(mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", status=429, content_type="text/plain", body="slow down", headers={"Retry-After": "30"})
+
+    async with TrelloJson(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID,
+                          retry_policy=RetryPolicy(deadline=5)) as client_trello_json:
+        response = await client_trello_json.get_card(CARD_ID)
+
+    assert response == {"status": 429, "message": "slow down", "error": "ERROR"}
+    assert client_trello_json.retry_stats.retries["get_card"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unsafe_call_is_not_retried_by_default(mock_aioresponse):
+    mock_aioresponse.post("https://trello.com/1/cards", status=503, content_type="text/plain", body="unavailable")
+
+    async with TrelloJson(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, retry_policy=FAST) as client_trello_json:
+        response = await client_trello_json.create_card("5f43db65a1d25218690c062c", "New Card")
+
+    assert response["status"] == 503
+    assert client_trello_json.retry_stats.attempts["create_card"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unsafe_call_opt_in(mock_aioresponse):
+    mock_aioresponse.post("https://trello.com/1/cards", status=503, content_type="text/plain", body="unavailable")
+    mock_aioresponse.post("https://trello.com/1/cards", payload={"id": CARD_ID})
+
+    policies = {"create_card": RetryPolicy(max_retries=1, backoff_base=0.001, retry_unsafe=True)}
+    async with TrelloJson(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, retry_policies=policies) as client_trello_json:
+        response = await client_trello_json.create_card("5f43db65a1d25218690c062c", "New Card")
+
+    assert response == {"id": CARD_ID}
+    assert client_trello_json.retry_stats.retries["create_card"] == 1
+
+
+@pytest.mark.parametrize(
+    "headers, answer", [
+        [{}, None],
+        [{"Retry-After": "3"}, 3.0],
+        [{"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0],
+        [{"Retry-After": "soon"}, None],
+    ])
+def test_parse_retry_after(headers, answer):
+    assert parse_retry_after(headers) == answer
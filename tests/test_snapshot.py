@@ -0,0 +1,58 @@
+import pytest
+from api_trello.snapshot import SnapshotExporter
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+np = pytest.importorskip("numpy")
+
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+TODO, DONE = "5f43db65a1d25218690c062c", "5f43db65a1d25218690c062e"
+LISTS = [{"id": TODO, "name": "ToDo", "closed": False, "pos": 16384}, {"id": DONE, "name": "Done", "closed": False, "pos": 32768}]
+CARDS = [{"id": f"5fc10d349569a54078da{i:04x}", "idList": [TODO, DONE][i % 2], "name": f"Card {i}", "closed": False, "pos": i * 128,
+          "due": "2020-11-27T19:29:08.072Z" if i % 3 else None, "badges": {"dueComplete": i % 3 == 1},
+          "dateLastActivity": "2020-11-27T14:57:07.141Z", "idMembers": ["5a214fe083df8aa8c81899e8"] if i % 2 else []} for i in range(5)]
+ACTIONS = [{"id": "5fc10d349569a54078db0001", "type": "updateCard", "date": "2020-11-28T10:00:00.000Z", "idMemberCreator": "5a214fe083df8aa8c81899e8",
+            "data": {"card": {"id": CARDS[0]["id"]}, "listBefore": {"id": TODO}, "listAfter": {"id": DONE}}},
+           {"id": "5fc10d349569a54078db0000", "type": "createCard", "date": "2020-11-27T10:00:00.000Z", "idMemberCreator": "5a214fe083df8aa8c81899e8",
+            "data": {"card": {"id": CARDS[0]["id"]}, "list": {"id": TODO}}}]
+
+
+def mock_board(mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/lists", payload=LISTS)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=CARDS)
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/actions", payload=ACTIONS)
+
+
+@pytest.mark.asyncio
+async def test_batches(client, mock_aioresponse):
+    mock_board(mock_aioresponse)
+
+    tables = {table: batch async for table, batch in SnapshotExporter(client, batch_size=3).batches()}
+    cards = tables["cards"].to_numpy()
+
+    assert len(tables["cards"]) == 2  # the last batch
+    assert list(cards["id_list"]) == [1, 0]
+    assert list(cards["due_complete"]) == [False, True]
+    assert np.isnat(cards["due"][0]) and not np.isnat(cards["due"][1])
+    assert tables["cards"].columns["id_list"].dictionary.values == [TODO, DONE]
+    assert len(tables["card_members"]) == 2
+    assert tables["actions"].to_arrow().column("id_list_after").to_pylist() == [DONE, None]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+@pytest.mark.asyncio
+async def test_write(client, mock_aioresponse, tmp_path, fmt):
+    mock_board(mock_aioresponse)
+    exporter = SnapshotExporter(client, batch_size=2)
+
+    rows = await getattr(exporter, f"write_{fmt}")(str(tmp_path))
+
+    assert rows == {"lists": 2, "cards": 5, "card_members": 2, "actions": 2}
+    if fmt == "parquet":
+        cards = pq.read_table(tmp_path / "cards.parquet")
+    else:
+        import pyarrow.feather as feather
+        cards = feather.read_table(tmp_path / "cards.feather")
+    assert cards.column("id").to_pylist() == [c["id"] for c in CARDS]
+    assert cards.column("id_list").to_pylist() == [c["idList"] for c in CARDS]
+    assert pa.types.is_dictionary(cards.schema.field("id_list").type)
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import pytest
+import api_trello
+from api_trello import TrelloJson
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+
+
+def test_import_is_lazy():
+    code = ("import sys, api_trello; "
+            "print(sorted(m for m in ('aiohttp', 'pydantic', 'loguru', 'sqlite3') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.PIPE).stdout
+    assert output.decode().strip() == "[]"
+
+
+def test_lazy_exports():
+    for name in api_trello.__all__:
+        assert getattr(api_trello, name) is not None
+    assert set(api_trello.__all__) <= set(dir(api_trello))
+    with pytest.raises(AttributeError):
+        api_trello.NoSuchName
+
+
+def test_constructor_validates_without_event_loop():
+    client = TrelloJson(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID)
+    assert not hasattr(client, "loop")
+    with pytest.raises(AssertionError):
+        TrelloJson(api_key="not a key", token=TOKEN, board_id=BOARD_ID)
@@ -0,0 +1,75 @@
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from api_trello import Client, SyncClient, TrelloCard, TrelloException
+from api_trello.sync_client import CALLS, ITERATORS
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+CARD_ID = "5fc10d349569a54078da50fe"
+BOARD_CARDS = [{"id": f"5fc10d349569a54078da{i:04x}", "name": f"Card {i}"} for i in range(25)]
+
+
+@pytest.fixture
+def sync_client():
+    client = SyncClient(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID)
+    yield client
+    client.close()
+
+
+def test_mirrors_client_methods():
+    public = {name for name, _ in inspect.getmembers(Client, inspect.isfunction) if not name.startswith("_")}
+
+    assert public - {"aclose"} == set(CALLS) | set(ITERATORS)
+    assert SyncClient.get_card.__doc__ == Client.get_card.__doc__
+
+
+def test_calls_from_threads_share_one_session(sync_client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", payload={"id": CARD_ID, "name": "Card"}, repeat=True)
+
+    with ThreadPoolExecutor(8) as pool:
+        cards = list(pool.map(lambda _: sync_client.get_card(CARD_ID), range(16)))
+
+    assert cards == [TrelloCard(id=CARD_ID, name="Card")] * 16
+    assert sync_client.client._json_client._session_loop is sync_client.loop
+
+
+def test_errors_are_raised_in_the_caller(sync_client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/cards/{CARD_ID}", status=404, content_type="text/plain",
+                         body="The requested resource was not found.")
+
+    with pytest.raises(TrelloException):
+        sync_client.get_card(CARD_ID)
+
+
+def test_iterators(sync_client, mock_aioresponse):
+    mock_aioresponse.get(f"https://trello.com/1/boards/{BOARD_ID}/cards", payload=BOARD_CARDS)
+
+    cards = sync_client.iter_cards(page_size=1000)
+
+    assert inspect.isgenerator(cards)
+    assert [card.name for card in cards] == [c["name"] for c in BOARD_CARDS]
+
+
+def test_close_stops_the_loop_thread(mock_aioresponse):
+    client = SyncClient(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID)
+    thread = client._thread
+
+    with client:
+        pass
+
+    assert not thread.is_alive() and client.loop.is_closed()
+    with pytest.raises(RuntimeError):
+        client.get_card(CARD_ID)
+    client.close()  # twice is fine
+
+
+def test_invalid_arguments_stop_the_thread():
+    threads = threading.active_count()
+
+    with pytest.raises(AssertionError):
+        SyncClient(api_key="invalid", token=TOKEN, board_id=BOARD_ID)
+
+    assert threading.active_count() == threads
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from aioresponses import CallbackResult
+from api_trello import Client, RetryPolicy
+from api_trello.tracing import InMemorySpanExporter, Tracer, current_span
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+CARD_ID = "5fc10d349569a54078da50fe"
+CARD_URL = f"https://trello.com/1/cards/{CARD_ID}"
+
+
+@pytest_asyncio.fixture
+async def traced():
+    exporter = InMemorySpanExporter()
+    async with Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, tracer=Tracer(exporter),
+                      retry_policy=RetryPolicy(backoff_base=0.001)) as client:
+        yield client, exporter
+
+
+@pytest.mark.asyncio
+async def test_span_tree_of_a_call(mock_aioresponse, traced):
+    client, exporter = traced
+    mock_aioresponse.get(CARD_URL, status=503)
+    mock_aioresponse.get(CARD_URL, payload={"id": CARD_ID, "name": "Card"})
+
+    await client.get_card(CARD_ID)
+
+    [call] = exporter.by_name("Client.get_card")
+    assert call.parent_id is None
+    assert call.attributes == {"endpoint": "GET /cards/{id}", "card_id": CARD_ID}
+    children = exporter.children(call)
+    assert [s.name for s in children] == ["http GET", "retry wait", "http GET", "parse"]
+    assert [s.attributes.get("http.status") for s in children] == [503, None, 200, None]
+    assert children[0].status == "ERROR" and children[2].status == "OK"
+    assert {s.trace_id for s in exporter.spans} == {call.trace_id}
+    assert all(s.end >= s.start for s in exporter.spans)
+
+
+@pytest.mark.asyncio
+async def test_context_propagates_to_tasks(mock_aioresponse, traced):
+    client, exporter = traced
+    mock_aioresponse.get(CARD_URL, payload={"id": CARD_ID}, repeat=True)
+    mock_aioresponse.put(CARD_URL, callback=lambda url, **kwargs: CallbackResult(payload={"id": CARD_ID}))
+    tracer = client._json_client.tracer
+
+    with tracer.span("handle webhook") as root:
+        await asyncio.gather(asyncio.ensure_future(client.get_card(CARD_ID, fields="name")),
+                             client.update_card(CARD_ID, name="x"))
+
+    assert current_span() is None
+    assert sorted(s.name for s in exporter.children(root)) == ["Client.get_card", "Client.update_card"]
+
+
+@pytest.mark.asyncio
+async def test_failed_call_marks_span(mock_aioresponse, traced):
+    client, exporter = traced
+    mock_aioresponse.put(CARD_URL, status=400, content_type="text/plain", body="invalid value for closed")
+
+    with pytest.raises(Exception):
+        await client.update_card(CARD_ID, closed="maybe")
+
+    [call] = exporter.by_name("Client.update_card")
+    assert call.status == "ERROR"
+    assert "invalid value for closed" in call.error
+
+
+@pytest.mark.asyncio
+async def test_bulk_read_has_parse_span(mock_aioresponse, traced):
+    client, exporter = traced
+    mock_aioresponse.get("https://trello.com/1/batch", payload=[{"200": {"id": CARD_ID}}, {"200": {"id": CARD_ID}}])
+
+    cards = await client.get_cards([CARD_ID, CARD_ID])
+
+    [call] = exporter.by_name("Client.get_cards")
+    [parse] = [s for s in exporter.children(call) if s.name == "parse"]
+    assert parse.attributes == {"endpoint": "get_cards", "model": "TrelloCard"}
+    assert len(cards) == 2
@@ -1,4 +1,7 @@
+import asyncio
 import pytest
+from aioresponses import CallbackResult
+from api_trello import TrelloJson
 
 
 @pytest.mark.parametrize(
@@ -162,4 +165,148 @@ async def test_add_member(client_trello_json, mock_aioresponse, status, card_id,
     if response_type == "body":
         correct_answer = {"status": status, "message": response_payload, "error": "ERROR"}
 
-    assert response == correct_answer
\ No newline at end of file
+    assert response == correct_answer
+
+@pytest.mark.asyncio
+async def test_session_is_reused(client_trello_json, mock_aioresponse):
+    url = f"https://trello.com/1/tokens/{client_trello_json.token}/webhooks"
+    mock_aioresponse.get(url, payload=[])
+    mock_aioresponse.get(url, payload=[])
+
+    await client_trello_json.get_webhooks()
+    session = client_trello_json._session
+    await client_trello_json.get_webhooks()
+
+    assert client_trello_json._session is session
+    assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_session_lifecycle(mock_aioresponse):
+    token = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+    mock_aioresponse.get(f"https://trello.com/1/tokens/{token}/webhooks", payload=[])
+
+    async with TrelloJson(api_key="aaaaaaaaaa1234567890AAAAAAAAAA00", token=token,
+                          board_id="bbbbbbbbbb1234567890BBBBBBBBBB00") as client_trello_json:
+        await client_trello_json.get_webhooks()
+        session = client_trello_json._session
+
+    assert session.closed
+    assert client_trello_json._session is None
+
+
+def test_session_of_a_closed_loop_is_closed(mock_aioresponse):
+    token = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+    mock_aioresponse.get(f"https://trello.com/1/tokens/{token}/webhooks", payload=[], repeat=True)
+    client_trello_json = TrelloJson(api_key="aaaaaaaaaa1234567890AAAAAAAAAA00", token=token,
+                                    board_id="bbbbbbbbbb1234567890BBBBBBBBBB00")
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(client_trello_json.get_webhooks())
+    stale = client_trello_json._session
+    loop.close()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(client_trello_json.get_webhooks())
+    session = client_trello_json._session
+    loop.run_until_complete(client_trello_json.aclose())
+    loop.close()
+
+    assert stale.closed and session is not stale
+
+
+def batch_callback(url, **kwargs):
+    """Trello batch answer: found for ids starting with 5, NotFound otherwise"""
+    items = []
+    for route in kwargs["json"]["urls"].split(","):
+        card_id = route.rsplit("/", 1)[-1]
+        if card_id.startswith("5"):
+            items.append({"200": {"id": card_id}})
+        else:
+            items.append({"name": "NotFound", "message": "The requested resource was not found.", "statusCode": 404})
+    return CallbackResult(payload=items)
+
+
+@pytest.mark.asyncio
+async def test_batch_get(client_trello_json, mock_aioresponse):
+    mock_aioresponse.get("https://trello.com/1/batch", callback=batch_callback, repeat=True)
+    urls = [f"/cards/5fc10d349569a54078da{i:04x}" for i in range(25)] + ["/cards/0000"]
+
+    response = await client_trello_json.batch_get(urls)
+
+    assert len(response) == 26
+    assert [r["id"] for r in response[:25]] == [url.rsplit("/", 1)[-1] for url in urls[:25]]
+    assert response[25] == {"status": 404, "message": "The requested resource was not found.", "error": "ERROR"}
+    assert client_trello_json.retry_stats.attempts["batch_get"] == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_get_failed_chunk(client_trello_json, mock_aioresponse):
+    mock_aioresponse.get("https://trello.com/1/batch", status=400, content_type="text/plain", body="invalid value for urls")
+
+    response = await client_trello_json.batch_get(["/cards/1", "/cards/2"])
+
+    assert response == [{"status": 400, "message": "invalid value for urls", "error": "ERROR"}] * 2
+
+
+@pytest.mark.asyncio
+async def test_identical_gets_coalesced(client_trello_json, mock_aioresponse):
+    card_id = "5fc10d349569a54078da50fe"
+    calls = []
+
+    async def callback(url, **kwargs):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return CallbackResult(payload={"id": card_id})
+
+    mock_aioresponse.get(f"https://trello.com/1/cards/{card_id}", callback=callback, repeat=True)
+    coalesced = client_trello_json.coalesced_requests
+
+    responses = await asyncio.gather(*[client_trello_json.get_card(card_id) for _ in range(10)])
+    assert responses == [{"id": card_id}] * 10
+    assert len(calls) == 1
+    assert client_trello_json.coalesced_requests - coalesced == 9
+
+    # nothing is kept once the request completed
+    await client_trello_json.get_card(card_id)
+    assert len(calls) == 2
+    assert len(client_trello_json._inflight) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_coalesced_callers(client_trello_json, mock_aioresponse):
+    card_id = "5fc10d349569a54078da50fe"
+
+    async def callback(url, **kwargs):
+        await asyncio.sleep(0.02)
+        return CallbackResult(payload={"id": card_id})
+
+    mock_aioresponse.get(f"https://trello.com/1/cards/{card_id}", callback=callback)
+    leader = asyncio.ensure_future(client_trello_json.get_card(card_id))
+    await asyncio.sleep(0.005)
+    follower = asyncio.ensure_future(client_trello_json.get_card(card_id))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == {"id": card_id}
+    assert leader.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_writes_and_other_params_not_coalesced(client_trello_json, mock_aioresponse):
+    card_id = "5fc10d349569a54078da50fe"
+    calls = []
+
+    async def callback(url, **kwargs):
+        calls.append(kwargs["json"])
+        await asyncio.sleep(0.01)
+        return CallbackResult(payload={"id": card_id})
+
+    mock_aioresponse.get(f"https://trello.com/1/cards/{card_id}", callback=callback, repeat=True)
+    mock_aioresponse.put(f"https://trello.com/1/cards/{card_id}", callback=callback, repeat=True)
+    coalesced = client_trello_json.coalesced_requests
+
+    await asyncio.gather(client_trello_json.get_card(card_id, fields="name"), client_trello_json.get_card(card_id),
+                         client_trello_json.update_card(card_id, name="a"),
+                         client_trello_json.update_card(card_id, name="a"))
+    assert len(calls) == 4
+    assert client_trello_json.coalesced_requests == coalesced
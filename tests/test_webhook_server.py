@@ -0,0 +1,68 @@
+import base64
+import hashlib
+import hmac
+import json
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from api_trello import TrelloUpdate
+from api_trello.webhook_server import LazyUpdate, WebhookReceiver, verify_signature
+
+SECRET = "app-secret"
+CALLBACK_URL = "https://example.com/trello/wh"
+PAYLOAD = {
+    "model": {"id": "bbbbbbbbbb1234567890BBBBBBBBBB00", "name": "Board"},
+    "action": {
+        "id": "5fc10d349569a54078da5100",
+        "idMemberCreator": "5a214fe083df8aa8c81899e8",
+        "type": "updateCard",
+        "date": "2020-11-27T14:29:08.437Z",
+        "data": {"card": {"id": "5fc10d349569a54078da50fe", "idList": "5f43db65a1d25218690c062e"},
+                 "old": {"idList": "5f43db65a1d25218690c062c"},
+                 "board": {"id": "bbbbbbbbbb1234567890BBBBBBBBBB00"},
+                 "listBefore": {"id": "5f43db65a1d25218690c062c"}, "listAfter": {"id": "5f43db65a1d25218690c062e"}},
+        "display": {"translationKey": "action_move_card_from_list_to_list", "entities": {}},
+    },
+}
+
+
+def sign(body: bytes) -> str:
+    return base64.b64encode(hmac.new(SECRET.encode(), body + CALLBACK_URL.encode(), hashlib.sha1).digest()).decode()
+
+
+def test_verify_signature():
+    body = json.dumps(PAYLOAD).encode()
+
+    assert verify_signature(SECRET, CALLBACK_URL, body, sign(body))
+    assert not verify_signature(SECRET, CALLBACK_URL, body + b" ", sign(body))
+    assert not verify_signature(SECRET, CALLBACK_URL, body, None)
+
+
+def test_lazy_update():
+    update = LazyUpdate(PAYLOAD)
+
+    assert update._update is None
+    assert update.action_type == "updateCard"
+    assert update.card_id == "5fc10d349569a54078da50fe"
+    assert (update.list_before_id, update.list_after_id) == ("5f43db65a1d25218690c062c", "5f43db65a1d25218690c062e")
+    assert update._update is None
+    assert update.update == TrelloUpdate.parse_obj(PAYLOAD)
+
+
+@pytest.mark.asyncio
+async def test_receiver():
+    handled = []
+
+    async def handler(update: LazyUpdate):
+        handled.append(update.action_id)
+
+    receiver = WebhookReceiver(handler, secret=SECRET, callback_url=CALLBACK_URL, workers=2)
+    body = json.dumps(PAYLOAD).encode()
+    async with TestClient(TestServer(receiver.app())) as http:
+        head = await http.head("/trello/wh")
+        ok = await http.post("/trello/wh", data=body, headers={"X-Trello-Webhook": sign(body)})
+        forged = await http.post("/trello/wh", data=body, headers={"X-Trello-Webhook": "forged"})
+        await receiver.queue.join()
+
+    assert (head.status, ok.status, forged.status) == (200, 200, 401)
+    assert handled == ["5fc10d349569a54078da5100"]
+    assert (receiver.received, receiver.rejected, receiver.processed) == (1, 1, 1)
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from aioresponses import CallbackResult
+from api_trello import Client, TrelloException
+from api_trello.write_behind import UpdateCoalescer
+
+API_KEY = "aaaaaaaaaa1234567890AAAAAAAAAA00"
+TOKEN = "cccccccccc1234567890CCCCCCCCCC11cccccccccc1234567890CCCCCCCCCC11"
+BOARD_ID = "bbbbbbbbbb1234567890BBBBBBBBBB00"
+CARD_ID = "5fc10d349569a54078da50fe"
+CARD_URL = f"https://trello.com/1/cards/{CARD_ID}"
+
+
+@pytest.mark.asyncio
+async def test_merge_within_window():
+    writes = []
+
+    async def write(key, fields):
+        writes.append((key, dict(fields)))
+        return fields
+
+    coalescer = UpdateCoalescer(write, window=0.01)
+    results = await asyncio.gather(coalescer.submit("a", {"name": "x", "closed": False}),
+                                   coalescer.submit("a", {"closed": True}), coalescer.submit("b", {"name": "y"}))
+
+    assert sorted(writes) == [("a", {"name": "x", "closed": True}), ("b", {"name": "y"})]
+    assert results[0] == results[1] == {"name": "x", "closed": True}
+    assert (coalescer.submitted, coalescer.writes, len(coalescer)) == (3, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_writes_of_a_key_in_order():
+    writes = []
+
+    async def write(key, fields):
+        writes.append(("start", fields["n"]))
+        await asyncio.sleep(0.02)
+        writes.append(("end", fields["n"]))
+
+    coalescer = UpdateCoalescer(write, window=0.001)
+    first = asyncio.ensure_future(coalescer.submit("a", {"n": 1}))
+    await asyncio.sleep(0.005)  # first write is in flight
+    await asyncio.gather(first, coalescer.submit("a", {"n": 2}))
+
+    assert writes == [("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_raises_for_every_caller():
+    async def write(key, fields):
+        raise ValueError(key)
+
+    coalescer = UpdateCoalescer(write, window=0.001)
+    results = await asyncio.gather(coalescer.submit("a", {"x": 1}), coalescer.submit("a", {"y": 1}),
+                                   return_exceptions=True)
+    assert [type(r) for r in results] == [ValueError, ValueError]
+
+
+@pytest.mark.asyncio
+async def test_client_update_card_one_put(mock_aioresponse):
+    sent = []
+
+    def callback(url, **kwargs):
+        sent.append(kwargs["json"])
+        return CallbackResult(payload={"id": CARD_ID, "name": kwargs["json"].get("name"), "closed": True})
+
+    mock_aioresponse.put(CARD_URL, callback=callback, repeat=True)
+    async with Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, write_behind_window=0.01) as client:
+        cards = await asyncio.gather(client.update_card(CARD_ID, name="New"), client.update_card(CARD_ID, closed=True),
+                                     client.update_card(CARD_ID, desc="text"))
+
+    assert len(sent) == 1
+    assert {k: sent[0][k] for k in ("name", "closed", "desc")} == {"name": "New", "closed": True, "desc": "text"}
+    assert cards[0] == cards[1] == cards[2]
+    assert cards[0].name == "New"
+
+
+@pytest.mark.asyncio
+async def test_client_error_and_flush_on_close(mock_aioresponse):
+    mock_aioresponse.put(CARD_URL, status=400, content_type="text/plain", body="invalid value for closed")
+    mock_aioresponse.put(CARD_URL, payload={"id": CARD_ID, "name": "Late"})
+    client = Client(api_key=API_KEY, token=TOKEN, board_id=BOARD_ID, write_behind_window=60)
+
+    failed = asyncio.ensure_future(client.update_card(CARD_ID, closed="maybe"))
+    await asyncio.sleep(0)
+    await client.write_behind.flush()
+    pending = asyncio.ensure_future(client.update_card(CARD_ID, name="Late"))
+    await asyncio.sleep(0)
+    await client.aclose()  # does not wait for the 60s window
+    card = await pending
+
+    with pytest.raises(TrelloException):
+        failed.result()
+    assert card.name == "Late"